@@ -0,0 +1,46 @@
+"""add_jobs_trigram_indexes
+
+Revision ID: a6c1e9f4b072
+Revises: f3b7d1e8a264
+Create Date: 2026-10-16 11:30:00.000000
+
+Adds pg_trgm GIN indexes on jobs.company, jobs.title and jobs.notes so the
+list_jobs ILIKE '%term%' company filter and search can use an index
+(a BitmapOr across the three) instead of a sequential scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c1e9f4b072'
+down_revision: Union[str, None] = 'f3b7d1e8a264'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and create trigram indexes - PostgreSQL only."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_jobs_company_trgm" ON "jobs" USING gin (company gin_trgm_ops)'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_jobs_title_trgm" ON "jobs" USING gin (title gin_trgm_ops)'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_jobs_notes_trgm" ON "jobs" USING gin (notes gin_trgm_ops)'))
+
+
+def downgrade() -> None:
+    """Drop the trigram indexes (the extension is left installed)."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_jobs_notes_trgm"'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_jobs_title_trgm"'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_jobs_company_trgm"'))
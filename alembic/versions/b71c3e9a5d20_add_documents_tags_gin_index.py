@@ -0,0 +1,41 @@
+"""add_documents_tags_gin_index
+
+Revision ID: b71c3e9a5d20
+Revises: de29a84bd2b1
+Create Date: 2026-10-16 09:00:00.000000
+
+Adds a GIN index on documents.tags (as JSONB) so the list_documents tag
+filter resolves with a single "?|" index probe.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71c3e9a5d20'
+down_revision: Union[str, None] = 'de29a84bd2b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create GIN expression index on (tags::jsonb) - PostgreSQL only."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    # jsonb_ops (default opclass) is required for the ?| operator
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_documents_tags_gin" ON "documents" USING gin ((tags::jsonb))'))
+
+
+def downgrade() -> None:
+    """Drop the tags GIN index."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_documents_tags_gin"'))
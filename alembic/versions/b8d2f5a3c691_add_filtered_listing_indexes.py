@@ -0,0 +1,40 @@
+"""add_filtered_listing_indexes
+
+Revision ID: b8d2f5a3c691
+Revises: a6c1e9f4b072
+Create Date: 2026-10-16 12:00:00.000000
+
+Adds (user_id, status, created_at DESC, id DESC) on jobs and
+(user_id, feature, created_at DESC, id DESC) on usage_events so status- and
+feature-filtered listings are served in keyset order without a sort.
+The new jobs index supersedes idx_user_status_created, which is dropped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f5a3c691'
+down_revision: Union[str, None] = 'a6c1e9f4b072'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the filtered listing indexes (idempotent)."""
+    from sqlalchemy import text
+    
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_jobs_user_status_created_id" ON "jobs" ("user_id", "status", "created_at" DESC, "id" DESC)'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_user_status_created"'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_usage_events_user_feature_created_id" ON "usage_events" ("user_id", "feature", "created_at" DESC, "id" DESC)'))
+
+
+def downgrade() -> None:
+    """Drop the filtered listing indexes and restore idx_user_status_created."""
+    from sqlalchemy import text
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_usage_events_user_feature_created_id"'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_user_status_created" ON "jobs" ("user_id", "status", "created_at")'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_jobs_user_status_created_id"'))
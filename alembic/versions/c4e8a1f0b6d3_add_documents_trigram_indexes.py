@@ -0,0 +1,44 @@
+"""add_documents_trigram_indexes
+
+Revision ID: c4e8a1f0b6d3
+Revises: b71c3e9a5d20
+Create Date: 2026-10-16 09:30:00.000000
+
+Adds pg_trgm GIN indexes on documents.title and documents.content_text so
+the list_documents ILIKE '%term%' search can use an index instead of a
+sequential scan.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a1f0b6d3'
+down_revision: Union[str, None] = 'b71c3e9a5d20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and create trigram indexes - PostgreSQL only."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute(text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_documents_title_trgm" ON "documents" USING gin (title gin_trgm_ops)'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_documents_content_trgm" ON "documents" USING gin (content_text gin_trgm_ops)'))
+
+
+def downgrade() -> None:
+    """Drop the trigram indexes (the extension is left installed)."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_documents_content_trgm"'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_documents_title_trgm"'))
@@ -0,0 +1,39 @@
+"""add_user_job_recency_indexes
+
+Revision ID: c9e4a7b2d158
+Revises: b8d2f5a3c691
+Create Date: 2026-10-16 13:00:00.000000
+
+Adds (user_id, job_id, created_at DESC) on match_analyses and
+outreach_messages so the "latest for this user's job" lookups in job
+insights read the first index entries instead of filtering and sorting.
+resume_versions is already covered by idx_user_job_version, which Postgres
+scans backwards for ORDER BY version DESC.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e4a7b2d158'
+down_revision: Union[str, None] = 'b8d2f5a3c691'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the user/job recency indexes (idempotent)."""
+    from sqlalchemy import text
+    
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_match_analyses_user_job_created" ON "match_analyses" ("user_id", "job_id", "created_at" DESC)'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_outreach_message_user_job_created" ON "outreach_messages" ("user_id", "job_id", "created_at" DESC)'))
+
+
+def downgrade() -> None:
+    """Drop the user/job recency indexes."""
+    from sqlalchemy import text
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_outreach_message_user_job_created"'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_match_analyses_user_job_created"'))
@@ -0,0 +1,58 @@
+"""unique_subscription_stripe_customer
+
+Revision ID: d2f6b8c1e947
+Revises: c4e8a1f0b6d3
+Create Date: 2026-10-16 10:00:00.000000
+
+Replaces the plain index on subscriptions.stripe_customer_id with a unique
+one so Stripe webhooks can resolve the user with a single index lookup.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b8c1e947'
+down_revision: Union[str, None] = 'c4e8a1f0b6d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """
+    Create uq_subscriptions_stripe_customer_id and drop the plain index it replaces.
+    
+    Fails if duplicate customer IDs exist: which subscription should keep a
+    Stripe customer is a billing decision, so resolve the listed rows by hand
+    and re-run.
+    """
+    from sqlalchemy import text
+    
+    bind = op.get_bind()
+    
+    duplicates = bind.execute(text("""
+        SELECT stripe_customer_id FROM subscriptions
+        WHERE stripe_customer_id IS NOT NULL
+        GROUP BY stripe_customer_id
+        HAVING COUNT(*) > 1
+        LIMIT 20
+    """)).scalars().all()
+    if duplicates:
+        raise RuntimeError(
+            f"Cannot create uq_subscriptions_stripe_customer_id: duplicate stripe_customer_id values "
+            f"in subscriptions (first {len(duplicates)}: {', '.join(duplicates)})"
+        )
+    
+    op.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS "uq_subscriptions_stripe_customer_id" ON "subscriptions" ("stripe_customer_id")'))
+    # The unique index serves every lookup the plain one did
+    op.execute(text('DROP INDEX IF EXISTS "ix_subscriptions_stripe_customer_id"'))
+
+
+def downgrade() -> None:
+    """Restore the plain index and drop the unique one."""
+    from sqlalchemy import text
+    
+    op.execute(text('CREATE INDEX IF NOT EXISTS "ix_subscriptions_stripe_customer_id" ON "subscriptions" ("stripe_customer_id")'))
+    op.execute(text('DROP INDEX IF EXISTS "uq_subscriptions_stripe_customer_id"'))
@@ -0,0 +1,37 @@
+"""add_resumes_parse_status
+
+Revision ID: d6a3f8c1e025
+Revises: c9e4a7b2d158
+Create Date: 2026-10-16 14:00:00.000000
+
+Adds resumes.parse_status for uploads parsed in a background task.
+Existing rows stay NULL (they were parsed inline at upload).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6a3f8c1e025'
+down_revision: Union[str, None] = 'c9e4a7b2d158'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add parse_status column to resumes table (idempotent)."""
+    from sqlalchemy import inspect
+    
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    columns = [col['name'] for col in inspector.get_columns('resumes')]
+    
+    if 'parse_status' not in columns:
+        op.add_column('resumes', sa.Column('parse_status', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove parse_status column from resumes table."""
+    op.drop_column('resumes', 'parse_status')
@@ -0,0 +1,38 @@
+"""drop_ai_usage_covering_index
+
+Revision ID: e1b7c4a9f362
+Revises: d6a3f8c1e025
+Create Date: 2026-10-16 15:00:00.000000
+
+Drops idx_ai_usage_user_date_count if an earlier build of this revision
+created it. It duplicated uq_user_date, and because it INCLUDEd
+ai_calls_count, the column every AI call increments, it also ruled out HOT
+updates on ai_usage. uq_user_date already serves the daily usage lookup.
+PostgreSQL only (the index was never created elsewhere).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7c4a9f362'
+down_revision: Union[str, None] = 'd6a3f8c1e025'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Drop the ai_usage covering index - PostgreSQL only."""
+    from sqlalchemy import text
+    
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_ai_usage_user_date_count"'))
+
+
+def downgrade() -> None:
+    """Nothing to restore: the covering index is not wanted at any revision."""
+    pass
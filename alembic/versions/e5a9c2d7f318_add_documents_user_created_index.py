@@ -0,0 +1,34 @@
+"""add_documents_user_created_index
+
+Revision ID: e5a9c2d7f318
+Revises: d2f6b8c1e947
+Create Date: 2026-10-16 10:30:00.000000
+
+Adds a composite (user_id, created_at DESC) index on documents so the
+list_documents query is an index range scan that returns rows pre-sorted.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a9c2d7f318'
+down_revision: Union[str, None] = 'd2f6b8c1e947'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create idx_documents_user_created (idempotent)."""
+    from sqlalchemy import text
+    
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_documents_user_created" ON "documents" ("user_id", "created_at" DESC)'))
+
+
+def downgrade() -> None:
+    """Drop idx_documents_user_created."""
+    from sqlalchemy import text
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_documents_user_created"'))
@@ -0,0 +1,36 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: f3b7d1e8a264
+Revises: e5a9c2d7f318
+Create Date: 2026-10-16 11:00:00.000000
+
+Adds (user_id, created_at DESC, id DESC) indexes on jobs and usage_events so
+keyset-paginated list_jobs / get_history pages are index range scans.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b7d1e8a264'
+down_revision: Union[str, None] = 'e5a9c2d7f318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the keyset pagination indexes (idempotent)."""
+    from sqlalchemy import text
+    
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_jobs_user_created_id" ON "jobs" ("user_id", "created_at" DESC, "id" DESC)'))
+    op.execute(text('CREATE INDEX IF NOT EXISTS "idx_usage_events_user_created_id" ON "usage_events" ("user_id", "created_at" DESC, "id" DESC)'))
+
+
+def downgrade() -> None:
+    """Drop the keyset pagination indexes."""
+    from sqlalchemy import text
+    
+    op.execute(text('DROP INDEX IF EXISTS "idx_usage_events_user_created_id"'))
+    op.execute(text('DROP INDEX IF EXISTS "idx_jobs_user_created_id"'))
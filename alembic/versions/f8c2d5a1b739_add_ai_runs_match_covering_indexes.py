@@ -0,0 +1,65 @@
+"""add_ai_runs_match_covering_indexes
+
+Revision ID: f8c2d5a1b739
+Revises: e1b7c4a9f362
+Create Date: 2026-10-16 16:00:00.000000
+
+Replaces single-purpose indexes with covering composites:
+- ai_runs: (user_id, feature, input_hash) INCLUDE (tokens_in, tokens_out,
+  cost_estimate, status) replaces the lone input_hash index, so dedup
+  lookups don't fetch a heap row per candidate.
+- match_analyses: (user_id, score DESC) INCLUDE (resume_id, job_id,
+  created_at) replaces idx_user_score for top-N-by-score queries.
+
+Built CONCURRENTLY (outside the migration transaction) so writes to these
+tables aren't blocked during the build. PostgreSQL only.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8c2d5a1b739'
+down_revision: Union[str, None] = 'e1b7c4a9f362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create the covering indexes and drop the ones they replace - PostgreSQL only."""
+    from sqlalchemy import inspect, text
+    
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    
+    tables = inspect(bind).get_table_names()
+    
+    with op.get_context().autocommit_block():
+        if 'ai_runs' in tables:
+            op.execute(text('CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_user_feature_hash" ON "ai_runs" ("user_id", "feature", "input_hash") INCLUDE ("tokens_in", "tokens_out", "cost_estimate", "status")'))
+            op.execute(text('DROP INDEX CONCURRENTLY IF EXISTS "ix_ai_runs_input_hash"'))
+        if 'match_analyses' in tables:
+            op.execute(text('CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_user_score_desc" ON "match_analyses" ("user_id", "score" DESC) INCLUDE ("resume_id", "job_id", "created_at")'))
+            op.execute(text('DROP INDEX CONCURRENTLY IF EXISTS "idx_user_score"'))
+
+
+def downgrade() -> None:
+    """Restore the replaced indexes and drop the covering ones."""
+    from sqlalchemy import inspect, text
+    
+    bind = op.get_bind()
+    if bind.dialect.name != "postgresql":
+        return
+    
+    tables = inspect(bind).get_table_names()
+    
+    with op.get_context().autocommit_block():
+        if 'match_analyses' in tables:
+            op.execute(text('CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_user_score" ON "match_analyses" ("user_id", "score")'))
+            op.execute(text('DROP INDEX CONCURRENTLY IF EXISTS "idx_user_score_desc"'))
+        if 'ai_runs' in tables:
+            op.execute(text('CREATE INDEX CONCURRENTLY IF NOT EXISTS "ix_ai_runs_input_hash" ON "ai_runs" ("input_hash")'))
+            op.execute(text('DROP INDEX CONCURRENTLY IF EXISTS "idx_user_feature_hash"'))
@@ -17,7 +17,7 @@ from app.db.models.interview_pack import InterviewPack
 from app.db.models.outreach_message import OutreachMessage, OutreachType
 from app.db.models.document import Document
 from app.core.auth_dependency import get_current_user, get_current_user_obj, get_db
-from app.core.gating import enforce_ai_limit, increment_ai_usage
+from app.core.gating import enforce_and_increment_ai_usage, refund_ai_usage
 from app.services.ai_explain_service import explain_changes
 from app.services.job_pack_service import generate_application_pack
 from app.services.company_pack_service import generate_company_pack
@@ -446,9 +446,6 @@ def transform(
     Returns transformed markdown.
     """
     try:
-        # Enforce usage limits based on plan
-        enforce_ai_limit(db, current_user)
-        
         # Validate mode
         valid_modes = ["rewrite", "shorten", "expand", "ats_optimize", "fix_grammar", "add_keywords"]
         if request.mode not in valid_modes:
@@ -472,13 +469,20 @@ def transform(
                 detail="Text cannot be empty"
             )
         
-        # Transform text using AI
+        # Enforce usage limits based on plan and record this call
+        enforce_and_increment_ai_usage(db, current_user)
+        
+        # Transform text using AI (a failed call doesn't count)
         before_text = request.text
-        result = transform_text(
-            mode=request.mode,
-            text=before_text,
-            context=request.context or {}
-        )
+        try:
+            result = transform_text(
+                mode=request.mode,
+                text=before_text,
+                context=request.context or {}
+            )
+        except Exception:
+            refund_ai_usage(db, current_user.id)
+            raise
         
         # Generate explanation of changes
         explanation = None
@@ -492,9 +496,6 @@ def transform(
             logger.warning(f"Failed to generate explanation: {e}", exc_info=True)
             # Continue without explanation - not critical
         
-        # Increment usage count after successful transformation
-        increment_ai_usage(db, current_user.id)
-        
         logger.info(f"Text transformed: mode={request.mode}, user_id={current_user.id}, plan={current_user.plan}, length={len(result)}")
         
         return TransformResponse(output=result, explanation=explanation)
@@ -531,21 +532,23 @@ def generate_job_pack(
         # Enforce usage limits (each component counts)
         # For now, allow premium users and check limits per component
         # Free users: limit to 1 job pack per day (4 AI calls)
-        enforce_ai_limit(db, current_user)  # Check initial limit
+        enforce_and_increment_ai_usage(db, current_user)  # Counts as 1 call, not 4
         
-        result = generate_application_pack(
-            db=db,
-            user=current_user,
-            resume_id=request.resume_id,
-            job_id=request.job_id,
-            resume_text=request.resume_text,
-            jd_text=request.jd_text,
-            company=request.company,
-            job_title=request.job_title
-        )
-        
-        # Increment usage for job pack (counts as 1 call, not 4)
-        increment_ai_usage(db, current_user.id)
+        # A failed pack (bad input, missing job, AI error) doesn't count
+        try:
+            result = generate_application_pack(
+                db=db,
+                user=current_user,
+                resume_id=request.resume_id,
+                job_id=request.job_id,
+                resume_text=request.resume_text,
+                jd_text=request.jd_text,
+                company=request.company,
+                job_title=request.job_title
+            )
+        except Exception:
+            refund_ai_usage(db, current_user.id)
+            raise
         
         logger.info(f"Job pack generated: user_id={current_user.id}, job_id={request.job_id}, docs={len([d for d in [result['resume_doc_id'], result['cover_letter_doc_id'], result['outreach_doc_id'], result['interview_pack_doc_id']] if d])}")
         
@@ -588,22 +591,23 @@ def generate_company_pack_endpoint(
     Requires authentication. Premium feature (or within free limits).
     """
     try:
-        # Enforce usage limits
-        enforce_ai_limit(db, current_user)
-        
-        # Generate company pack
-        result = generate_company_pack(
-            db=db,
-            user=current_user,
-            job_id=request.job_id,
-            company=request.company,
-            job_title=request.job_title,
-            jd_text=request.jd_text,
-            save_to_drive=request.save_to_drive,
-        )
+        # Enforce usage limits and record this call
+        enforce_and_increment_ai_usage(db, current_user)
         
-        # Increment usage
-        increment_ai_usage(db, current_user.id)
+        # Generate company pack (a failed pack doesn't count)
+        try:
+            result = generate_company_pack(
+                db=db,
+                user=current_user,
+                job_id=request.job_id,
+                company=request.company,
+                job_title=request.job_title,
+                jd_text=request.jd_text,
+                save_to_drive=request.save_to_drive,
+            )
+        except Exception:
+            refund_ai_usage(db, current_user.id)
+            raise
         
         logger.info(f"Company pack generated: user_id={current_user.id}, job_id={request.job_id}, doc_id={result.get('document_id')}")
         
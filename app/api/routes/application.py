@@ -1,22 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
 from app.db.models.user import User
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user, get_db
 
 router = APIRouter(prefix="/applications", tags=["Applications"])
 
 
-# ✅ DB DEPENDENCY
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ✅ CREATE JOB APPLICATION
 @router.post("/create")
 def create_application(
@@ -2,14 +2,14 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError, ProgrammingError
 from pydantic import ValidationError
+from typing import Optional
 import logging
 import re
 
-from app.db.session import SessionLocal
+from app.db.upsert import upsert_insert
 from app.db.models.user import User
-from app.db.models.subscription import Subscription
-from app.core.security import hash_password, verify_password, create_access_token
-from app.core.auth_dependency import get_current_user
+from app.core.security import ahash_password, averify_password, create_access_token
+from app.core.auth_dependency import get_current_user, get_db
 from app.schemas.auth import SignupRequest, LoginRequest
 
 logger = logging.getLogger(__name__)
@@ -20,30 +20,43 @@ EMAIL_REGEX = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
 router = APIRouter(prefix="/auth", tags=["Auth"])
 
 
-# ✅ Database Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# ✅ Single round-trip user insert
+def insert_user_if_absent(db: Session, values: dict) -> Optional[int]:
+    """
+    Insert a user row with INSERT ... ON CONFLICT (email) DO NOTHING RETURNING id.
+
+    Returns the new user's id, or None if the email is already registered.
+    Works on PostgreSQL and SQLite (3.35+), which share the same upsert syntax.
+    The caller is responsible for committing.
+    """
+    stmt = (
+        upsert_insert(db, User)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=["email"])
+        .returning(User.id)
+    )
+    return db.execute(stmt).scalar_one_or_none()
 
 
-# ✅ Password validation helper
-def validate_password(password: str) -> str:
-    """Validate password length and return validated password."""
-    password_bytes = password.encode("utf-8")
-    if len(password_bytes) > 72:
-        raise HTTPException(
-            status_code=400,
-            detail="Password cannot be longer than 72 bytes (approximately 72 characters)"
-        )
-    if len(password_bytes) < 8:
-        raise HTTPException(
-            status_code=400,
-            detail="Password must be at least 8 characters long"
-        )
-    return password
+# ✅ Signup validation error formatting
+def format_signup_errors(error: ValidationError) -> str:
+    """Collapse SignupRequest validation errors into a single detail string."""
+    error_messages = []
+    for err in error.errors():
+        field = err.get("loc", ["unknown"])[0]
+        msg = err.get("msg", "Invalid value")
+        if field == "password":
+            if err.get("type") == "string_too_short":
+                error_messages.append("Password must be at least 8 characters")
+            elif err.get("type") == "string_too_long" or "72 bytes" in msg:
+                error_messages.append("Password too long (bcrypt limit 72 bytes)")
+            else:
+                error_messages.append(f"Password validation failed: {msg}")
+        elif field == "email":
+            error_messages.append("Invalid email format")
+        else:
+            error_messages.append(f"{field}: {msg}")
+    return "; ".join(error_messages) if error_messages else "Validation failed"
 
 
 # ✅ USER SIGNUP (Accepts both JSON and form-urlencoded)
@@ -63,45 +76,6 @@ async def signup(request: Request, db: Session = Depends(get_db)):
         if "application/json" in ct:
             try:
                 payload = await request.json()
-                has_full_name = "full_name" in payload
-                has_email = "email" in payload
-                has_password = "password" in payload
-                has_visa_status = "visa_status" in payload
-                
-                # Validate with Pydantic
-                try:
-                    data = SignupRequest(**payload)
-                except ValidationError as e:
-                    errors = e.errors()
-                    error_messages = []
-                    for error in errors:
-                        field = error.get("loc", ["unknown"])[0]
-                        msg = error.get("msg", "Invalid value")
-                        if field == "password":
-                            if "at least 8" in msg.lower():
-                                error_messages.append("Password must be at least 8 characters")
-                            elif "72 bytes" in msg.lower() or "too long" in msg.lower():
-                                error_messages.append("Password too long (bcrypt limit 72 bytes)")
-                            else:
-                                error_messages.append(f"Password validation failed: {msg}")
-                        else:
-                            error_messages.append(f"{field}: {msg}")
-                    
-                    logger.warning(
-                        "Signup validation failed (JSON)",
-                        extra={
-                            "content_type": ct,
-                            "has_full_name": has_full_name,
-                            "has_email": has_email,
-                            "has_password": has_password,
-                            "has_visa_status": has_visa_status,
-                            "validation_errors": [str(e) for e in errors]
-                        }
-                    )
-                    raise HTTPException(
-                        status_code=422,
-                        detail="; ".join(error_messages) if error_messages else "Validation failed"
-                    )
             except ValueError as e:
                 logger.warning(
                     "Signup JSON parse error",
@@ -111,86 +85,7 @@ async def signup(request: Request, db: Session = Depends(get_db)):
         else:
             # Form-urlencoded (default for backward compatibility)
             try:
-                form = await request.form()
-                full_name = form.get("full_name", "").strip()
-                email = form.get("email", "").strip()
-                password = form.get("password", "")
-                visa_status = form.get("visa_status", None)
-                
-                has_full_name = bool(full_name)
-                has_email = bool(email)
-                has_password = bool(password)
-                has_visa_status = visa_status is not None
-                
-                # Check for missing required fields
-                missing_fields = []
-                if not full_name:
-                    missing_fields.append("full_name")
-                if not email:
-                    missing_fields.append("email")
-                if not password:
-                    missing_fields.append("password")
-                
-                if missing_fields:
-                    logger.warning(
-                        "Signup missing required fields (form)",
-                        extra={
-                            "content_type": ct,
-                            "has_full_name": has_full_name,
-                            "has_email": has_email,
-                            "has_password": has_password,
-                            "has_visa_status": has_visa_status,
-                            "missing_fields": missing_fields
-                        }
-                    )
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"Missing required fields: {', '.join(missing_fields)}"
-                    )
-                
-                # Validate with Pydantic
-                try:
-                    data = SignupRequest(
-                        full_name=full_name,
-                        email=email.lower(),
-                        password=password,
-                        visa_status=visa_status
-                    )
-                except ValidationError as e:
-                    errors = e.errors()
-                    error_messages = []
-                    for error in errors:
-                        field = error.get("loc", ["unknown"])[0]
-                        msg = error.get("msg", "Invalid value")
-                        if field == "password":
-                            if "at least 8" in msg.lower():
-                                error_messages.append("Password must be at least 8 characters")
-                            elif "72 bytes" in msg.lower() or "too long" in msg.lower():
-                                error_messages.append("Password too long (bcrypt limit 72 bytes)")
-                            else:
-                                error_messages.append(f"Password validation failed: {msg}")
-                        elif field == "email":
-                            error_messages.append("Invalid email format")
-                        else:
-                            error_messages.append(f"{field}: {msg}")
-                    
-                    logger.warning(
-                        "Signup validation failed (form)",
-                        extra={
-                            "content_type": ct,
-                            "has_full_name": has_full_name,
-                            "has_email": has_email,
-                            "has_password": has_password,
-                            "has_visa_status": has_visa_status,
-                            "validation_errors": [str(e) for e in errors]
-                        }
-                    )
-                    raise HTTPException(
-                        status_code=422,
-                        detail="; ".join(error_messages) if error_messages else "Validation failed"
-                    )
-            except HTTPException:
-                raise
+                payload = dict(await request.form())
             except Exception as e:
                 logger.error(
                     "Signup form parse error",
@@ -199,62 +94,78 @@ async def signup(request: Request, db: Session = Depends(get_db)):
                 )
                 raise HTTPException(status_code=400, detail="Invalid form data")
         
-        # Normalize email to lowercase
-        email_lower = data.email.lower()
+        if not isinstance(payload, dict):
+            raise HTTPException(status_code=400, detail="Invalid JSON format")
+        
+        has_full_name = "full_name" in payload
+        has_email = "email" in payload
+        has_password = "password" in payload
+        has_visa_status = "visa_status" in payload
+        
+        # Validate with Pydantic (required fields, stripping, lengths, email format)
+        try:
+            data = SignupRequest.model_validate(payload)
+        except ValidationError as e:
+            logger.warning(
+                "Signup validation failed",
+                extra={
+                    "content_type": ct,
+                    "has_full_name": has_full_name,
+                    "has_email": has_email,
+                    "has_password": has_password,
+                    "has_visa_status": has_visa_status,
+                    "validation_errors": [str(err) for err in e.errors()]
+                }
+            )
+            raise HTTPException(status_code=422, detail=format_signup_errors(e))
+        
+        # Email is lowercased by SignupRequest
+        email_lower = data.email
         
-        # Check if email already exists
-        existing_user = db.query(User).filter(User.email == email_lower).first()
-        if existing_user:
-            logger.warning(f"Signup blocked: email exists - {email_lower}")
-            raise HTTPException(status_code=409, detail="Email already registered. Please log in.")
-
         # Hash password (validation already done by Pydantic)
         try:
-            hashed = hash_password(data.password)
+            hashed = await ahash_password(data.password)
         except ValueError as e:
             logger.error(f"Password hashing error: {e}")
             raise HTTPException(status_code=400, detail=str(e))
 
-        # Create user
-        user = User(
-            full_name=data.full_name.strip(),
-            email=email_lower,
-            password_hash=hashed,
-            visa_status=data.visa_status or "Citizen"
-        )
+        full_name = data.full_name
 
+        # Create user in a single round-trip; the unique email index decides
+        # whether the address is already registered (no pre-SELECT needed)
         try:
-            db.add(user)
+            user_id = insert_user_if_absent(db, {
+                "full_name": full_name,
+                "email": email_lower,
+                "password_hash": hashed,
+                "visa_status": data.visa_status or "Citizen",
+            })
             db.commit()
-            db.refresh(user)
-            
-            # Get user's plan (default to "free" if no subscription exists)
-            # New users won't have a subscription yet, so default to "free"
-            try:
-                subscription = db.query(Subscription).filter(Subscription.user_id == user.id).first()
-                plan = subscription.plan_type if subscription else "free"
-            except Exception as sub_error:
-                # If subscription query fails, default to "free"
-                logger.warning(f"Could not fetch subscription for new user {user.id}: {sub_error}")
-                plan = "free"
-            
-            logger.info(f"Signup success: user_id={user.id}, email={email_lower}, plan={plan}")
         except Exception as e:
             db.rollback()
             logger.error(f"Database error during signup: {e}", exc_info=True)
             raise HTTPException(status_code=500, detail="Failed to create user. Please try again.")
 
+        if user_id is None:
+            logger.warning(f"Signup blocked: email exists - {email_lower}")
+            raise HTTPException(status_code=409, detail="Email already registered. Please log in.")
+
+        # A freshly inserted user cannot have a subscription yet
+        plan = "free"
+
+        logger.info(f"Signup success: user_id={user_id}, email={email_lower}, plan={plan}")
+
         # Create access token for immediate login
-        token = create_access_token({"sub": user.email})
+        token = create_access_token({"sub": email_lower, "uid": user_id})
 
         # Return response with user object for immediate login
         return {
             "access_token": token,
             "token_type": "bearer",
             "user": {
-                "id": user.id,
-                "email": user.email,
-                "full_name": user.full_name,
+                "id": user_id,
+                "email": email_lower,
+                "full_name": full_name,
                 "plan": plan
             }
         }
@@ -448,7 +359,7 @@ async def login(request: Request, db: Session = Depends(get_db)):
 
         # Verify password with defensive error handling
         try:
-            password_valid = verify_password(password, user.password_hash)
+            password_valid = await averify_password(password, user.password_hash)
         except Exception as verify_error:
             logger.error(
                 "Password verification error",
@@ -464,7 +375,7 @@ async def login(request: Request, db: Session = Depends(get_db)):
         # Create access token with defensive error handling
         try:
             logger.info(f"User logged in successfully: {user.id} ({email})")
-            token = create_access_token({"sub": user.email})
+            token = create_access_token({"sub": user.email, "uid": user.id})
         except Exception as token_error:
             logger.error(
                 "Token creation error",
@@ -7,8 +7,7 @@ import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user, get_db
 from app.services.billing_service import (
     create_checkout_session,
     create_portal_session
@@ -26,15 +25,6 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/billing", tags=["Billing"])
 
 
-def get_db():
-    """Database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def get_user_from_email(email: str, db: Session):
     """Fetch User object from email."""
     from app.db.models.user import User
@@ -240,9 +230,3 @@ def portal(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=str(e)
         )
-
-
-@router.get("/status", status_code=status.HTTP_200_OK)
-def billing_status():
-    """Health check endpoint for billing service."""
-    return {"status": "billing service active"}
@@ -0,0 +1,18 @@
+"""
+Billing service liveness endpoint.
+
+Kept separate from billing.py so the probe imports nothing from app.db or
+stripe and never checks out a database connection.
+"""
+from fastapi import APIRouter, Response, status
+
+router = APIRouter(prefix="/billing", tags=["Billing"])
+
+# Static payload, serialized once at import time
+BILLING_STATUS_BODY = b'{"status":"billing service active"}'
+
+
+@router.get("/status", status_code=status.HTTP_200_OK)
+async def billing_status():
+    """Health check endpoint for billing service."""
+    return Response(content=BILLING_STATUS_BODY, media_type="application/json")
@@ -4,44 +4,55 @@ Stripe webhook handler for subscription events.
 Handles webhook events from Stripe to keep subscription state in sync.
 """
 import logging
-import stripe
-from fastapi import APIRouter, Request, Header, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Request, Header, HTTPException, status
 
-from app.db.session import SessionLocal
-from app.core.config import STRIPE_SECRET_KEY, STRIPE_WEBHOOK_SECRET
-from app.services.billing_service import (
-    handle_checkout_session_completed,
-    handle_subscription_created,
-    handle_subscription_updated,
-    handle_subscription_deleted
-)
-from app.services.billing_invoice_handlers import (
-    handle_invoice_payment_succeeded,
-    handle_invoice_payment_failed
+from app.core.config import STRIPE_WEBHOOK_SECRET
+from app.services.stripe_signature import verify_stripe_signature, WebhookSignatureError
+from app.services.stripe_event_queue import (
+    apply_stripe_event_now,
+    enqueue_stripe_event,
+    is_stripe_event_processed
 )
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/billing", tags=["Billing Webhook"])
 
-# Initialize Stripe
-if STRIPE_SECRET_KEY:
-    stripe.api_key = STRIPE_SECRET_KEY
+# Stripe event payloads are a few KB; anything larger is rejected unread
+STRIPE_WEBHOOK_MAX_BYTES = 1_048_576
 
 
-def get_db():
-    """Database session dependency with proper cleanup."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def read_capped_body(request: Request, max_bytes: int = STRIPE_WEBHOOK_MAX_BYTES) -> bytes:
+    """
+    Read the request body in chunks, rejecting it with 413 once it exceeds max_bytes.
+    
+    Memory stays bounded by max_bytes no matter what the sender streams.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Payload too large"
+        )
+    
+    chunks = []
+    total = 0
+    async for chunk in request.stream():
+        total += len(chunk)
+        if total > max_bytes:
+            logger.warning(f"Webhook payload exceeded {max_bytes} bytes, rejecting")
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Payload too large"
+            )
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 @router.post("/webhook", status_code=status.HTTP_200_OK)
 async def stripe_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     stripe_signature: str = Header(None, alias="stripe-signature"),
 ):
     """
@@ -53,90 +64,58 @@ async def stripe_webhook(
     - customer.subscription.updated: Subscription updated (plan change, renewal, etc.)
     - customer.subscription.deleted: Subscription canceled or expired
     
-    Returns 200 OK to acknowledge receipt to Stripe.
+    Only signature verification happens inline. The verified event is pushed
+    onto the Redis queue for the batch worker (or, without Redis, applied in a
+    background task) so Stripe gets its 200 OK without waiting on the database.
     """
-    # Get raw payload
-    payload = await request.body()
+    # Verify webhook signature
+    if not STRIPE_WEBHOOK_SECRET:
+        logger.error("STRIPE_WEBHOOK_SECRET not configured")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Webhook secret not configured"
+        )
+    
+    if not stripe_signature:
+        logger.warning("Missing stripe-signature header")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Missing stripe-signature header"
+        )
+    
+    # Raw bytes go straight to the verifier (HMAC over the exact payload)
+    payload = await read_capped_body(request)
     
-    # Get database session
-    db = SessionLocal()
     try:
-        # Verify webhook signature
-        if not STRIPE_WEBHOOK_SECRET:
-            logger.error("STRIPE_WEBHOOK_SECRET not configured")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Webhook secret not configured"
-            )
-        
-        if not stripe_signature:
-            logger.warning("Missing stripe-signature header")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Missing stripe-signature header"
-            )
-        
-        try:
-            event = stripe.Webhook.construct_event(
-                payload=payload,
-                sig_header=stripe_signature,
-                secret=STRIPE_WEBHOOK_SECRET
-            )
-        except ValueError as e:
-            logger.error(f"Invalid payload in webhook: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid payload: {str(e)}"
-            )
-        except stripe.error.SignatureVerificationError as e:
-            logger.error(f"Webhook signature verification failed: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid signature: {str(e)}"
-            )
-        
-        # Process event based on type
-        event_type = event.get("type")
-        event_data = event.get("data", {}).get("object", {})
-        
-        logger.info(f"Processing webhook event: type={event_type}, id={event.get('id')}")
-        
-        try:
-            if event_type == "checkout.session.completed":
-                subscription = handle_checkout_session_completed(event_data, db)
-                logger.info(f"Checkout completed: user_id={subscription.user_id}, plan={subscription.plan_type}")
-                
-            elif event_type == "customer.subscription.created":
-                subscription = handle_subscription_created(event_data, db)
-                logger.info(f"Subscription created: user_id={subscription.user_id}, plan={subscription.plan_type}")
-                
-            elif event_type == "customer.subscription.updated":
-                subscription = handle_subscription_updated(event_data, db)
-                logger.info(f"Subscription updated: user_id={subscription.user_id}, plan={subscription.plan_type}, status={subscription.status}")
-                
-            elif event_type == "customer.subscription.deleted":
-                subscription = handle_subscription_deleted(event_data, db)
-                logger.info(f"Subscription deleted: user_id={subscription.user_id}, downgraded to free")
-                
-            elif event_type == "invoice.payment_succeeded":
-                handle_invoice_payment_succeeded(event_data, db)
-                logger.info("Invoice payment succeeded")
-                
-            elif event_type == "invoice.payment_failed":
-                handle_invoice_payment_failed(event_data, db)
-                logger.warning("Invoice payment failed")
-                
-            else:
-                # Unhandled event type - log but don't fail
-                logger.debug(f"Unhandled webhook event type: {event_type}")
-        
-        except Exception as e:
-            logger.error(f"Error processing webhook event {event_type}: {e}", exc_info=True)
-            # Don't raise - we still want to return 200 to Stripe
-            # Stripe will retry if needed
-        
-        # Always return success to Stripe
-        return {"status": "success", "event_type": event_type}
-        
-    finally:
-        db.close()
+        event = verify_stripe_signature(payload, stripe_signature)
+    except ValueError as e:
+        logger.error(f"Invalid payload in webhook: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid payload: {str(e)}"
+        )
+    except WebhookSignatureError as e:
+        logger.error(f"Webhook signature verification failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid signature: {str(e)}"
+        )
+    
+    event_id = event.get("id")
+    event_type = event.get("type")
+    
+    # Stripe delivers at least once: acknowledge repeats of applied events.
+    # Events are only marked once applied, so retries of a failed delivery
+    # still go through (in-flight repeats are deduplicated by the worker)
+    if await is_stripe_event_processed(event_id):
+        logger.info(f"Duplicate webhook ignored: type={event_type}, id={event_id}")
+        return {"status": "duplicate", "event_type": event_type}
+    
+    if not await enqueue_stripe_event(payload):
+        background_tasks.add_task(apply_stripe_event_now, event)
+    
+    logger.info(f"Webhook accepted: type={event_type}, id={event_id}")
+    
+    # Always return success to Stripe
+    # Processing errors are logged by the event processor; Stripe will retry if needed
+    return {"status": "success", "event_type": event_type}
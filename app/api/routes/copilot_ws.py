@@ -1,6 +1,6 @@
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from app.services.socket_manager import ConnectionManager
-from app.services.ai_engine import generate_live_answer
+from app.services.live_answer_queue import enqueue_live_answer
 
 router = APIRouter()
 manager = ConnectionManager()
@@ -13,13 +13,8 @@ async def websocket_endpoint(websocket: WebSocket):
         while True:
             data = await websocket.receive_text()
 
-            answer = generate_live_answer(
-                question=data,
-                resume_text="",
-                jd_text=""
-            )
-
-            await manager.broadcast(answer)
+            # Batched by the live answer worker; the answer is sent back to this socket
+            await enqueue_live_answer(websocket, data)
 
     except WebSocketDisconnect:
         manager.disconnect(websocket)
@@ -4,19 +4,22 @@ Document endpoints for AI Drive.
 Provides CRUD operations for user documents (resumes, cover letters, etc.).
 """
 import logging
+import re
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, cast, exists, or_, and_
+from sqlalchemy.dialects.postgresql import JSONB, array
 
-from app.db.session import SessionLocal
-from app.db.models.user import User
+from app.db.session_async import get_async_db
 from app.db.models.document import Document
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user_id
 from app.schemas.document import (
     DocumentCreate,
     DocumentUpdate,
     DocumentResponse,
+    DocumentSummary,
     DocumentListResponse,
 )
 
@@ -24,25 +27,41 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/documents", tags=["Documents"])
 
+# Built once: validates a whole page of rows in a single pydantic-core call
+DOCUMENT_LIST_ADAPTER = TypeAdapter(List[DocumentSummary])
 
-def get_db():
-    """Database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Columns fetched for list views - content_text is only loaded by get_document
+DOCUMENT_SUMMARY_COLUMNS = (
+    Document.id,
+    Document.user_id,
+    Document.title,
+    Document.type,
+    Document.tags,
+    Document.created_at,
+    Document.updated_at,
+)
 
 
-def get_user_from_email(email: str, db: Session) -> User:
-    """Fetch User object from email."""
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return user
+def tags_match_any(tag_list: List[str], dialect_name: str):
+    """
+    Build a single predicate matching documents tagged with any of tag_list.
+    
+    PostgreSQL uses one JSONB "has any" (?|) test, served by the
+    idx_documents_tags_gin expression index; SQLite (local dev) uses json_each.
+    """
+    if dialect_name == "postgresql":
+        return cast(Document.tags, JSONB).op("?|")(array(tag_list))
+    tag_values = func.json_each(Document.tags).table_valued("value")
+    return exists(select(1).select_from(tag_values).where(tag_values.c.value.in_(tag_list)))
+
+
+# Control characters other than \n, \r, \t (includes the null byte)
+_CONTROL_CHAR_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# translate() deletion table: drops every byte except those control characters,
+# so the remaining length is the non-printable count
+_KEEP_CONTROL_BYTES = bytes(b for b in range(32) if b not in (9, 10, 13))
+_NON_CONTROL_BYTES = bytes(b for b in range(256) if b not in _KEEP_CONTROL_BYTES)
 
 
 def is_binary_content(content: str) -> bool:
@@ -50,43 +69,42 @@ def is_binary_content(content: str) -> bool:
     Check if content appears to be binary/corrupted data.
     
     Returns True if content looks like binary (ZIP files, PDFs, etc.)
+    Scans at most the first 1000 characters. Text with no control characters
+    (nearly every request) returns after one regex scan with no allocation.
     """
     if not content:
         return False
     
-    # Check for common binary file signatures
-    binary_signatures = [
-        b'PK',  # ZIP files (including .docx, .xlsx)
-        b'\x00',  # Null bytes
-        b'\xff\xd8\xff',  # JPEG
-        b'%PDF',  # PDF
-    ]
-    
-    # Check first 100 bytes for binary patterns
-    content_bytes = content.encode('utf-8', errors='ignore')[:100]
-    
     # Check for ZIP signature (most common issue)
     if content.startswith('PK'):
         return True
     
+    # Fast path: no null bytes or other control characters at all
+    if _CONTROL_CHAR_RE.search(content, 0, 1000) is None:
+        return False
+    
+    head = content[:1000]
+    
     # Check for null bytes (binary indicator)
-    if '\x00' in content[:1000]:
+    if '\x00' in head:
         return True
     
     # Check for high ratio of non-printable characters
     if len(content) > 100:
-        non_printable = sum(1 for c in content[:1000] if ord(c) < 32 and c not in '\n\r\t')
-        if non_printable > len(content[:1000]) * 0.1:  # More than 10% non-printable
+        # Control chars are single bytes in UTF-8, so the byte count equals the char count
+        sample = head.encode('utf-8', errors='ignore')
+        non_printable = len(sample.translate(None, _NON_CONTROL_BYTES))
+        if non_printable > len(head) * 0.1:  # More than 10% non-printable
             return True
     
     return False
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=DocumentResponse)
-def create_document(
+async def create_document(
     document_data: DocumentCreate,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new document.
@@ -94,18 +112,16 @@ def create_document(
     Requires authentication. Document will be associated with the authenticated user.
     """
     try:
-        user = get_user_from_email(email, db)
-        
         # Validate content is not binary
         if document_data.content_text and is_binary_content(document_data.content_text):
-            logger.warning(f"Rejected binary content for document creation: user_id={user.id}")
+            logger.warning(f"Rejected binary content for document creation: user_id={user_id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Document content appears to be binary or corrupted. Please use text content only."
             )
         
         document = Document(
-            user_id=user.id,
+            user_id=user_id,
             title=document_data.title,
             type=document_data.type,
             content_text=document_data.content_text,
@@ -113,17 +129,17 @@ def create_document(
         )
         
         db.add(document)
-        db.commit()
-        db.refresh(document)
+        await db.commit()
+        await db.refresh(document)
         
-        logger.info(f"Document created: document_id={document.id}, user_id={user.id}, type={document.type}")
+        logger.info(f"Document created: document_id={document.id}, user_id={user_id}, type={document.type}")
         
         return DocumentResponse.model_validate(document)
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create document: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -132,57 +148,65 @@ def create_document(
 
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=DocumentListResponse)
-def list_documents(
+async def list_documents(
     type: Optional[str] = Query(None, description="Filter by document type"),
     tags: Optional[str] = Query(None, description="Comma-separated list of tags"),
     search: Optional[str] = Query(None, description="Search in title and content"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List documents for the authenticated user.
     
     Supports filtering by type, tags, and search query.
-    Returns paginated results.
+    Returns paginated summaries (without content_text; use GET /documents/{id}).
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        # Base query - only user's documents
-        query = db.query(Document).filter(Document.user_id == user.id)
+        # Base query - only user's documents, summary columns only (no content_text)
+        stmt = select(*DOCUMENT_SUMMARY_COLUMNS).where(Document.user_id == user_id)
         
         # Apply filters
         if type:
-            query = query.filter(Document.type == type)
+            stmt = stmt.where(Document.type == type)
         
         if tags:
-            tag_list = [tag.strip() for tag in tags.split(",")]
+            tag_list = [tag.strip() for tag in tags.split(",") if tag.strip()]
             # Filter documents that have any of the specified tags
-            for tag in tag_list:
-                query = query.filter(Document.tags.contains([tag]))
+            if tag_list:
+                stmt = stmt.where(tags_match_any(tag_list, db.bind.dialect.name))
         
         if search:
+            # Substring match; served by the pg_trgm GIN indexes on title/content_text
             search_term = f"%{search}%"
-            query = query.filter(
+            stmt = stmt.where(
                 or_(
                     Document.title.ilike(search_term),
                     Document.content_text.ilike(search_term)
                 )
             )
         
-        # Get total count
-        total = query.count()
-        
-        # Apply pagination
+        # Fetch the page and the total in one round-trip (COUNT(*) OVER ())
         offset = (page - 1) * page_size
-        documents = query.order_by(Document.created_at.desc()).offset(offset).limit(page_size).all()
-        
-        logger.debug(f"Documents listed: user_id={user.id}, total={total}, page={page}")
+        rows = (await db.execute(
+            stmt.add_columns(func.count().over().label("total"))
+            .order_by(Document.created_at.desc())
+            .offset(offset)
+            .limit(page_size)
+        )).all()
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Page past the end: no row to carry the window total
+            total = await db.scalar(select(func.count()).select_from(stmt.subquery()))
+        else:
+            total = 0
+        
+        logger.debug(f"Documents listed: user_id={user_id}, total={total}, page={page}")
         
         return DocumentListResponse(
-            documents=[DocumentResponse.model_validate(doc) for doc in documents],
+            documents=DOCUMENT_LIST_ADAPTER.validate_python(rows, from_attributes=True),
             total=total,
             page=page,
             page_size=page_size
@@ -197,10 +221,10 @@ def list_documents(
 
 
 @router.get("/{document_id}", status_code=status.HTTP_200_OK, response_model=DocumentResponse)
-def get_document(
+async def get_document(
     document_id: int,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific document by ID.
@@ -208,14 +232,14 @@ def get_document(
     Returns 404 if document not found or user doesn't have access.
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        document = db.query(Document).filter(
-            and_(
-                Document.id == document_id,
-                Document.user_id == user.id
+        document = await db.scalar(
+            select(Document).where(
+                and_(
+                    Document.id == document_id,
+                    Document.user_id == user_id
+                )
             )
-        ).first()
+        )
         
         if not document:
             raise HTTPException(
@@ -236,11 +260,11 @@ def get_document(
 
 
 @router.put("/{document_id}", status_code=status.HTTP_200_OK, response_model=DocumentResponse)
-def update_document(
+async def update_document(
     document_id: int,
     document_data: DocumentUpdate,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing document.
@@ -249,14 +273,14 @@ def update_document(
     Only updates provided fields. Returns 404 if document not found or user doesn't have access.
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        document = db.query(Document).filter(
-            and_(
-                Document.id == document_id,
-                Document.user_id == user.id
+        document = await db.scalar(
+            select(Document).where(
+                and_(
+                    Document.id == document_id,
+                    Document.user_id == user_id
+                )
             )
-        ).first()
+        )
         
         if not document:
             raise HTTPException(
@@ -266,7 +290,7 @@ def update_document(
         
         # Validate content is not binary before updating
         if document_data.content_text is not None and is_binary_content(document_data.content_text):
-            logger.warning(f"Rejected binary content for document update: document_id={document_id}, user_id={user.id}")
+            logger.warning(f"Rejected binary content for document update: document_id={document_id}, user_id={user_id}")
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Document content appears to be binary or corrupted. Please use text content only."
@@ -277,18 +301,18 @@ def update_document(
         for field, value in update_data.items():
             setattr(document, field, value)
         
-        db.commit()
-        db.refresh(document)
+        await db.commit()
+        await db.refresh(document)
         
-        logger.info(f"Document updated: document_id={document.id}, user_id={user.id}")
+        logger.info(f"Document updated: document_id={document.id}, user_id={user_id}")
         
         return DocumentResponse.model_validate(document)
         
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to update document: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -297,10 +321,10 @@ def update_document(
 
 
 @router.delete("/{document_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_document(
+async def delete_document(
     document_id: int,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a document.
@@ -308,14 +332,14 @@ def delete_document(
     Returns 404 if document not found or user doesn't have access.
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        document = db.query(Document).filter(
-            and_(
-                Document.id == document_id,
-                Document.user_id == user.id
+        document = await db.scalar(
+            select(Document).where(
+                and_(
+                    Document.id == document_id,
+                    Document.user_id == user_id
+                )
             )
-        ).first()
+        )
         
         if not document:
             raise HTTPException(
@@ -323,18 +347,18 @@ def delete_document(
                 detail="Document not found"
             )
         
-        db.delete(document)
-        db.commit()
+        await db.delete(document)
+        await db.commit()
         
-        logger.info(f"Document deleted: document_id={document_id}, user_id={user.id}")
+        logger.info(f"Document deleted: document_id={document_id}, user_id={user_id}")
         
         return None
         
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to delete document: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
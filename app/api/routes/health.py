@@ -3,13 +3,13 @@ Health check endpoint for deployment monitoring.
 """
 from fastapi import APIRouter
 from datetime import datetime
-from app.db.session import SessionLocal
+from app.services.db_heartbeat import last_db_status, probe_database
 
 router = APIRouter(prefix="/health", tags=["Health"])
 
 
 @router.get("")
-def health_check():
+async def health_check():
     """
     Health check endpoint for deployment monitoring.
     
@@ -17,19 +17,16 @@ def health_check():
     """
     status = "healthy"
     
-    # Check database connectivity
-    try:
-        db = SessionLocal()
-        db.execute("SELECT 1")
-        db.close()
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
+    # Served from the background heartbeat; probe inline only if it isn't running
+    db_ok = last_db_status()
+    if db_ok is None:
+        db_ok = await probe_database()
+    if not db_ok:
         status = "degraded"
     
     return {
         "status": status,
         "timestamp": datetime.utcnow().isoformat(),
-        "database": db_status,
+        "database": "connected" if db_ok else "error",
         "version": "1.0.0",
     }
@@ -4,16 +4,18 @@ History/Activity endpoints.
 Provides timeline of user actions (AI feature usage, document operations, etc.).
 """
 import logging
-from typing import Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
+from typing import List, Optional
+from datetime import datetime, timezone
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, tuple_, bindparam
 
-from app.db.session import SessionLocal
-from app.db.models.user import User
+from app.db.session_async import get_async_db
 from app.db.models.usage import UsageEvent
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user_id
+from app.core.pagination import encode_cursor, decode_cursor, count_rows, json_page_bytes, stream_json_page, WINDOW_TOTAL
+from app.core.response_cache import response_cache_key, get_cached_response, cache_response, etag_response
 from app.schemas.history import (
     HistoryEntryResponse,
     HistoryListResponse,
@@ -23,88 +25,114 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/history", tags=["History"])
 
+# Statement fragments for get_history, built once at import (user bound at execute time)
+HISTORY_BASE = select(UsageEvent).where(UsageEvent.user_id == bindparam("user_id"))
+HISTORY_ORDER = (UsageEvent.created_at.desc(), UsageEvent.id.desc())
+HISTORY_KEYSET = tuple_(UsageEvent.created_at, UsageEvent.id)
 
-def get_db():
-    """Database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+# Built once: validates a whole page of rows in a single pydantic-core call
+HISTORY_ENTRIES_ADAPTER = TypeAdapter(List[HistoryEntryResponse])
+# Built once: serializes one HistoryEntryResponse straight to JSON bytes for streaming
+HISTORY_ENTRY_JSON = TypeAdapter(HistoryEntryResponse)
 
 
-def get_user_from_email(email: str, db: Session) -> User:
-    """Fetch User object from email."""
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return user
+def to_utc(value: datetime) -> datetime:
+    """Normalize a query datetime to UTC-aware (naive input is taken as UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
 
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=HistoryListResponse)
-def get_history(
+async def get_history(
+    request: Request,
     feature: Optional[str] = Query(None, description="Filter by feature name"),
     start_date: Optional[datetime] = Query(None, description="Filter by start date"),
     end_date: Optional[datetime] = Query(None, description="Filter by end date"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get activity timeline for the authenticated user.
     
     Returns a paginated list of usage events/actions.
-    Supports filtering by feature, date range.
+    Supports filtering by feature, date range, and keyset paging via cursor.
     """
+    after = decode_cursor(cursor) if cursor else None
+    
+    # Repeat reads (dashboard polling) are served from the short-lived Redis cache
+    cache_key = await response_cache_key("history", user_id, request)
+    if cache_key:
+        body = await get_cached_response(cache_key)
+        if body is not None:
+            return etag_response(body, request)
+    
     try:
-        user = get_user_from_email(email, db)
-        
         # Base query - only user's events
-        query = db.query(UsageEvent).filter(UsageEvent.user_id == user.id)
+        stmt = HISTORY_BASE
+        params = {"user_id": user_id}
         
         # Apply filters
         if feature:
-            query = query.filter(UsageEvent.feature == feature)
+            stmt = stmt.where(UsageEvent.feature == feature)
         
+        # created_at is TIMESTAMPTZ: bind UTC-aware values so the range stays on
+        # the (user_id, created_at) index rather than behind a cast
         if start_date:
-            query = query.filter(UsageEvent.created_at >= start_date)
+            stmt = stmt.where(UsageEvent.created_at >= to_utc(start_date))
         
         if end_date:
-            query = query.filter(UsageEvent.created_at <= end_date)
+            stmt = stmt.where(UsageEvent.created_at <= to_utc(end_date))
         
-        # Get total count
-        total = query.count()
+        ordered = stmt.order_by(*HISTORY_ORDER).limit(page_size)
+        if after:
+            # Keyset page after the cursor row; the predicate narrows any
+            # window, so the total is counted over the unfiltered statement
+            events = (await db.scalars(
+                ordered.where(HISTORY_KEYSET < tuple_(*after)), params
+            )).all()
+            total = await count_rows(db, stmt, params)
+        else:
+            # Fetch the page and the total in one round-trip (COUNT(*) OVER ())
+            offset = (page - 1) * page_size
+            rows = (await db.execute(
+                ordered.add_columns(WINDOW_TOTAL).offset(offset), params
+            )).all()
+            events = [row[0] for row in rows]
+            if rows:
+                total = rows[0].total
+            elif offset:
+                # Page past the end: no row to carry the window total
+                total = await count_rows(db, stmt, params)
+            else:
+                total = 0
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        events = query.order_by(desc(UsageEvent.created_at)).offset(offset).limit(page_size).all()
+        # Rows are fully loaded: hand the pooled connection back before the
+        # CPU-only response building below
+        await db.close()
         
-        logger.debug(f"History listed: user_id={user.id}, total={total}, page={page}")
+        next_cursor = None
+        if len(events) == page_size:
+            next_cursor = encode_cursor(events[-1].created_at, events[-1].id)
         
-        # Convert to response format
-        # Note: UsageEvent doesn't have document_id or job_id yet
-        # We can enhance the model later to support these fields
-        entries = []
-        for event in events:
-            entries.append(HistoryEntryResponse(
-                id=event.id,
-                feature=event.feature,
-                created_at=event.created_at,
-                amount=event.amount,
-                document_id=None,  # TODO: Add document_id to UsageEvent if needed
-                job_id=None  # TODO: Add job_id to UsageEvent if needed
-            ))
+        logger.debug(f"History listed: user_id={user_id}, total={total}, page={page}")
         
-        return HistoryListResponse(
-            entries=entries,
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+        # Convert to response format in one pydantic-core pass over the page
+        # Note: UsageEvent doesn't have document_id or job_id yet; both fall back
+        # to their None defaults. We can enhance the model later to support these fields
+        entries = HISTORY_ENTRIES_ADAPTER.validate_python(events, from_attributes=True)
+        
+        # Entries are validated above; serialize per row while streaming
+        serialized = (HISTORY_ENTRY_JSON.dump_json(entry) for entry in entries)
+        meta = {"total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor}
+        if cache_key:
+            body = json_page_bytes("entries", serialized, meta)
+            await cache_response(cache_key, body)
+            return etag_response(body, request)
+        return stream_json_page("entries", serialized, meta)
         
     except Exception as e:
         logger.error(f"Failed to get history: {e}", exc_info=True)
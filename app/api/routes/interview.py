@@ -1,7 +1,6 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
 from app.db.models.interview_session import InterviewSession
 from app.db.models.interview_evaluation import InterviewEvaluation
 from app.db.models.candidate_benchmark import CandidateBenchmark
@@ -11,7 +10,7 @@ from app.services.ai_engine import generate_weekly_progress_report
 
 
 
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user, get_db
 from app.services.ai_engine import (
     generate_live_answer,
     star_formatter,
@@ -21,15 +20,6 @@ from app.services.ai_engine import (
 router = APIRouter(prefix="/interview", tags=["Interview"])
 
 
-# ✅ DB DEPENDENCY
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ✅ START INTERVIEW SESSION
 @router.post("/start")
 def start_session(
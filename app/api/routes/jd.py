@@ -1,8 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Body
 from pydantic import BaseModel, Field
 from typing import List, Optional
-from app.services.ai_engine import extract_skills_from_jd
-from app.services.jd_parser_service import parse_job_description
+from app.services.jd_batcher import jd_parse_batcher, skill_extract_batcher
 from app.core.quota_guard import require_quota
 from app.core.auth_dependency import get_current_user
 from app.db.models.user import User
@@ -32,7 +31,7 @@ class ParseJDResponse(BaseModel):
 
 
 @router.post("/parse", response_model=ParseJDResponse)
-def parse_jd(
+async def parse_jd(
     request: ParseJDRequest = Body(...),
     email: str = Depends(get_current_user)
 ):
@@ -41,9 +40,10 @@ def parse_jd(
     
     Extracts: job title, company, location, skills, requirements, 
     responsibilities, experience level, salary range, and summary.
+    Parsing runs on the shared JD worker pool, micro-batched with concurrent requests.
     """
     try:
-        result = parse_job_description(request.jd_text)
+        result = await jd_parse_batcher.submit(request.jd_text)
         return ParseJDResponse(**result)
     except Exception as e:
         logger.error(f"Error parsing JD: {e}", exc_info=True)
@@ -54,9 +54,9 @@ def parse_jd(
 
 
 @router.post("/skills")
-def extract_skills(
+async def extract_skills(
     jd_text: str,
     user: User = Depends(require_quota("jd_parse"))
 ):
-    skills = extract_skills_from_jd(jd_text)
+    skills = await skill_extract_batcher.submit(jd_text)
     return {"skills": skills}
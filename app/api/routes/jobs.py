@@ -4,21 +4,23 @@ Job endpoints for Job Tracker.
 Provides CRUD operations for tracking job applications.
 """
 import logging
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy import select, insert, update, delete, exists, or_, and_, tuple_, bindparam
 
-from app.db.session import SessionLocal
-from app.db.models.user import User
+from app.db.session_async import get_async_db
 from app.db.models.job import Job
 from app.db.models.job_posting import JobPosting
 from app.db.models.match_analysis import MatchAnalysis
 from app.db.models.interview_pack import InterviewPack
 from app.db.models.outreach_message import OutreachMessage
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user_id
+from app.core.pagination import encode_cursor, decode_cursor, count_rows, json_page_bytes, stream_json_page, WINDOW_TOTAL
+from app.core.response_cache import response_cache_key, get_cached_response, cache_response, etag_response, invalidate_cached_responses
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
 from app.schemas.job import (
     JobCreate,
     JobUpdate,
@@ -30,32 +32,26 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/jobs", tags=["Jobs"])
 
+# Statement fragments for list_jobs, built once at import. The user is bound
+# at execute time, so the unfiltered listing reuses one statement object
+# (and its cached compiled SQL) instead of rebuilding it per request.
+# JobResponse has no relationship fields, so nothing needs eager loading;
+# raiseload guarantees no per-row lazy SELECT can sneak in (and fail under async)
+JOB_LIST_BASE = select(Job).options(raiseload("*")).where(Job.user_id == bindparam("user_id"))
+JOB_LIST_ORDER = (Job.created_at.desc(), Job.id.desc())
+JOB_KEYSET = tuple_(Job.created_at, Job.id)
 
-def get_db():
-    """Database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def get_user_from_email(email: str, db: Session) -> User:
-    """Fetch User object from email."""
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return user
+# Built once: validates a whole page of rows in a single pydantic-core call
+JOB_LIST_ADAPTER = TypeAdapter(List[JobResponse])
+# Built once: serializes one JobResponse straight to JSON bytes for streaming
+JOB_JSON = TypeAdapter(JobResponse)
 
 
 @router.post("", status_code=status.HTTP_201_CREATED, response_model=JobResponse)
-def create_job(
+async def create_job(
     job_data: JobCreate,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Create a new job application entry.
@@ -63,28 +59,27 @@ def create_job(
     Requires authentication. Job will be associated with the authenticated user.
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        job = Job(
-            user_id=user.id,
-            company=job_data.company,
-            title=job_data.title,
-            url=job_data.url,
-            status=job_data.status,
-            notes=job_data.notes,
-            applied_at=job_data.applied_at
+        # INSERT ... RETURNING hands back server defaults (id, timestamps) in one round-trip
+        job = await db.scalar(
+            insert(Job).values(
+                user_id=user_id,
+                company=job_data.company,
+                title=job_data.title,
+                url=job_data.url,
+                status=job_data.status,
+                notes=job_data.notes,
+                applied_at=job_data.applied_at
+            ).returning(Job)
         )
+        await db.commit()
+        await invalidate_cached_responses("jobs", user_id)
         
-        db.add(job)
-        db.commit()
-        db.refresh(job)
-        
-        logger.info(f"Job created: job_id={job.id}, user_id={user.id}, company={job.company}")
+        logger.info(f"Job created: job_id={job.id}, user_id={user_id}, company={job.company}")
         
         return JobResponse.model_validate(job)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to create job: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -93,38 +88,50 @@ def create_job(
 
 
 @router.get("", status_code=status.HTTP_200_OK, response_model=JobListResponse)
-def list_jobs(
+async def list_jobs(
+    request: Request,
     status: Optional[str] = Query(None, description="Filter by status"),
     company: Optional[str] = Query(None, description="Filter by company name (partial match)"),
     search: Optional[str] = Query(None, description="Search in company, title, and notes"),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (takes precedence over page)"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List job applications for the authenticated user.
     
     Supports filtering by status, company, and search query.
-    Returns paginated results.
+    Returns paginated results. Pass next_cursor back as cursor to page through
+    with keyset pagination, which stays O(page_size) at any depth.
     """
+    after = decode_cursor(cursor) if cursor else None
+    
+    # Repeat reads (dashboard polling) are served from the short-lived Redis cache
+    cache_key = await response_cache_key("jobs", user_id, request)
+    if cache_key:
+        body = await get_cached_response(cache_key)
+        if body is not None:
+            return etag_response(body, request)
+    
     try:
-        user = get_user_from_email(email, db)
-        
         # Base query - only user's jobs
-        query = db.query(Job).filter(Job.user_id == user.id)
+        stmt = JOB_LIST_BASE
+        params = {"user_id": user_id}
         
         # Apply filters
         if status:
-            query = query.filter(Job.status == status)
+            stmt = stmt.where(Job.status == status)
         
         if company:
             company_filter = f"%{company}%"
-            query = query.filter(Job.company.ilike(company_filter))
+            stmt = stmt.where(Job.company.ilike(company_filter))
         
         if search:
+            # Substring match; served by the pg_trgm GIN indexes on company/title/notes
             search_term = f"%{search}%"
-            query = query.filter(
+            stmt = stmt.where(
                 or_(
                     Job.company.ilike(search_term),
                     Job.title.ilike(search_term),
@@ -132,21 +139,49 @@ def list_jobs(
                 )
             )
         
-        # Get total count
-        total = query.count()
+        ordered = stmt.order_by(*JOB_LIST_ORDER).limit(page_size)
+        if after:
+            # Keyset page after the cursor row; the predicate narrows any
+            # window, so the total is counted over the unfiltered statement
+            jobs = (await db.scalars(
+                ordered.where(JOB_KEYSET < tuple_(*after)), params
+            )).all()
+            total = await count_rows(db, stmt, params)
+        else:
+            # Fetch the page and the total in one round-trip (COUNT(*) OVER ())
+            offset = (page - 1) * page_size
+            rows = (await db.execute(
+                ordered.add_columns(WINDOW_TOTAL).offset(offset), params
+            )).all()
+            jobs = [row[0] for row in rows]
+            if rows:
+                total = rows[0].total
+            elif offset:
+                # Page past the end: no row to carry the window total
+                total = await count_rows(db, stmt, params)
+            else:
+                total = 0
         
-        # Apply pagination
-        offset = (page - 1) * page_size
-        jobs = query.order_by(Job.created_at.desc()).offset(offset).limit(page_size).all()
+        # Rows are fully loaded: hand the pooled connection back before the
+        # CPU-only response building below
+        await db.close()
         
-        logger.debug(f"Jobs listed: user_id={user.id}, total={total}, page={page}")
+        next_cursor = None
+        if len(jobs) == page_size:
+            next_cursor = encode_cursor(jobs[-1].created_at, jobs[-1].id)
         
-        return JobListResponse(
-            jobs=[JobResponse.model_validate(job) for job in jobs],
-            total=total,
-            page=page,
-            page_size=page_size
-        )
+        logger.debug(f"Jobs listed: user_id={user_id}, total={total}, page={page}")
+        
+        # Validate up front so bad rows still fail as a 500; serialize per row while streaming
+        items = JOB_LIST_ADAPTER.validate_python(jobs, from_attributes=True)
+        
+        serialized = (JOB_JSON.dump_json(item) for item in items)
+        meta = {"total": total, "page": page, "page_size": page_size, "next_cursor": next_cursor}
+        if cache_key:
+            body = json_page_bytes("jobs", serialized, meta)
+            await cache_response(cache_key, body)
+            return etag_response(body, request)
+        return stream_json_page("jobs", serialized, meta)
         
     except Exception as e:
         logger.error(f"Failed to list jobs: {e}", exc_info=True)
@@ -157,10 +192,10 @@ def list_jobs(
 
 
 @router.get("/{job_id}", status_code=status.HTTP_200_OK, response_model=JobResponse)
-def get_job(
+async def get_job(
     job_id: int,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get a specific job by ID.
@@ -168,16 +203,10 @@ def get_job(
     Returns 404 if job not found or user doesn't have access.
     """
     try:
-        user = get_user_from_email(email, db)
+        # Primary-key get (identity map, cached statement); ownership checked in Python
+        job = await db.get(Job, job_id, options=[raiseload("*")])
         
-        job = db.query(Job).filter(
-            and_(
-                Job.id == job_id,
-                Job.user_id == user.id
-            )
-        ).first()
-        
-        if not job:
+        if not job or job.user_id != user_id:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found"
@@ -196,11 +225,11 @@ def get_job(
 
 
 @router.put("/{job_id}", status_code=status.HTTP_200_OK, response_model=JobResponse)
-def update_job(
+async def update_job(
     job_id: int,
     job_data: JobUpdate,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing job.
@@ -208,14 +237,19 @@ def update_job(
     Only updates provided fields. Returns 404 if job not found or user doesn't have access.
     """
     try:
-        user = get_user_from_email(email, db)
+        owned_job = and_(
+            Job.id == job_id,
+            Job.user_id == user_id
+        )
         
-        job = db.query(Job).filter(
-            and_(
-                Job.id == job_id,
-                Job.user_id == user.id
+        # Update only provided fields with one UPDATE ... RETURNING (no SELECT before or after)
+        update_data = job_data.model_dump(exclude_unset=True)
+        if update_data:
+            job = await db.scalar(
+                update(Job).where(owned_job).values(**update_data).returning(Job)
             )
-        ).first()
+        else:
+            job = await db.scalar(select(Job).where(owned_job))
         
         if not job:
             raise HTTPException(
@@ -223,23 +257,18 @@ def update_job(
                 detail="Job not found"
             )
         
-        # Update only provided fields
-        update_data = job_data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(job, field, value)
-        
-        db.commit()
-        db.refresh(job)
+        await db.commit()
+        await invalidate_cached_responses("jobs", user_id)
         
-        logger.info(f"Job updated: job_id={job.id}, user_id={user.id}")
+        logger.info(f"Job updated: job_id={job.id}, user_id={user_id}")
         
         return JobResponse.model_validate(job)
         
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to update job: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -248,10 +277,10 @@ def update_job(
 
 
 @router.delete("/{job_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_job(
+async def delete_job(
     job_id: int,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete a job.
@@ -259,33 +288,34 @@ def delete_job(
     Returns 404 if job not found or user doesn't have access.
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        job = db.query(Job).filter(
-            and_(
-                Job.id == job_id,
-                Job.user_id == user.id
+        # One owner-scoped DELETE instead of SELECT then DELETE; rowcount is the ownership check
+        result = await db.execute(
+            delete(Job).where(
+                and_(
+                    Job.id == job_id,
+                    Job.user_id == user_id
+                )
             )
-        ).first()
+        )
         
-        if not job:
+        if result.rowcount == 0:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job not found"
             )
         
-        db.delete(job)
-        db.commit()
+        await db.commit()
+        await invalidate_cached_responses("jobs", user_id)
         
-        logger.info(f"Job deleted: job_id={job_id}, user_id={user.id}")
+        logger.info(f"Job deleted: job_id={job_id}, user_id={user_id}")
         
         return None
         
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to delete job: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -322,10 +352,10 @@ class JobPostingResponse(BaseModel):
 
 
 @router.post("/import-url", status_code=status.HTTP_201_CREATED, response_model=JobPostingResponse)
-def import_job_url(
+async def import_job_url(
     request: ImportUrlRequest = ...,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Import a job posting by URL.
@@ -333,11 +363,9 @@ def import_job_url(
     Creates a JobPosting entry with placeholder JD text. Use parse-jd endpoint to extract full JD.
     """
     try:
-        user = get_user_from_email(email, db)
-        
         # Create job posting with placeholder JD text
         job_posting = JobPosting(
-            user_id=user.id,
+            user_id=user_id,
             source_url=request.source_url,
             company=request.company or "Unknown Company",
             title=request.title or "Job Posting",
@@ -346,15 +374,14 @@ def import_job_url(
         )
         
         db.add(job_posting)
-        db.commit()
-        db.refresh(job_posting)
+        await db.commit()
         
-        logger.info(f"Job posting imported: id={job_posting.id}, user_id={user.id}, url={request.source_url}")
+        logger.info(f"Job posting imported: id={job_posting.id}, user_id={user_id}, url={request.source_url}")
         
         return JobPostingResponse.model_validate(job_posting)
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to import job URL: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -363,10 +390,10 @@ def import_job_url(
 
 
 @router.post("/{job_id}/parse-jd", status_code=status.HTTP_200_OK, response_model=JobPostingResponse)
-def parse_job_description(
+async def parse_job_description(
     job_id: int,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Parse job description from a JobPosting's source URL.
@@ -374,13 +401,13 @@ def parse_job_description(
     Uses existing JD parsing logic or AI if configured. Updates the jd_text field.
     """
     try:
-        user = get_user_from_email(email, db)
-        
         # Get job posting (note: using job_id but looking up JobPosting)
-        job_posting = db.query(JobPosting).filter(
-            JobPosting.id == job_id,
-            JobPosting.user_id == user.id
-        ).first()
+        job_posting = await db.scalar(
+            select(JobPosting).where(
+                JobPosting.id == job_id,
+                JobPosting.user_id == user_id
+            )
+        )
         
         if not job_posting:
             raise HTTPException(
@@ -404,18 +431,17 @@ def parse_job_description(
             logger.warning(f"JD parsing failed, using placeholder: {e}")
             job_posting.jd_text = "[JD parsing failed - please enter manually]"
         
-        db.commit()
-        db.refresh(job_posting)
+        await db.commit()
         
-        logger.info(f"JD parsed for job posting: id={job_posting.id}, user_id={user.id}")
+        logger.info(f"JD parsed for job posting: id={job_posting.id}, user_id={user_id}")
         
         return JobPostingResponse.model_validate(job_posting)
         
     except HTTPException:
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Failed to parse JD: {e}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -424,10 +450,10 @@ def parse_job_description(
 
 
 @router.get("/{job_id}/insights", status_code=status.HTTP_200_OK)
-def get_job_insights(
+async def get_job_insights(
     job_id: int,
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get insights for a job posting.
@@ -435,33 +461,50 @@ def get_job_insights(
     Returns match analysis, recruiter lens, outreach suggestions, and interview pack availability.
     """
     try:
-        user = get_user_from_email(email, db)
-        
-        # Get job posting
-        job_posting = db.query(JobPosting).filter(
-            JobPosting.id == job_id,
-            JobPosting.user_id == user.id
-        ).first()
+        # Job posting, its latest match analysis and interview pack existence in
+        # one round-trip: LEFT JOIN on the newest analysis id plus an EXISTS column
+        latest_match_id = (
+            select(MatchAnalysis.id)
+            .where(
+                MatchAnalysis.job_id == job_id,
+                MatchAnalysis.user_id == user_id
+            )
+            .order_by(MatchAnalysis.created_at.desc())
+            .limit(1)
+            .correlate(None)  # Self-contained: don't correlate to the joined match_analyses
+            .scalar_subquery()
+        )
+        has_pack = exists().where(
+            InterviewPack.job_id == job_id,
+            InterviewPack.user_id == user_id
+        ).label("has_interview_pack")
+        
+        row = (await db.execute(
+            select(JobPosting, MatchAnalysis, has_pack)
+            .outerjoin(MatchAnalysis, MatchAnalysis.id == latest_match_id)
+            .where(
+                JobPosting.id == job_id,
+                JobPosting.user_id == user_id
+            )
+        )).first()
         
-        if not job_posting:
+        if not row:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Job posting not found"
             )
         
-        # Get latest match analysis for this job
-        match_analysis = db.query(MatchAnalysis).filter(
-            MatchAnalysis.job_id == job_id,
-            MatchAnalysis.user_id == user.id
-        ).order_by(MatchAnalysis.created_at.desc()).first()
+        job_posting, match_analysis, has_interview_pack = row
         
         # Get outreach messages for this job
-        outreach_messages = db.query(OutreachMessage).filter(
-            OutreachMessage.job_id == job_id,
-            OutreachMessage.user_id == user.id
-        ).order_by(OutreachMessage.created_at.desc()).limit(5).all()
-        
-        # Build insights response
+        outreach_messages = (await db.scalars(
+            select(OutreachMessage).where(
+                OutreachMessage.job_id == job_id,
+                OutreachMessage.user_id == user_id
+            ).order_by(OutreachMessage.created_at.desc()).limit(5)
+        )).all()
+        
+        # Build insights response (ORJSONResponse renders datetimes as ISO 8601)
         insights = {
             "job_posting": {
                 "id": job_posting.id,
@@ -475,21 +518,19 @@ def get_job_insights(
             "outreach_suggestions": [
                 {
                     "type": msg.type.value,
-                    "created_at": str(msg.created_at),
-                    "preview": msg.content[:100] + "..." if len(msg.content) > 100 else msg.content
+                    "created_at": msg.created_at,
+                    # A 101st character means the preview was truncated
+                    "preview": msg.content[:100] + ("..." if msg.content[100:101] else "")
                 }
                 for msg in outreach_messages
             ],
-            "has_interview_pack": db.query(InterviewPack).filter(
-                InterviewPack.job_id == job_id,
-                InterviewPack.user_id == user.id
-            ).first() is not None
+            "has_interview_pack": has_interview_pack
         }
         
         if match_analysis:
             insights["match_analysis"] = {
                 "score": match_analysis.score,
-                "created_at": str(match_analysis.created_at),
+                "created_at": match_analysis.created_at,
                 "narrative": match_analysis.narrative
             }
             insights["recruiter_lens"] = match_analysis.recruiter_lens
@@ -1,39 +1,71 @@
-from fastapi import APIRouter, UploadFile, Depends
+import asyncio
+import os
+import secrets
+import shutil
+from fastapi import APIRouter, BackgroundTasks, UploadFile, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
 from app.db.models.resume import Resume
-from app.services.resume_parser import parse_resume
-from app.core.auth_dependency import get_current_user
+from app.services.resume_parser import parse_and_store_resume
+from app.core.auth_dependency import get_current_user_id, get_db
 
 router = APIRouter(prefix="/resume", tags=["Resume"])
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+UPLOAD_DIR = "uploads"
+UPLOAD_CHUNK_BYTES = 1 << 16
 
-@router.post("/upload")
+
+def save_upload(file: UploadFile, file_path: str) -> None:
+    """Copy an upload to disk in fixed-size chunks (never the whole file in memory)."""
+    with open(file_path, "wb") as f:
+        shutil.copyfileobj(file.file, f, UPLOAD_CHUNK_BYTES)
+
+
+@router.post("/upload", status_code=status.HTTP_202_ACCEPTED)
 async def upload_resume(
-    user_id: int,
     file: UploadFile,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
+    background_tasks: BackgroundTasks,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
 ):
-    file_path = f"uploads/{file.filename}"
-
-    with open(file_path, "wb") as f:
-        f.write(await file.read())
+    """
+    Save an uploaded resume for the authenticated user and parse it in the background.
+    
+    Returns 202 with the resume ID; poll GET /resume/{resume_id}/status until
+    parsing finishes.
+    """
+    # Random prefix avoids collisions; basename drops any client-supplied path
+    filename = os.path.basename(file.filename or "resume")
+    file_path = os.path.join(UPLOAD_DIR, f"{secrets.token_hex(8)}_{filename}")
 
-    parsed_text = parse_resume(file_path)
+    # Disk writes are blocking; keep them off the event loop
+    await asyncio.to_thread(save_upload, file, file_path)
 
     resume = Resume(
         user_id=user_id,
         original_file=file.filename,
-        parsed_text=parsed_text
+        parse_status="pending"
     )
     db.add(resume)
+    db.flush()
+    resume_id = resume.id
     db.commit()
 
-    return {"message": "Resume uploaded securely"}
+    background_tasks.add_task(parse_and_store_resume, resume_id, file_path)
+
+    return {"message": "Resume uploaded securely", "resume_id": resume_id, "status": "pending"}
+
+
+@router.get("/{resume_id}/status")
+def get_resume_status(
+    resume_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    """Parse status of an uploaded resume: pending, parsed or failed."""
+    row = db.query(Resume.parse_status).filter(
+        Resume.id == resume_id,
+        Resume.user_id == user_id
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found")
+    return {"resume_id": resume_id, "status": row.parse_status or "parsed"}
@@ -2,30 +2,66 @@
 Resume Version endpoints for managing resume versions per job.
 """
 import logging
-from typing import Optional, List, Dict, Any, Dict, Any
-from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Optional, List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Body, Response
+from sqlalchemy import case, exists, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+from pydantic import BaseModel, Field, field_serializer
 
-from app.db.session import SessionLocal
-from app.db.models.user import User
+from app.db.session_async import get_async_db
 from app.db.models.job import Job
 from app.db.models.resume_version import ResumeVersion
-from app.core.auth_dependency import get_current_user, get_current_user_obj
-from app.db.session import SessionLocal
+from app.core.auth_dependency import get_current_user_id
+from app.core.pagination import WINDOW_TOTAL, count_rows
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/resume-versions", tags=["Resume Versions"])
 
 
-def get_db():
-    """Database session dependency."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+async def _ensure_job_owned(db: AsyncSession, job_id: int, user_id: int) -> None:
+    """Raise 404 unless job_id belongs to user_id."""
+    owned = await db.scalar(select(exists().where(Job.id == job_id, Job.user_id == user_id)))
+    if not owned:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+
+async def _get_owned_version(db: AsyncSession, version_id: int, user_id: int) -> Optional[ResumeVersion]:
+    """Fetch a version by id, scoped to its owner."""
+    return await db.scalar(
+        select(ResumeVersion).where(
+            ResumeVersion.id == version_id,
+            ResumeVersion.user_id == user_id
+        )
+    )
+
+
+async def _activate_version(db: AsyncSession, user_id: int, job_id: int, version_id: int) -> None:
+    """
+    Make version_id the only active version for the job, in one UPDATE.
+    
+    Every sibling row is written (not just the currently active one), so
+    concurrent activations queue on each other's row locks and the last one
+    wins instead of leaving two active versions.
+    """
+    await db.execute(
+        update(ResumeVersion)
+        .where(ResumeVersion.user_id == user_id, ResumeVersion.job_id == job_id)
+        .values(is_active=case((ResumeVersion.id == version_id, True), else_=False))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _json_response(model: BaseModel) -> Response:
+    """
+    Serialize an already-validated response model as-is.
+    
+    Returning a Response skips FastAPI's dump-and-revalidate pass against
+    response_model (which stays on the route for the OpenAPI schema).
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
 
 
 # Request/Response models
@@ -47,18 +83,23 @@ class ResumeVersionResponse(BaseModel):
     content: str
     is_active: bool
     is_base: bool
-    created_at: str
+    created_at: Optional[datetime]
     created_by: Optional[str]
     notes: Optional[str]
     
     class Config:
         from_attributes = True
+    
+    @field_serializer("created_at")
+    def serialize_created_at(self, created_at: Optional[datetime]) -> str:
+        return created_at.isoformat() if created_at else ""
 
 
 class ResumeVersionListResponse(BaseModel):
     """Response model for list of resume versions."""
     versions: List[ResumeVersionResponse]
     total: int
+    next_before_version: Optional[int] = None  # Pass as before_version for the next page
 
 
 class ResumeVersionCompareResponse(BaseModel):
@@ -69,71 +110,78 @@ class ResumeVersionCompareResponse(BaseModel):
 
 
 @router.get("/{job_id}", response_model=ResumeVersionListResponse)
-def list_versions(
+async def list_versions(
     job_id: int,
-    current_user: User = Depends(get_current_user_obj),
-    db: Session = Depends(get_db)
+    limit: int = Query(50, ge=1, le=200, description="Versions per page"),
+    offset: int = Query(0, ge=0, description="Versions to skip (ignored with before_version)"),
+    before_version: Optional[int] = Query(None, ge=1, description="next_before_version from the previous page"),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all resume versions for a job."""
+    """
+    List resume versions for a job, newest first.
+    
+    Pages with limit/offset, or with before_version (keyset), which walks
+    idx_user_job_version and stays O(limit) at any depth.
+    """
     # Verify job belongs to user
-    job = db.query(Job).filter(Job.id == job_id, Job.user_id == current_user.id).first()
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
+    await _ensure_job_owned(db, job_id, user_id)
     
-    versions = db.query(ResumeVersion).filter(
-        ResumeVersion.user_id == current_user.id,
+    stmt = select(ResumeVersion).where(
+        ResumeVersion.user_id == user_id,
         ResumeVersion.job_id == job_id
-    ).order_by(ResumeVersion.version.desc()).all()
-    
-    return ResumeVersionListResponse(
-        versions=[ResumeVersionResponse(
-            id=v.id,
-            job_id=v.job_id,
-            version=v.version,
-            title=v.title,
-            content=v.content,
-            is_active=v.is_active,
-            is_base=v.is_base,
-            created_at=v.created_at.isoformat() if v.created_at else "",
-            created_by=v.created_by,
-            notes=v.notes,
-        ) for v in versions],
-        total=len(versions)
     )
+    ordered = stmt.order_by(ResumeVersion.version.desc()).limit(limit)
+    
+    if before_version is not None:
+        # The keyset predicate would narrow a window total, so count separately
+        versions = (await db.scalars(ordered.where(ResumeVersion.version < before_version))).all()
+        total = await count_rows(db, stmt)
+    else:
+        # Page and total in one round trip (COUNT(*) OVER ())
+        rows = (await db.execute(ordered.add_columns(WINDOW_TOTAL).offset(offset))).all()
+        versions = [row[0] for row in rows]
+        if rows:
+            total = rows[0].total
+        elif offset:
+            # Page past the end: no row to carry the window total
+            total = await count_rows(db, stmt)
+        else:
+            total = 0
+    
+    next_before_version = versions[-1].version if len(versions) == limit else None
+    
+    return _json_response(ResumeVersionListResponse(
+        versions=[ResumeVersionResponse.model_validate(v) for v in versions],
+        total=total,
+        next_before_version=next_before_version,
+    ))
 
 
 @router.post("", response_model=ResumeVersionResponse, status_code=status.HTTP_201_CREATED)
-def create_version(
+async def create_version(
     request: ResumeVersionCreate = Body(...),
-    current_user: User = Depends(get_current_user_obj),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new resume version."""
     # Verify job belongs to user if job_id provided
     if request.job_id:
-        job = db.query(Job).filter(Job.id == request.job_id, Job.user_id == current_user.id).first()
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
+        await _ensure_job_owned(db, request.job_id, user_id)
     
     # Get next version number
-    existing = db.query(ResumeVersion).filter(
-        ResumeVersion.user_id == current_user.id,
-        ResumeVersion.job_id == request.job_id
-    ).order_by(ResumeVersion.version.desc()).first()
+    latest = await db.scalar(
+        select(ResumeVersion.version).where(
+            ResumeVersion.user_id == user_id,
+            ResumeVersion.job_id == request.job_id
+        ).order_by(ResumeVersion.version.desc()).limit(1)
+    )
     
-    next_version = (existing.version + 1) if existing else 1
-    
-    # Deactivate other versions if make_active is True
-    if request.make_active and request.job_id:
-        db.query(ResumeVersion).filter(
-            ResumeVersion.user_id == current_user.id,
-            ResumeVersion.job_id == request.job_id,
-            ResumeVersion.is_active == True
-        ).update({"is_active": False})
+    next_version = (latest + 1) if latest else 1
     
     # Create new version
     version = ResumeVersion(
-        user_id=current_user.id,
+        user_id=user_id,
         job_id=request.job_id,
         version=next_version,
         title=request.title,
@@ -144,36 +192,28 @@ def create_version(
     )
     
     db.add(version)
-    db.commit()
-    db.refresh(version)
     
-    logger.info(f"Resume version created: id={version.id}, user_id={current_user.id}, job_id={request.job_id}")
+    # Deactivate other versions if make_active is True
+    if request.make_active and request.job_id:
+        await db.flush()
+        await _activate_version(db, user_id, request.job_id, version.id)
     
-    return ResumeVersionResponse(
-        id=version.id,
-        job_id=version.job_id,
-        version=version.version,
-        title=version.title,
-        content=version.content,
-        is_active=version.is_active,
-        is_base=version.is_base,
-        created_at=version.created_at.isoformat() if version.created_at else "",
-        created_by=version.created_by,
-        notes=version.notes,
-    )
+    # created_at comes back via INSERT ... RETURNING; no refresh needed
+    await db.commit()
+    
+    logger.info(f"Resume version created: id={version.id}, user_id={user_id}, job_id={request.job_id}")
+    
+    return ResumeVersionResponse.model_validate(version)
 
 
 @router.post("/{version_id}/restore", response_model=ResumeVersionResponse)
-def restore_version(
+async def restore_version(
     version_id: int,
-    current_user: User = Depends(get_current_user_obj),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Restore a version as active (creates a new version with same content)."""
-    version = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id,
-        ResumeVersion.user_id == current_user.id
-    ).first()
+    version = await _get_owned_version(db, version_id, user_id)
     
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
@@ -187,20 +227,17 @@ def restore_version(
         notes=f"Restored from version {version.version}",
     )
     
-    return create_version(request, current_user, db)
+    return await create_version(request, user_id, db)
 
 
 @router.post("/{version_id}/make-active", response_model=ResumeVersionResponse)
-def make_active(
+async def make_active(
     version_id: int,
-    current_user: User = Depends(get_current_user_obj),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Set a version as the active version for its job."""
-    version = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id,
-        ResumeVersion.user_id == current_user.id
-    ).first()
+    version = await _get_owned_version(db, version_id, user_id)
     
     if not version:
         raise HTTPException(status_code=404, detail="Version not found")
@@ -208,51 +245,35 @@ def make_active(
     if not version.job_id:
         raise HTTPException(status_code=400, detail="Cannot set active version for general resume")
     
-    # Deactivate other versions for this job
-    db.query(ResumeVersion).filter(
-        ResumeVersion.user_id == current_user.id,
-        ResumeVersion.job_id == version.job_id,
-        ResumeVersion.is_active == True
-    ).update({"is_active": False})
-    
-    # Activate this version
-    version.is_active = True
-    db.commit()
-    db.refresh(version)
+    # Activate this version and deactivate the others for this job
+    await _activate_version(db, user_id, version.job_id, version.id)
+    await db.commit()
+    # Mirror the UPDATE on the loaded row without marking it dirty
+    set_committed_value(version, "is_active", True)
     
-    logger.info(f"Resume version activated: id={version.id}, user_id={current_user.id}, job_id={version.job_id}")
+    logger.info(f"Resume version activated: id={version.id}, user_id={user_id}, job_id={version.job_id}")
     
-    return ResumeVersionResponse(
-        id=version.id,
-        job_id=version.job_id,
-        version=version.version,
-        title=version.title,
-        content=version.content,
-        is_active=version.is_active,
-        is_base=version.is_base,
-        created_at=version.created_at.isoformat() if version.created_at else "",
-        created_by=version.created_by,
-        notes=version.notes,
-    )
+    return ResumeVersionResponse.model_validate(version)
 
 
 @router.get("/{version_id1}/compare/{version_id2}", response_model=ResumeVersionCompareResponse)
-def compare_versions(
+async def compare_versions(
     version_id1: int,
     version_id2: int,
-    current_user: User = Depends(get_current_user_obj),
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Compare two resume versions."""
-    v1 = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id1,
-        ResumeVersion.user_id == current_user.id
-    ).first()
-    
-    v2 = db.query(ResumeVersion).filter(
-        ResumeVersion.id == version_id2,
-        ResumeVersion.user_id == current_user.id
-    ).first()
+    # Both versions in one round trip
+    result = await db.scalars(
+        select(ResumeVersion).where(
+            ResumeVersion.id.in_([version_id1, version_id2]),
+            ResumeVersion.user_id == user_id
+        )
+    )
+    by_id = {v.id: v for v in result.all()}
+    v1 = by_id.get(version_id1)
+    v2 = by_id.get(version_id2)
     
     if not v1 or not v2:
         raise HTTPException(status_code=404, detail="Version not found")
@@ -264,33 +285,11 @@ def compare_versions(
         "version_diff": v2.version - v1.version,
     }
     
-    return ResumeVersionCompareResponse(
-        version1=ResumeVersionResponse(
-            id=v1.id,
-            job_id=v1.job_id,
-            version=v1.version,
-            title=v1.title,
-            content=v1.content,
-            is_active=v1.is_active,
-            is_base=v1.is_base,
-            created_at=v1.created_at.isoformat() if v1.created_at else "",
-            created_by=v1.created_by,
-            notes=v1.notes,
-        ),
-        version2=ResumeVersionResponse(
-            id=v2.id,
-            job_id=v2.job_id,
-            version=v2.version,
-            title=v2.title,
-            content=v2.content,
-            is_active=v2.is_active,
-            is_base=v2.is_base,
-            created_at=v2.created_at.isoformat() if v2.created_at else "",
-            created_by=v2.created_by,
-            notes=v2.notes,
-        ),
+    return _json_response(ResumeVersionCompareResponse(
+        version1=ResumeVersionResponse.model_validate(v1),
+        version2=ResumeVersionResponse.model_validate(v2),
         diff=diff_data,
-    )
+    ))
 
 
 def _simple_diff(text1: str, text2: str) -> Dict[str, Any]:
@@ -298,8 +297,11 @@ def _simple_diff(text1: str, text2: str) -> Dict[str, Any]:
     lines1 = text1.split("\n")
     lines2 = text2.split("\n")
     
-    added = [line for line in lines2 if line not in lines1]
-    removed = [line for line in lines1 if line not in lines2]
+    # Set lookups keep this O(n + m) instead of scanning the other list per line
+    seen1 = set(lines1)
+    seen2 = set(lines2)
+    added = [line for line in lines2 if line not in seen1]
+    removed = [line for line in lines1 if line not in seen2]
     
     return {
         "added_lines": added,
@@ -1,22 +1,31 @@
 from fastapi import APIRouter
-from sqlalchemy import text
-from app.db.session import SessionLocal
+from app.db.session import engine
+from app.db.session_async import async_engine
+from app.services.db_heartbeat import last_db_status, probe_database
 
 router = APIRouter(prefix="/system", tags=["System"])
 
 @router.get("/health")
-def system_health():
-    db_ok = True
-    try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
-    except Exception as e:
-        db_ok = False
+async def system_health():
+    # Served from the background heartbeat; probe inline only if it isn't running
+    db_ok = last_db_status()
+    if db_ok is None:
+        db_ok = await probe_database()
 
     return {
-        "status": "ok",
+        "status": "ok" if db_ok else "degraded",
         "database": "connected" if db_ok else "error",
         "api_version": "1.0.0",
         "service": "Hireblaze API"
     }
+
+
+@router.get("/metrics")
+def system_metrics():
+    """Connection pool occupancy for the sync and async engines."""
+    return {
+        "db_pool": {
+            "sync": engine.pool.status(),
+            "async": async_engine.sync_engine.pool.status(),
+        }
+    }
@@ -4,12 +4,12 @@ Usage tracking endpoints.
 Provides usage statistics and quota information for authenticated users.
 """
 import logging
-from fastapi import APIRouter, Depends, status, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
-from app.db.models.user import User
-from app.core.auth_dependency import get_current_user
+from app.db.session_async import get_async_db
+from app.core.auth_dependency import get_current_user_id
+from app.core.usage_cache import get_cached_usage, cache_usage
 from app.services.quota_service import get_usage_for_response
 
 logger = logging.getLogger(__name__)
@@ -17,30 +17,10 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="", tags=["Usage"])  # Changed from "/me" to "" to support /api/v1/usage pattern
 
 
-def get_db():
-    """Database session dependency following existing route patterns."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-def get_user_from_email(email: str, db: Session) -> User:
-    """Fetch User object from email."""
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
-        )
-    return user
-
-
 @router.get("/usage", status_code=status.HTTP_200_OK)  # Route is now /usage (was /me/usage)
-def get_usage(
-    email: str = Depends(get_current_user),
-    db: Session = Depends(get_db)
+async def get_usage(
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get current month usage statistics for the authenticated user.
@@ -53,12 +33,16 @@ def get_usage(
         
     Requires authentication via Bearer token.
     """
-    # Get user
-    user = get_user_from_email(email, db)
+    # Dashboards poll this; recording usage drops the cached entry
+    usage_data = get_cached_usage(user_id)
+    if usage_data is not None:
+        return usage_data
     
-    # Get usage data
-    usage_data = get_usage_for_response(db, user.id)
+    # quota_service is shared with the sync quota guard; run it on this
+    # session's connection instead of blocking a threadpool worker
+    usage_data = await db.run_sync(get_usage_for_response, user_id)
+    cache_usage(user_id, usage_data)
     
-    logger.debug(f"Usage summary requested: user_id={user.id}, plan={usage_data['plan']}")
+    logger.debug(f"Usage summary requested: user_id={user_id}, plan={usage_data['plan']}")
     
     return usage_data
@@ -1,13 +1,20 @@
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+import jwt
 from sqlalchemy.orm import Session
 from app.core.config import SECRET_KEY, ALGORITHM
 from app.db.session import SessionLocal
 from app.db.models.user import User
+from app.core.user_cache import get_cached_user_id, cache_user_id
+from app.core.token_cache import get_cached_payload, cache_payload
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Decode parameters built once instead of per request
+_JWT_KEY = SECRET_KEY.encode("utf-8")
+_JWT_ALGORITHMS = [ALGORITHM]
+_JWT_OPTIONS = {"require": ["sub", "exp"]}
+
 
 def get_db():
     """Database session dependency."""
@@ -18,27 +25,78 @@ def get_db():
         db.close()
 
 
+def decode_token(token: str) -> dict:
+    """
+    Verify and decode a JWT, memoized briefly in the in-process token cache.
+
+    Raises 401 if the token is invalid or expired.
+    """
+    payload = get_cached_payload(token)
+    if payload is not None:
+        return payload
+
+    try:
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS, options=_JWT_OPTIONS)
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    cache_payload(token, payload)
+    return payload
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
     """Get current user email from JWT token."""
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
+    payload = decode_token(token)
+    email: str = payload.get("sub")
 
-        if email is None:
-            raise HTTPException(status_code=401, detail="Invalid token")
+    if email is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+
+    return email
+
+
+def get_current_user_id(token: str = Depends(oauth2_scheme)) -> int:
+    """
+    Get current user ID from JWT token without a users lookup.
 
-        return email
+    Tokens issued at login/signup carry the user ID in the "uid" claim.
+    Tokens minted before that claim existed fall back to an email lookup,
+    memoized in the in-process user ID cache.
+    """
+    payload = decode_token(token)
 
-    except JWTError:
+    user_id = payload.get("uid")
+    if user_id is not None:
+        return int(user_id)
+
+    email = payload.get("sub")
+    if email is None:
         raise HTTPException(status_code=401, detail="Invalid token")
 
+    user_id = get_cached_user_id(email)
+    if user_id is not None:
+        return user_id
+
+    with SessionLocal() as db:
+        user_id = db.query(User.id).filter(User.email == email).scalar()
+    if user_id is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    cache_user_id(email, user_id)
+    return user_id
+
 
 def get_current_user_obj(
-    email: str = Depends(get_current_user),
+    user_id: int = Depends(get_current_user_id),
     db: Session = Depends(get_db)
 ) -> User:
-    """Get current User object from JWT token."""
-    user = db.query(User).filter(User.email == email).first()
+    """
+    Get current User object from JWT token.
+
+    Loaded by primary key on every request (plan changes must be visible
+    immediately); the email -> ID step is served from the token and user ID
+    caches.
+    """
+    user = db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=404,
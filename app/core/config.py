@@ -17,6 +17,20 @@ if not DATABASE_URL:
     DATABASE_URL = "sqlite:///./hireblaze.db"
     logger.warning("DATABASE_URL not set. Using SQLite for local development.")
 
+# Set when DATABASE_URL points at PgBouncer (transaction pooling): disables app-side
+# pooling and asyncpg prepared statements
+PGBOUNCER = os.getenv("PGBOUNCER", "").lower() in ("1", "true", "yes")
+
+# Postgres connection pools, per worker process. The sync and async engines pool
+# separately, so one process can hold up to
+# DB_POOL_SIZE + DB_MAX_OVERFLOW + ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW
+# connections; that times workers times replicas must stay below the server's
+# max_connections (100 by default) minus room for migrations and admin sessions
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "5"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "5"))
+
 # SECRET_KEY: Required in production, but provide safe dev default for local
 SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
@@ -39,6 +53,9 @@ STRIPE_WEBHOOK_SECRET = os.getenv("STRIPE_WEBHOOK_SECRET")
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Redis (optional) - shared queues/caches across workers; features fall back to in-process when unset
+REDIS_URL = os.getenv("REDIS_URL")
+
 # Feature gating limits
 MAX_FREE_AI_CALLS_PER_DAY = int(os.getenv("MAX_FREE_AI_CALLS_PER_DAY", "3"))
 
@@ -7,14 +7,63 @@ Supports 3-tier plan system: free, pro, elite
 import logging
 from datetime import date, datetime
 from typing import Optional, Dict, Any
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 from app.db.models.user import User
 from app.db.models.ai_usage import AIUsage
+from app.db.upsert import upsert_insert
 from app.core.config import MAX_FREE_AI_CALLS_PER_DAY, FRONTEND_URL
 
 logger = logging.getLogger(__name__)
 
+# Feature access matrix, built once (each tier includes the one below it)
+_FREE_FEATURES = frozenset({
+    "basic_ai_rewrite",
+    "grammar_check",
+    "basic_job_tracking",
+})
+_PRO_FEATURES = _FREE_FEATURES | frozenset({
+    "advanced_ai_tools",
+    "interview_pack",
+    "outreach_generator",
+    "job_pack_export",
+    "company_research",
+    "resume_versioning",
+    "ats_heatmap",
+    "match_score",
+    "recruiter_lens",
+})
+_ELITE_FEATURES = _PRO_FEATURES | frozenset({
+    "interview_simulation",
+    "weekly_review",
+    "smart_reapply",
+})
+_ELITE_ONLY_FEATURES = _ELITE_FEATURES - _PRO_FEATURES
+
+_FEATURE_TIERS: Dict[str, frozenset] = {
+    "free": _FREE_FEATURES,
+    "pro": _PRO_FEATURES,
+    "elite": _ELITE_FEATURES,
+}
+
+# Plans with no daily AI limit
+_UNLIMITED_AI_PLANS = frozenset({"pro", "elite"})
+
+# 402 paywall payloads: constant fields built once, per-call fields merged in
+_UPGRADE_URL = f"{FRONTEND_URL}/pricing"
+_AI_LIMIT_PAYWALL: Dict[str, Any] = {
+    "detail": "Daily limit reached. Upgrade to Pro or Elite for unlimited AI actions.",
+    "code": "PAYWALL",
+    "feature": "ai_actions",
+    "upgrade_url": _UPGRADE_URL,
+    "limit": MAX_FREE_AI_CALLS_PER_DAY,
+}
+_FEATURE_PAYWALL_MESSAGES: Dict[str, str] = {
+    required_plan: f"This feature requires {required_plan.title()} plan. Upgrade to unlock."
+    for required_plan in ("pro", "elite")
+}
+
 
 def get_user_plan(user: User) -> str:
     """
@@ -23,10 +72,18 @@ def get_user_plan(user: User) -> str:
     Returns "free", "pro", or "elite" based on user.plan field.
     Defaults to "free" if not set.
     """
-    plan = user.plan or "free"
+    raw_plan = user.plan
+    # Memoized on the (request-scoped) instance; keyed by the raw value so a
+    # plan change on the same instance is never served stale
+    cached = user.__dict__.get("_cached_plan")
+    if cached is not None and cached[0] == raw_plan:
+        return cached[1]
+    
+    plan = raw_plan or "free"
     # Normalize legacy "premium" to "pro"
     if plan == "premium":
-        return "pro"
+        plan = "pro"
+    user.__dict__["_cached_plan"] = (raw_plan, plan)
     return plan
 
 
@@ -50,87 +107,42 @@ def has_feature_access(user: User, feature: str) -> bool:
     - pro: Most premium features
     - elite: All features
     """
-    plan = get_user_plan(user)
-    
-    # Feature access matrix
-    feature_tiers = {
-        "free": [
-            "basic_ai_rewrite",
-            "grammar_check",
-            "basic_job_tracking",
-        ],
-        "pro": [
-            "basic_ai_rewrite",
-            "grammar_check",
-            "basic_job_tracking",
-            "advanced_ai_tools",
-            "interview_pack",
-            "outreach_generator",
-            "job_pack_export",
-            "company_research",
-            "resume_versioning",
-            "ats_heatmap",
-            "match_score",
-            "recruiter_lens",
-        ],
-        "elite": [
-            "basic_ai_rewrite",
-            "grammar_check",
-            "basic_job_tracking",
-            "advanced_ai_tools",
-            "interview_pack",
-            "outreach_generator",
-            "job_pack_export",
-            "company_research",
-            "resume_versioning",
-            "ats_heatmap",
-            "match_score",
-            "recruiter_lens",
-            "interview_simulation",
-            "weekly_review",
-            "smart_reapply",
-        ],
-    }
-    
-    # Check if feature is available in user's plan tier
-    available_features = feature_tiers.get(plan, feature_tiers["free"])
-    return feature in available_features
+    return feature in _FEATURE_TIERS.get(get_user_plan(user), _FREE_FEATURES)
 
 
 def get_today_ai_usage(db: Session, user_id: int) -> int:
     """Get today's AI usage count for a user."""
     today = date.today()
-    usage = db.query(AIUsage).filter(
+    # Only the count column, looked up through uq_user_date
+    count = db.query(AIUsage.ai_calls_count).filter(
         AIUsage.user_id == user_id,
         AIUsage.date == today
-    ).first()
+    ).scalar()
     
-    return usage.ai_calls_count if usage else 0
+    return count or 0
 
 
 def increment_ai_usage(db: Session, user_id: int) -> None:
     """
     Increment today's AI usage count for a user.
     Creates record if it doesn't exist for today.
+    
+    One INSERT ... ON CONFLICT (user_id, date) DO UPDATE ... RETURNING
+    statement, so concurrent first calls of the day can't race on the insert.
     """
     today = date.today()
-    usage = db.query(AIUsage).filter(
-        AIUsage.user_id == user_id,
-        AIUsage.date == today
-    ).first()
-    
-    if usage:
-        usage.ai_calls_count += 1
-    else:
-        usage = AIUsage(
-            user_id=user_id,
-            date=today,
-            ai_calls_count=1
+    stmt = (
+        upsert_insert(db, AIUsage)
+        .values(user_id=user_id, date=today, ai_calls_count=1)
+        .on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={"ai_calls_count": AIUsage.ai_calls_count + 1}
         )
-        db.add(usage)
-    
+        .returning(AIUsage.ai_calls_count)
+    )
+    count = db.execute(stmt).scalar_one()
     db.commit()
-    logger.info(f"Incremented AI usage for user_id={user_id}, count={usage.ai_calls_count}")
+    logger.info("Incremented AI usage for user_id=%s, count=%s", user_id, count)
 
 
 def enforce_ai_limit(db: Session, user: User) -> None:
@@ -145,30 +157,92 @@ def enforce_ai_limit(db: Session, user: User) -> None:
     plan = get_user_plan(user)
     
     # Pro and Elite users have unlimited access
-    if plan in ["pro", "elite"]:
+    if plan in _UNLIMITED_AI_PLANS:
         return
     
     # Free users: check daily limit
     today_count = get_today_ai_usage(db, user.id)
     
     if today_count >= MAX_FREE_AI_CALLS_PER_DAY:
-        logger.warning(f"AI limit reached for free user_id={user.id}, count={today_count}")
+        logger.warning("AI limit reached for free user_id=%s, count=%s", user.id, today_count)
         raise HTTPException(
             status_code=status.HTTP_402_PAYMENT_REQUIRED,
-            detail={
-                "detail": "Daily limit reached. Upgrade to Pro or Elite for unlimited AI actions.",
-                "code": "PAYWALL",
-                "feature": "ai_actions",
-                "upgrade_url": f"{FRONTEND_URL}/pricing",
-                "limit": MAX_FREE_AI_CALLS_PER_DAY,
-                "used": today_count,
-            }
+            detail={**_AI_LIMIT_PAYWALL, "used": today_count}
         )
     
     # Limit not reached, allow the request
     return
 
 
+def enforce_and_increment_ai_usage(db: Session, user: User) -> int:
+    """
+    Check the daily AI limit and record one call in a single statement.
+    
+    Pro/Elite users are counted unconditionally. For free users the upsert
+    only bumps the counter while it is below MAX_FREE_AI_CALLS_PER_DAY, so
+    concurrent requests can't overshoot the limit; if no row comes back the
+    limit was already reached and a 402 is raised.
+    
+    The call is recorded up front: callers should run their own request
+    validation first, and call refund_ai_usage if the AI work then fails.
+    
+    Returns the user's AI call count for today, including this call.
+    """
+    plan = get_user_plan(user)
+    stmt = (
+        upsert_insert(db, AIUsage)
+        .values(user_id=user.id, date=date.today(), ai_calls_count=1)
+    )
+    if plan in _UNLIMITED_AI_PLANS:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={"ai_calls_count": AIUsage.ai_calls_count + 1}
+        )
+    else:
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "date"],
+            set_={"ai_calls_count": AIUsage.ai_calls_count + 1},
+            where=AIUsage.ai_calls_count < MAX_FREE_AI_CALLS_PER_DAY
+        )
+    
+    count = db.execute(stmt.returning(AIUsage.ai_calls_count)).scalar_one_or_none()
+    db.commit()
+    
+    if count is None:
+        logger.warning("AI limit reached for free user_id=%s, count=%s", user.id, MAX_FREE_AI_CALLS_PER_DAY)
+        raise HTTPException(
+            status_code=status.HTTP_402_PAYMENT_REQUIRED,
+            detail={**_AI_LIMIT_PAYWALL, "used": MAX_FREE_AI_CALLS_PER_DAY}
+        )
+    
+    return count
+
+
+def refund_ai_usage(db: Session, user_id: int) -> None:
+    """
+    Give back a call recorded by enforce_and_increment_ai_usage whose work failed.
+    
+    Rolls back the session's failed transaction first, then decrements today's
+    count (never below zero). A failed refund is logged, not raised, so the
+    caller's original error is what the client sees.
+    """
+    try:
+        db.rollback()
+        db.execute(
+            update(AIUsage)
+            .where(
+                AIUsage.user_id == user_id,
+                AIUsage.date == date.today(),
+                AIUsage.ai_calls_count > 0
+            )
+            .values(ai_calls_count=AIUsage.ai_calls_count - 1)
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to refund AI usage for user_id=%s: %s", user_id, e)
+
+
 def enforce_feature_access(user: User, feature: str) -> None:
     """
     Enforce feature access based on user plan.
@@ -179,17 +253,17 @@ def enforce_feature_access(user: User, feature: str) -> None:
         return
     
     plan = get_user_plan(user)
-    required_plan = "pro" if feature not in ["interview_simulation", "weekly_review", "smart_reapply"] else "elite"
+    required_plan = "elite" if feature in _ELITE_ONLY_FEATURES else "pro"
     
-    logger.warning(f"Feature access denied: user_id={user.id}, plan={plan}, feature={feature}")
+    logger.warning("Feature access denied: user_id=%s, plan=%s, feature=%s", user.id, plan, feature)
     
     raise HTTPException(
         status_code=status.HTTP_402_PAYMENT_REQUIRED,
         detail={
-            "detail": f"This feature requires {required_plan.title()} plan. Upgrade to unlock.",
+            "detail": _FEATURE_PAYWALL_MESSAGES[required_plan],
             "code": "PAYWALL",
             "feature": feature,
-            "upgrade_url": f"{FRONTEND_URL}/pricing",
+            "upgrade_url": _UPGRADE_URL,
             "required_plan": required_plan,
         }
     )
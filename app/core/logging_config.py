@@ -3,10 +3,17 @@ Logging configuration for Hireblaze API.
 
 Provides structured logging without exposing secrets.
 """
+import atexit
 import logging
+import queue
+import re
 import sys
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from typing import Optional
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# Writes records to the real handlers on a background thread (see setup_logging)
+_log_listener: Optional[QueueListener] = None
 
 
 def setup_logging(log_level: str = "INFO"):
@@ -51,9 +58,15 @@ def setup_logging(log_level: str = "INFO"):
     )
     file_handler.setFormatter(file_formatter)
     
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    # Request threads only enqueue records; the listener thread does the
+    # console/file writes (and rotation) so no request waits on I/O
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    logger.addHandler(QueueHandler(log_queue))
+    _log_listener = QueueListener(log_queue, console_handler, file_handler, respect_handler_level=True)
+    _log_listener.start()
     
     # Set levels for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
@@ -61,6 +74,25 @@ def setup_logging(log_level: str = "INFO"):
     logging.getLogger("stripe").setLevel(logging.WARNING)
 
 
+def _stop_log_listener() -> None:
+    """Flush queued records at interpreter exit."""
+    if _log_listener is not None:
+        _log_listener.stop()
+
+
+atexit.register(_stop_log_listener)
+
+
+# Key substrings whose values must never reach the logs
+SENSITIVE_LOG_KEYS = (
+    "password", "token", "secret", "key", "api_key",
+    "stripe_secret_key", "stripe_webhook_secret",
+    "openai_api_key", "database_url"
+)
+# One case-insensitive alternation: a single C-level search per key
+_SENSITIVE_KEY_RE = re.compile("|".join(map(re.escape, SENSITIVE_LOG_KEYS)), re.IGNORECASE)
+
+
 def sanitize_log_data(data: dict) -> dict:
     """
     Sanitize log data to remove sensitive information.
@@ -71,15 +103,7 @@ def sanitize_log_data(data: dict) -> dict:
     Returns:
         Sanitized dictionary without secrets
     """
-    sanitized = data.copy()
-    sensitive_keys = [
-        "password", "token", "secret", "key", "api_key",
-        "stripe_secret_key", "stripe_webhook_secret",
-        "openai_api_key", "database_url"
-    ]
-    
-    for key in sanitized:
-        if any(sensitive in key.lower() for sensitive in sensitive_keys):
-            sanitized[key] = "***REDACTED***"
-    
-    return sanitized
+    return {
+        key: "***REDACTED***" if _SENSITIVE_KEY_RE.search(str(key)) else value
+        for key, value in data.items()
+    }
@@ -0,0 +1,75 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor encodes the (created_at, id) of the last row on a page. The next page
+is fetched with WHERE (created_at, id) < (cursor) ORDER BY created_at DESC, id DESC,
+which walks the (user_id, created_at DESC, id DESC) index instead of scanning
+and discarding OFFSET rows.
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# COUNT(*) OVER (): the filtered total, carried on every row of a page
+WINDOW_TOTAL = func.count().over().label("total")
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    raw = f"{created_at.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor from encode_cursor; raises 400 if it is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+async def count_rows(db: AsyncSession, stmt: Select, params: Optional[Dict[str, Any]] = None) -> int:
+    """Count the rows stmt would return (fallback when no window total is available)."""
+    return await db.scalar(select(func.count()).select_from(stmt.subquery()), params)
+
+
+def json_page_chunks(field: str, items: Iterable[bytes], meta: Dict[str, Any]) -> Iterator[bytes]:
+    """Yield {field: [items...], **meta} as JSON, one pre-serialized item per chunk."""
+    yield b'{"' + field.encode("utf-8") + b'":['
+    for index, item in enumerate(items):
+        yield item if index == 0 else b"," + item
+    # orjson.dumps(meta) is '{...}': drop its opening brace to continue our object
+    yield b"]," + orjson.dumps(meta)[1:]
+
+
+async def iter_json_page(field: str, items: Iterable[bytes], meta: Dict[str, Any]) -> AsyncIterator[bytes]:
+    """Async form of json_page_chunks for StreamingResponse."""
+    for chunk in json_page_chunks(field, items, meta):
+        yield chunk
+
+
+def json_page_bytes(field: str, items: Iterable[bytes], meta: Dict[str, Any]) -> bytes:
+    """The whole page body at once (for responses that are cached)."""
+    return b"".join(json_page_chunks(field, items, meta))
+
+
+def stream_json_page(field: str, items: Iterable[bytes], meta: Dict[str, Any]) -> StreamingResponse:
+    """
+    Stream a list page as chunked JSON.
+    
+    items is consumed lazily, so rows are serialized as they are sent and the
+    full body is never held in memory at once.
+    """
+    return StreamingResponse(iter_json_page(field, items, meta), media_type="application/json")
@@ -0,0 +1,48 @@
+"""
+In-process cache of successful bcrypt verifications.
+
+Maps a stored bcrypt hash to a keyed BLAKE2b tag of the password that matched
+it. The key (pepper) is random per process, so tags are useless outside this
+process and nothing survives a restart. A repeat check of the same password
+against the same hash is one keyed hash plus a constant-time compare instead
+of a full bcrypt run; a wrong password or a changed hash always falls through
+to bcrypt. Entries expire after PASSWORD_CACHE_TTL_SECONDS.
+"""
+import hashlib
+import hmac
+import secrets
+
+from app.core.ttl_cache import TTLCache
+
+PASSWORD_CACHE_TTL_SECONDS = 900
+PASSWORD_CACHE_MAXSIZE = 4096
+
+_PEPPER = secrets.token_bytes(32)
+
+# {stored hash: password tag}
+_verified = TTLCache(ttl=PASSWORD_CACHE_TTL_SECONDS, maxsize=PASSWORD_CACHE_MAXSIZE)
+
+
+def _password_tag(password: str) -> bytes:
+    return hashlib.blake2b(password.encode("utf-8"), key=_PEPPER, digest_size=32).digest()
+
+
+def is_verified(password: str, hashed: str) -> bool:
+    """True if password was recently verified against hashed by bcrypt."""
+    tag = _verified.get(hashed)
+    return tag is not None and hmac.compare_digest(tag, _password_tag(password))
+
+
+def remember_verified(password: str, hashed: str) -> None:
+    """Record a successful bcrypt verification."""
+    _verified.set(hashed, _password_tag(password))
+
+
+def forget_verified(hashed: str) -> None:
+    """Drop the entry for a hash (call when a password is changed or reset)."""
+    _verified.pop(hashed)
+
+
+def clear_password_cache() -> None:
+    """Drop all cached verifications."""
+    _verified.clear()
@@ -1,19 +1,41 @@
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import SessionLocal
 from app.db.models.subscription import Subscription
-from app.core.auth_dependency import get_current_user
+from app.core.auth_dependency import get_current_user_id
 from app.db.models.user import User
+from app.db.session_async import get_async_db
 
 def require_plan(required_plan: str):
-    def checker(user: User = Depends(get_current_user)):
-        db = SessionLocal()
-        sub = db.query(Subscription).filter(Subscription.user_id == user.id).first()
-        db.close()
+    async def checker(
+        user_id: int = Depends(get_current_user_id),
+        db: AsyncSession = Depends(get_async_db)
+    ):
+        # User row and plan column in one query
+        plan_subq = (
+            select(Subscription.plan_type)
+            .where(Subscription.user_id == User.id)
+            .limit(1)
+            .scalar_subquery()
+        )
+        row = (await db.execute(select(User, plan_subq).where(User.id == user_id))).first()
+        if row is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        user, plan_type = row
 
-        if not sub or sub.plan_type != required_plan:
-            return {"error": f"{required_plan.upper()} plan required"}
+        if plan_type != required_plan:
+            raise HTTPException(
+                status_code=status.HTTP_402_PAYMENT_REQUIRED,
+                detail={
+                    "detail": f"{required_plan.upper()} plan required",
+                    "code": "PAYWALL",
+                    "required_plan": required_plan,
+                }
+            )
         return user
 
     return checker
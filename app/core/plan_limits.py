@@ -4,7 +4,8 @@ Plan-based usage limits configuration.
 Single source of truth for monthly quota limits per plan.
 None means unlimited quota for that feature.
 """
-from typing import Dict, Optional, List
+from types import MappingProxyType
+from typing import List, Mapping, Optional
 
 # Supported features
 SUPPORTED_FEATURES: List[str] = [
@@ -14,8 +15,8 @@ SUPPORTED_FEATURES: List[str] = [
     "jd_parse",
 ]
 
-# Plan limits (per month)
-PLAN_LIMITS: Dict[str, Dict[str, Optional[int]]] = {
+# Plan limits (per month); frozen into PLAN_LIMITS below
+_PLAN_LIMITS_SPEC = {
     "free": {
         "ats_scan": 2,
         "resume_tailor": 3,
@@ -42,6 +43,22 @@ PLAN_LIMITS: Dict[str, Dict[str, Optional[int]]] = {
     },
 }
 
+# Read-only views: callers can share them without defensive copies
+PLAN_LIMITS: Mapping[str, Mapping[str, Optional[int]]] = MappingProxyType({
+    plan: MappingProxyType(limits) for plan, limits in _PLAN_LIMITS_SPEC.items()
+})
+_FREE_LIMITS = PLAN_LIMITS["free"]
+
+
+def _limits_for(plan_type: Optional[str]) -> Mapping[str, Optional[int]]:
+    """Limits for plan_type; exact (lowercase) names skip the .lower() call."""
+    if not plan_type:
+        return _FREE_LIMITS
+    limits = PLAN_LIMITS.get(plan_type)
+    if limits is None:
+        limits = PLAN_LIMITS.get(plan_type.lower(), _FREE_LIMITS)
+    return limits
+
 
 def get_plan_limit(plan_type: str, feature: str) -> Optional[int]:
     """
@@ -54,9 +71,7 @@ def get_plan_limit(plan_type: str, feature: str) -> Optional[int]:
     Returns:
         Monthly limit (int) or None for unlimited
     """
-    plan_type = plan_type.lower() if plan_type else "free"
-    limits = PLAN_LIMITS.get(plan_type, PLAN_LIMITS["free"])
-    return limits.get(feature)
+    return _limits_for(plan_type).get(feature)
 
 
 def has_unlimited_quota(plan_type: str, feature: str) -> bool:
@@ -65,7 +80,6 @@ def has_unlimited_quota(plan_type: str, feature: str) -> bool:
     return limit is None
 
 
-def get_all_plan_limits(plan_type: str) -> Dict[str, Optional[int]]:
-    """Get all limits for a plan type."""
-    plan_type = plan_type.lower() if plan_type else "free"
-    return PLAN_LIMITS.get(plan_type, PLAN_LIMITS["free"])
+def get_all_plan_limits(plan_type: str) -> Mapping[str, Optional[int]]:
+    """Get all limits for a plan type (a shared read-only view)."""
+    return _limits_for(plan_type)
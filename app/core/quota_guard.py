@@ -9,26 +9,18 @@ This module provides require_quota() dependency that:
 """
 import logging
 from fastapi import Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.db.session import SessionLocal
 from app.db.models.user import User
 from app.core.auth_dependency import get_current_user
-from app.services.quota_service import get_plan_for_user, check_and_consume
-from app.db.models.usage import UsageEvent
+from app.core.response_cache import invalidate_cached_responses
+from app.db.session_async import get_async_db
+from app.services.quota_service import check_and_consume_by_email
 
 logger = logging.getLogger(__name__)
 
 
-def get_db():
-    """Database session dependency following existing route patterns."""
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 def get_user_from_email(email: str, db: Session) -> User:
     """Fetch User object from email."""
     user = db.query(User).filter(User.email == email).first()
@@ -56,50 +48,49 @@ def require_quota(feature: str, amount: int = 1):
         HTTPException 401: Unauthorized
         HTTPException 404: User not found
     """
-    def quota_checker(
+    async def quota_checker(
         email: str = Depends(get_current_user),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
     ) -> User:
-        # Get user object
-        user = get_user_from_email(email, db)
+        # User, plan and this month's usage in one query, then record usage if allowed.
+        # run_sync drives the sync service code on the event loop (no threadpool hop)
+        result = await db.run_sync(check_and_consume_by_email, email, feature, amount)
+        if result is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        user, plan_type, used, limit, remaining, exceeded = result
         
-        # Get user's plan for error message
-        plan_type = get_plan_for_user(db, user.id)
+        # Check if quota exceeded (check_and_consume detected it and didn't record usage)
+        if exceeded:
+            logger.warning(
+                "Quota exceeded: user_id=%s, feature=%s, plan=%s, limit=%s, used=%s",
+                user.id, feature, plan_type, limit, used
+            )
+            
+            # Raise HTTPException with structured error as specified
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail={
+                    "error": "quota_exceeded",
+                    "feature": feature,
+                    "plan": plan_type,
+                    "limit": limit,
+                    "used": used,
+                    "remaining": 0
+                }
+            )
         
-        # Check quota and consume atomically
-        used, limit, remaining = check_and_consume(db, user.id, feature, amount)
+        # Success - usage already recorded by check_and_consume; the new
+        # UsageEvent must show up on cached /history pages
+        await invalidate_cached_responses("history", user.id)
         
-        # Check if quota exceeded
-        # If limit is not None and remaining is 0, verify if usage actually increased
-        # (if it didn't increase, check_and_consume detected exceed and didn't record)
-        if limit is not None and remaining == 0:
-            # Verify: if used + amount would exceed limit, quota was exceeded
-            # This means check_and_consume detected the exceed and didn't record usage
-            if used + amount > limit:
-                # Quota exceeded
-                logger.warning(
-                    f"Quota exceeded: user_id={user.id}, feature={feature}, "
-                    f"plan={plan_type}, limit={limit}, used={used}"
-                )
-                
-                # Raise HTTPException with structured error as specified
-                raise HTTPException(
-                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    detail={
-                        "error": "quota_exceeded",
-                        "feature": feature,
-                        "plan": plan_type,
-                        "limit": limit,
-                        "used": used,
-                        "remaining": 0
-                    }
-                )
-        
-        # Success - usage already recorded by check_and_consume
-        logger.debug(
-            f"Quota check passed: user_id={user.id}, feature={feature}, "
-            f"amount={amount}, plan={plan_type}, remaining={remaining if limit else 'unlimited'}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Quota check passed: user_id=%s, feature=%s, amount=%s, plan=%s, remaining=%s",
+                user.id, feature, amount, plan_type, remaining if limit else "unlimited"
+            )
         
         return user
     
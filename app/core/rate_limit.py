@@ -1,16 +1,27 @@
 """
-Simple in-memory rate limiter for API endpoints.
+Rate limiter for API endpoints.
+
+With Redis, limits are fixed-window counters (INCR + EXPIRE) shared by every
+worker process. Without Redis (local dev), each process keeps its own
+in-memory timestamps.
 """
 import logging
 import time
-from collections import defaultdict
-from typing import Dict, Tuple
+from collections import deque
+from typing import Deque, Dict, Optional
 from fastapi import Request, HTTPException, status
 
+from app.core.redis_client import get_async_redis
+
 logger = logging.getLogger(__name__)
 
-# Store for rate limit tracking: {ip: [(timestamp, count)]}
-rate_limit_store: Dict[str, list] = defaultdict(list)
+# Fallback entries idle this long are dropped (must exceed the longest window in use)
+RATE_LIMIT_IDLE_SECONDS = 3600
+RATE_LIMIT_SWEEP_SECONDS = 60
+
+# In-memory fallback store: {ip: the last max_requests allowed timestamps, oldest first}
+rate_limit_store: Dict[str, Deque[float]] = {}
+_last_sweep = 0.0
 
 
 def get_client_ip(request: Request) -> str:
@@ -18,8 +29,9 @@ def get_client_ip(request: Request) -> str:
     # Check for forwarded IP (from proxy/load balancer)
     forwarded = request.headers.get("X-Forwarded-For")
     if forwarded:
-        # Take the first IP in the chain
-        return forwarded.split(",")[0].strip()
+        # Take the first IP in the chain (slice instead of building a split list)
+        comma = forwarded.find(",")
+        return (forwarded if comma < 0 else forwarded[:comma]).strip()
     
     # Fallback to direct client IP
     if request.client:
@@ -28,7 +40,56 @@ def get_client_ip(request: Request) -> str:
     return "unknown"
 
 
-def check_rate_limit(request: Request, max_requests: int = 10, window_seconds: int = 60) -> None:
+async def _redis_window_count(ip: str, window_seconds: int, now: float) -> Optional[int]:
+    """Count this request in the shared fixed window; None if Redis is unavailable."""
+    redis = get_async_redis()
+    if redis is None:
+        return None
+    key = f"rl:{window_seconds}:{ip}:{int(now // window_seconds)}"
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, window_seconds)
+            count, _ = await pipe.execute()
+    except Exception as e:
+        logger.warning("Redis rate limit check failed, using in-memory limiter: %s", e)
+        return None
+    return count
+
+
+def _sweep_idle_ips(now: float) -> None:
+    """Drop fallback entries for IPs not seen in RATE_LIMIT_IDLE_SECONDS (at most once per sweep interval)."""
+    global _last_sweep
+    if now - _last_sweep < RATE_LIMIT_SWEEP_SECONDS:
+        return
+    _last_sweep = now
+    cutoff = now - RATE_LIMIT_IDLE_SECONDS
+    idle = [ip for ip, timestamps in rate_limit_store.items() if timestamps[-1] < cutoff]
+    for ip in idle:
+        del rate_limit_store[ip]
+
+
+def _memory_allow(ip: str, window_seconds: int, now: float, max_requests: int) -> bool:
+    """
+    Record this request in the per-process sliding window if it is allowed.
+    
+    The deque holds at most max_requests timestamps, so the limit is hit
+    exactly when it is full and its oldest entry is still inside the window:
+    one comparison instead of rescanning every timestamp.
+    """
+    _sweep_idle_ips(now)
+    
+    timestamps = rate_limit_store.get(ip)
+    if timestamps is None or timestamps.maxlen != max_requests:
+        timestamps = rate_limit_store[ip] = deque(timestamps or (), maxlen=max_requests)
+    
+    if len(timestamps) == max_requests and now - timestamps[0] < window_seconds:
+        return False
+    timestamps.append(now)
+    return True
+
+
+async def check_rate_limit(request: Request, max_requests: int = 10, window_seconds: int = 60) -> None:
     """
     Check if client has exceeded rate limit.
     
@@ -43,24 +104,17 @@ def check_rate_limit(request: Request, max_requests: int = 10, window_seconds: i
     ip = get_client_ip(request)
     now = time.time()
     
-    # Clean old entries (older than window)
-    cutoff = now - window_seconds
-    rate_limit_store[ip] = [
-        timestamp for timestamp in rate_limit_store[ip]
-        if timestamp > cutoff
-    ]
+    request_count = await _redis_window_count(ip, window_seconds, now)
+    if request_count is None:
+        allowed = _memory_allow(ip, window_seconds, now, max_requests)
+    else:
+        allowed = request_count <= max_requests
     
-    # Check current count
-    request_count = len(rate_limit_store[ip])
-    
-    if request_count >= max_requests:
-        logger.warning(f"Rate limit exceeded for IP: {ip} ({request_count} requests in {window_seconds}s)")
+    if not allowed:
+        logger.warning("Rate limit exceeded for IP: %s (max %s requests in %ss)", ip, max_requests, window_seconds)
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Rate limit exceeded. Maximum {max_requests} requests per {window_seconds} seconds."
         )
     
-    # Record this request
-    rate_limit_store[ip].append(now)
-    
-    logger.debug(f"Rate limit check passed for IP: {ip} ({request_count + 1}/{max_requests})")
+    logger.debug("Rate limit check passed for IP: %s", ip)
@@ -0,0 +1,35 @@
+"""
+Optional Redis client.
+
+Redis backs cross-worker queues and caches. It is optional: when REDIS_URL is
+not set (or the redis package is missing) get_async_redis() returns None and
+callers fall back to in-process behavior.
+"""
+import logging
+from typing import Optional
+
+from app.core.config import REDIS_URL
+
+logger = logging.getLogger(__name__)
+
+# Try to import redis (optional)
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = bool(REDIS_URL)
+except ImportError:
+    aioredis = None
+    REDIS_AVAILABLE = False
+    if REDIS_URL:
+        logger.warning("REDIS_URL is set but the redis package is not installed - Redis features disabled")
+
+_async_client = None
+
+
+def get_async_redis() -> Optional["aioredis.Redis"]:
+    """Return the shared asyncio Redis client, or None if Redis is not configured."""
+    global _async_client
+    if not REDIS_AVAILABLE:
+        return None
+    if _async_client is None:
+        _async_client = aioredis.from_url(REDIS_URL)
+    return _async_client
@@ -0,0 +1,83 @@
+"""
+Short-lived Redis cache for user-scoped list responses.
+
+Cached bodies are keyed by (scope, user, version, query string). Every write
+to a cached scope must call invalidate_cached_responses, which bumps the
+per-user version, so stale pages are never served and old entries are left
+to expire instead of being scanned for and deleted. Scopes: "jobs" (job
+routes) and "history" (usage events, recorded by require_quota). Responses carry
+an ETag, and a matching If-None-Match is answered with 304.
+
+Everything here is a no-op without Redis.
+"""
+import hashlib
+import logging
+from typing import Optional
+
+from fastapi import Request, Response
+
+from app.core.redis_client import get_async_redis
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_TTL_SECONDS = 5
+# Versions outlive any cached body they key
+RESPONSE_CACHE_VERSION_TTL_SECONDS = 86_400
+
+
+def _version_key(scope: str, user_id: int) -> str:
+    return f"{scope}:ver:{user_id}"
+
+
+async def response_cache_key(scope: str, user_id: int, request: Request) -> Optional[str]:
+    """Cache key for this request's page, or None if Redis is unavailable."""
+    redis = get_async_redis()
+    if redis is None:
+        return None
+    try:
+        version = await redis.get(_version_key(scope, user_id))
+    except Exception as e:
+        logger.warning(f"Response cache version read failed: {e}")
+        return None
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    digest = hashlib.blake2b(query.encode("utf-8"), digest_size=16).hexdigest()
+    return f"{scope}:{user_id}:{int(version or 0)}:{digest}"
+
+
+async def get_cached_response(key: str) -> Optional[bytes]:
+    """Cached body for key, or None on a miss."""
+    try:
+        return await get_async_redis().get(key)
+    except Exception as e:
+        logger.warning(f"Response cache read failed: {e}")
+        return None
+
+
+async def cache_response(key: str, body: bytes) -> None:
+    """Store body under key for RESPONSE_CACHE_TTL_SECONDS."""
+    try:
+        await get_async_redis().set(key, body, ex=RESPONSE_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"Response cache write failed: {e}")
+
+
+async def invalidate_cached_responses(scope: str, user_id: int) -> None:
+    """Bump the user's version for scope so cached pages stop matching."""
+    redis = get_async_redis()
+    if redis is None:
+        return
+    try:
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.incr(_version_key(scope, user_id))
+            pipe.expire(_version_key(scope, user_id), RESPONSE_CACHE_VERSION_TTL_SECONDS)
+            await pipe.execute()
+    except Exception as e:
+        logger.warning(f"Response cache invalidation failed: {e}")
+
+
+def etag_response(body: bytes, request: Request) -> Response:
+    """JSON response for body with an ETag; 304 if the client already has it."""
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
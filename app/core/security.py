@@ -1,11 +1,24 @@
+import asyncio
 import bcrypt
-from datetime import datetime, timedelta
-from jose import jwt
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List
+import jwt
 from app.core.config import SECRET_KEY, ALGORITHM
+from app.core.password_cache import is_verified, remember_verified
 import logging
 
 logger = logging.getLogger(__name__)
 
+# bcrypt releases the GIL, so one thread per core runs hashes in parallel
+# without oversubscribing the CPU
+_bcrypt_pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt")
+
+# Signing key encoded once instead of on every jwt.encode call
+_JWT_KEY = SECRET_KEY.encode("utf-8")
+
 # Use bcrypt directly instead of passlib to avoid version conflicts
 def hash_password(password: str) -> str:
     """
@@ -45,16 +58,38 @@ def verify_password(password: str, hashed: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
+    # Recently verified pair: skip the bcrypt KDF (see password_cache)
+    if is_verified(password, hashed):
+        return True
     try:
         password_bytes = password.encode("utf-8")
         hashed_bytes = hashed.encode("utf-8")
-        return bcrypt.checkpw(password_bytes, hashed_bytes)
+        matched = bcrypt.checkpw(password_bytes, hashed_bytes)
+        if matched:
+            remember_verified(password, hashed)
+        return matched
     except Exception as e:
         logger.error(f"Error verifying password: {e}")
         return False
 
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """hash_password for many passwords at once, in parallel on the bcrypt thread pool."""
+    return list(_bcrypt_pool.map(hash_password, passwords))
+
+
+async def ahash_password(password: str) -> str:
+    """hash_password on the bcrypt thread pool, keeping the event loop free."""
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, hash_password, password)
+
+
+async def averify_password(password: str, hashed: str) -> bool:
+    """verify_password on the bcrypt thread pool, keeping the event loop free."""
+    return await asyncio.get_running_loop().run_in_executor(_bcrypt_pool, verify_password, password, hashed)
+
+
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
-    expire = datetime.utcnow() + (expires_delta or timedelta(minutes=60))
-    to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    # exp as integer epoch seconds: no datetime objects to build and convert back
+    lifetime = expires_delta.total_seconds() if expires_delta else 3600
+    to_encode["exp"] = int(time.time() + lifetime)
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=ALGORITHM)
@@ -0,0 +1,48 @@
+"""
+In-process TTL cache for decoded JWT payloads.
+
+Keyed by a BLAKE2b digest of the raw token so the cache never holds bearer
+tokens themselves. An entry lives for TOKEN_CACHE_TTL_SECONDS at most and
+never past the token's own "exp" claim, so a cached token cannot outlive
+its signature check.
+"""
+import hashlib
+import time
+from typing import Any, Dict, Optional
+
+from app.core.ttl_cache import TTLCache
+
+TOKEN_CACHE_TTL_SECONDS = 30
+TOKEN_CACHE_MAXSIZE = 10_000
+
+_token_cache = TTLCache(ttl=TOKEN_CACHE_TTL_SECONDS, maxsize=TOKEN_CACHE_MAXSIZE)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode("utf-8"), digest_size=16).digest()
+
+
+def get_cached_payload(token: str) -> Optional[Dict[str, Any]]:
+    """Return the cached payload for token, or None if missing/expired."""
+    return _token_cache.get(_token_key(token))
+
+
+def cache_payload(token: str, payload: Dict[str, Any]) -> None:
+    """Store a verified payload until min(TTL, the token's exp)."""
+    ttl = TOKEN_CACHE_TTL_SECONDS
+    exp = payload.get("exp")
+    if exp is not None:
+        ttl = min(ttl, float(exp) - time.time())
+    if ttl <= 0:
+        return
+    _token_cache.set(_token_key(token), payload, ttl=ttl)
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a cached entry (call when a token is revoked)."""
+    _token_cache.pop(_token_key(token))
+
+
+def clear_token_cache() -> None:
+    """Drop all cached entries."""
+    _token_cache.clear()
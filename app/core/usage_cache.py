@@ -0,0 +1,35 @@
+"""
+In-process TTL cache for /usage summaries.
+
+Dashboards poll the usage endpoint every few seconds; counters only move when
+check_and_consume records usage, which drops the entry for that user. Other
+worker processes may serve a summary up to USAGE_CACHE_TTL_SECONDS old.
+"""
+from typing import Any, Dict, Optional
+
+from app.core.ttl_cache import TTLCache
+
+USAGE_CACHE_TTL_SECONDS = 5
+USAGE_CACHE_MAXSIZE = 50_000
+
+_usage_cache = TTLCache(ttl=USAGE_CACHE_TTL_SECONDS, maxsize=USAGE_CACHE_MAXSIZE)
+
+
+def get_cached_usage(user_id: int) -> Optional[Dict[str, Any]]:
+    """Return the cached usage summary for user_id, or None if missing/expired."""
+    return _usage_cache.get(user_id)
+
+
+def cache_usage(user_id: int, usage: Dict[str, Any]) -> None:
+    """Store a usage summary."""
+    _usage_cache.set(user_id, usage)
+
+
+def invalidate_usage(user_id: int) -> None:
+    """Drop a cached entry (call after recording usage)."""
+    _usage_cache.pop(user_id)
+
+
+def clear_usage_cache() -> None:
+    """Drop all cached entries."""
+    _usage_cache.clear()
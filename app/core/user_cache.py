@@ -0,0 +1,35 @@
+"""
+In-process TTL cache for email -> user_id lookups.
+
+Only the integer ID is cached (never ORM objects or plan data): a user's ID
+never changes for a given email, while plan changes arrive via Stripe
+webhooks that may land on a different worker process.
+"""
+from typing import Optional
+
+from app.core.ttl_cache import TTLCache
+
+USER_ID_CACHE_TTL_SECONDS = 300
+USER_ID_CACHE_MAXSIZE = 10_000
+
+_user_id_cache = TTLCache(ttl=USER_ID_CACHE_TTL_SECONDS, maxsize=USER_ID_CACHE_MAXSIZE)
+
+
+def get_cached_user_id(email: str) -> Optional[int]:
+    """Return the cached user ID for email, or None if missing/expired."""
+    return _user_id_cache.get(email)
+
+
+def cache_user_id(email: str, user_id: int) -> None:
+    """Store email -> user_id."""
+    _user_id_cache.set(email, user_id)
+
+
+def invalidate_user_id(email: str) -> None:
+    """Drop a cached entry (call on user deletion or email change)."""
+    _user_id_cache.pop(email)
+
+
+def clear_user_id_cache() -> None:
+    """Drop all cached entries."""
+    _user_id_cache.clear()
@@ -4,42 +4,38 @@ Database initialization module.
 Creates all database tables on startup.
 This runs once when the FastAPI application starts (not per request).
 
-IMPORTANT: All models MUST be imported here before create_all() is called,
-otherwise their tables will not be created.
+IMPORTANT: All models MUST be imported (via app.db.models) before create_all()
+is called, otherwise their tables will not be created.
 """
 import logging
+from sqlalchemy import inspect
 from sqlalchemy.exc import ProgrammingError
-from psycopg2.errors import DuplicateTable, DuplicateObject
 from app.db.session import engine
 from app.db.base import Base
 
 # Import ALL models to ensure they register with Base.metadata
-# This MUST happen before create_all() is called
-from app.db.models.user import User
-from app.db.models.subscription import Subscription
-from app.db.models.usage import UsageEvent
-from app.db.models.resume import Resume
-from app.db.models.job import Job, JobDescription
-from app.db.models.job_posting import JobPosting
-from app.db.models.match_analysis import MatchAnalysis
-from app.db.models.interview_pack import InterviewPack
-from app.db.models.outreach_message import OutreachMessage
-from app.db.models.document import Document
-from app.db.models.application import Application
-from app.db.models.ats_score import ATSScore
-from app.db.models.candidate_benchmark import CandidateBenchmark
-from app.db.models.interview_evaluation import InterviewEvaluation
-from app.db.models.interview_session import InterviewSession
+# This MUST happen before create_all() is called; app.db.models is the single
+# list of model modules (also used by alembic/env.py)
+import app.db.models  # noqa: F401
 
 logger = logging.getLogger(__name__)
 
+# Set once the schema is known to exist; later calls in this process are no-ops
+_initialized = False
+
+
+def _schema_is_current() -> bool:
+    """True if every mapped table already exists (one catalog query for all tables)."""
+    existing = set(inspect(engine).get_table_names())
+    return all(table.name in existing for table in Base.metadata.sorted_tables)
+
 
 def init_db():
     """
     Initialize database tables on startup (LOCAL/DEV ONLY).
     
     This function:
-    1. Imports all models (they register with Base.metadata)
+    1. Relies on app.db.models having imported every model (they register with Base.metadata)
     2. Calls Base.metadata.create_all() to create tables if they don't exist
     
     IMPORTANT: This should ONLY be used for local development with SQLite.
@@ -49,11 +45,22 @@ def init_db():
     Handles duplicate index/table errors gracefully for cases where database
     already has some schema objects.
     """
+    global _initialized
+    if _initialized:
+        return
+    
     try:
+        if _schema_is_current():
+            # Skip create_all's per-table existence probes
+            logger.info("Database schema already present, skipping create_all")
+            _initialized = True
+            return
+        
         # All models are imported above, so Base.metadata contains all table definitions
         # create_all() creates tables that don't exist (idempotent)
         # In PostgreSQL, if indexes already exist, we catch and ignore those errors
         Base.metadata.create_all(bind=engine, checkfirst=True)
+        _initialized = True
         
     except ProgrammingError as e:
         # Handle PostgreSQL duplicate object errors (indexes, tables, etc.)
@@ -3,13 +3,36 @@ Database migration runner for Alembic migrations.
 """
 import logging
 import os
+import time
 from alembic.config import Config
 from alembic import command
-from sqlalchemy import create_engine, text
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
 
 logger = logging.getLogger(__name__)
 
 ADVISORY_LOCK_ID = 987654321
+# While another replica holds the lock, poll for it reaching head this long
+HEAD_POLL_INTERVAL_SECONDS = 0.5
+HEAD_WAIT_TIMEOUT_SECONDS = 60
+
+
+def _wait_for_head(conn: Connection, head: str) -> bool:
+    """Poll alembic_version until it reads head; False if the wait times out."""
+    deadline = time.monotonic() + HEAD_WAIT_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        try:
+            current = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+            conn.commit()
+        except Exception:
+            # Version table not created yet by the migrating replica
+            conn.rollback()
+            current = None
+        if current == head:
+            return True
+        time.sleep(HEAD_POLL_INTERVAL_SECONDS)
+    return False
 
 
 def run_migrations():
@@ -30,33 +53,47 @@ def run_migrations():
     alembic_cfg.set_main_option("sqlalchemy.url", app_config.DATABASE_URL)
     alembic_cfg.set_main_option("version_table_schema", "public")
     
-    # Create engine for lock management
-    engine = create_engine(app_config.DATABASE_URL, pool_pre_ping=True)
+    # Lock (and migrate) on a connection from the app's own pool
+    from app.db.session import engine as app_engine
     lock_conn = None
     
     try:
         if app_config.DATABASE_URL.startswith("postgresql"):
-            # Acquire advisory lock (keep connection open to hold lock)
-            lock_conn = engine.connect()
+            # Try the advisory lock without blocking (keep connection open to hold lock)
+            lock_conn = app_engine.connect()
             try:
-                lock_conn.execute(text(f"SELECT pg_advisory_lock({ADVISORY_LOCK_ID})"))
+                acquired = lock_conn.execute(text(f"SELECT pg_try_advisory_lock({ADVISORY_LOCK_ID})")).scalar()
                 lock_conn.commit()
-                logger.info("Migration lock acquired")
             except Exception as lock_error:
                 logger.warning(f"Could not acquire advisory lock: {lock_error}")
-                if lock_conn:
+                lock_conn.close()
+                lock_conn = None
+                acquired = False
+            
+            if lock_conn is not None and not acquired:
+                # Another replica is migrating: wait for it to reach head instead
+                # of queueing to re-run the (no-op) upgrade ourselves
+                head = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+                logger.info(f"Migration lock held elsewhere; waiting for head {head}")
+                if _wait_for_head(lock_conn, head):
+                    logger.info("Database already at head, skipping migrations")
                     lock_conn.close()
                     lock_conn = None
+                    return
+                
+                logger.warning("Timed out waiting for head; waiting for the migration lock")
+                lock_conn.execute(text(f"SELECT pg_advisory_lock({ADVISORY_LOCK_ID})"))
+                lock_conn.commit()
+            
+            if lock_conn is not None:
+                logger.info("Migration lock acquired")
         
-        # Run migrations (idempotent - Alembic handles state)
+        # Run migrations (idempotent - Alembic handles state; upgrade stamps the version).
+        # env.py runs them on the lock connection when one is given
+        if lock_conn is not None:
+            alembic_cfg.attributes["connection"] = lock_conn
         command.upgrade(alembic_cfg, "head")
         
-        # Explicitly stamp to head to ensure version table is set
-        try:
-            command.stamp(alembic_cfg, "head")
-        except Exception:
-            pass  # Already at head, ignore
-        
         logger.info("Migrations complete")
         
     except Exception as e:
@@ -72,4 +109,3 @@ def run_migrations():
                 lock_conn.close()
             except Exception:
                 pass
-        engine.dispose()
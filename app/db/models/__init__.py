@@ -38,8 +38,6 @@ __all__ = [
     "Resume",
     "ResumeVersion",
     "CompanyPack",
-    "ResumeVersion",
-    "CompanyPack",
     "Job",
     "JobDescription",
     "JobPosting",
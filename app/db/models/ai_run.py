@@ -12,7 +12,7 @@ class AiRun(Base):
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     feature = Column(String, nullable=False, index=True)  # e.g., "job_match", "recruiter_lens"
-    input_hash = Column(String, index=True)  # Hash of input for deduplication
+    input_hash = Column(String)  # Hash of input for deduplication (see idx_user_feature_hash)
     prompt_version = Column(String, nullable=False)  # e.g., "match_v1"
     model = Column(String, nullable=False)  # e.g., "gpt-4o-mini"
     tokens_in = Column(Integer, default=0)
@@ -26,4 +26,9 @@ class AiRun(Base):
     __table_args__ = (
         Index('idx_user_feature', 'user_id', 'feature'),
         Index('idx_user_created', 'user_id', 'created_at'),
+        # Dedup lookups by input hash, answered index-only on Postgres
+        Index(
+            'idx_user_feature_hash', 'user_id', 'feature', 'input_hash',
+            postgresql_include=['tokens_in', 'tokens_out', 'cost_estimate', 'status']
+        ),
     )
@@ -1,7 +1,7 @@
 """
 Document model for AI Drive - stores resumes, cover letters, job descriptions, etc.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -38,6 +38,8 @@ class Document(Base):
     # Indexes
     __table_args__ = (
         Index('idx_user_type_created', 'user_id', 'type', 'created_at'),
+        # list_documents: WHERE user_id = ? ORDER BY created_at DESC
+        Index('idx_documents_user_created', 'user_id', text('created_at DESC')),
     )
     
     def __repr__(self):
@@ -3,7 +3,7 @@ Job-related models:
 - Job: For tracking job applications (Job Tracker)
 - JobDescription: For storing job description text content (JD parsing feature)
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -42,7 +42,10 @@ class Job(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_user_status_created', 'user_id', 'status', 'created_at'),
+        # Status-filtered list_jobs pages, in keyset order
+        Index('idx_jobs_user_status_created_id', 'user_id', 'status', text('created_at DESC'), text('id DESC')),
+        # Keyset pagination in list_jobs: ORDER BY created_at DESC, id DESC
+        Index('idx_jobs_user_created_id', 'user_id', text('created_at DESC'), text('id DESC')),
     )
     
     def __repr__(self):
@@ -39,5 +39,9 @@ class JobPosting(Base):
         Index('idx_job_posting_company_title', 'company', 'title'),
     )
     
+    # Return created_at/updated_at from the INSERT/UPDATE itself (RETURNING)
+    # so writes don't need a refresh SELECT
+    __mapper_args__ = {"eager_defaults": True}
+    
     def __repr__(self):
         return f"<JobPosting(id={self.id}, company='{self.company}', title='{self.title}')>"
@@ -1,7 +1,7 @@
 """
 MatchAnalysis model for storing resume-job match analysis results.
 """
-from sqlalchemy import Column, Integer, Float, Text, DateTime, ForeignKey, Index, JSON
+from sqlalchemy import Column, Integer, Float, Text, DateTime, ForeignKey, Index, JSON, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -43,8 +43,14 @@ class MatchAnalysis(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_user_score', 'user_id', 'score'),
+        # Top-N matches for a user by score, index-only on Postgres
+        Index(
+            'idx_user_score_desc', 'user_id', text('score DESC'),
+            postgresql_include=['resume_id', 'job_id', 'created_at']
+        ),
         Index('idx_resume_job', 'resume_id', 'job_id'),
+        # Latest analysis for a user's job (job insights)
+        Index('idx_match_analyses_user_job_created', 'user_id', 'job_id', text('created_at DESC')),
     )
     
     def __repr__(self):
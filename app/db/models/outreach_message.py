@@ -1,7 +1,7 @@
 """
 OutreachMessage model for storing generated outreach messages.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Index, Enum, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
@@ -43,6 +43,8 @@ class OutreachMessage(Base):
     __table_args__ = (
         Index('idx_outreach_message_user_type', 'user_id', 'type'),
         Index('idx_outreach_message_job_created', 'job_id', 'created_at'),
+        # Recent messages for a user's job (job insights)
+        Index('idx_outreach_message_user_job_created', 'user_id', 'job_id', text('created_at DESC')),
     )
     
     def __repr__(self):
@@ -21,6 +21,7 @@ class Resume(Base):
     # Legacy fields (kept for backward compatibility)
     original_file = Column(String, nullable=True)
     parsed_text = Column(Text, nullable=True)
+    parse_status = Column(String, nullable=True)  # "pending" | "parsed" | "failed"; NULL for rows parsed inline before background parsing
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from app.db.base import Base
 
 
@@ -17,6 +17,11 @@ class Subscription(Base):
     status = Column(String, default="inactive", nullable=False)  # active | inactive | canceled | past_due
 
     # Stripe integration fields
-    stripe_customer_id = Column(String, nullable=True, index=True)
+    stripe_customer_id = Column(String, nullable=True)  # indexed by uq_subscriptions_stripe_customer_id
     stripe_subscription_id = Column(String, nullable=True, index=True)
     stripe_price_id = Column(String, nullable=True, index=True)  # Maps to plan_type (pro/elite price IDs)
+
+    __table_args__ = (
+        # One subscription row per Stripe customer; webhooks resolve users through it
+        Index('uq_subscriptions_stripe_customer_id', 'stripe_customer_id', unique=True),
+    )
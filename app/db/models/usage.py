@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from datetime import datetime
 from app.db.base import Base
@@ -22,6 +22,10 @@ class UsageEvent(Base):
     # Composite index for fast monthly aggregation queries
     __table_args__ = (
         Index('idx_user_feature_month', 'user_id', 'feature', 'month_key'),
+        # Keyset pagination in get_history: ORDER BY created_at DESC, id DESC
+        Index('idx_usage_events_user_created_id', 'user_id', text('created_at DESC'), text('id DESC')),
+        # Feature-filtered get_history pages, in keyset order
+        Index('idx_usage_events_user_feature_created_id', 'user_id', 'feature', text('created_at DESC'), text('id DESC')),
     )
 
     @staticmethod
@@ -1,8 +1,22 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.core import config
 DATABASE_URL = config.DATABASE_URL
 
 
-engine = create_engine(DATABASE_URL)
+if config.PGBOUNCER:
+    # PgBouncer already pools server connections; pooling here too would pin them
+    engine = create_engine(DATABASE_URL, poolclass=NullPool)
+elif DATABASE_URL.startswith("postgres"):
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=30,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+    )
+else:
+    engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
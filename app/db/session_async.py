@@ -0,0 +1,52 @@
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
+from app.core import config
+
+
+def _to_async_url(url: str) -> str:
+    """Map the sync DATABASE_URL onto its async driver (asyncpg / aiosqlite)."""
+    if url.startswith("postgres://"):
+        url = "postgresql://" + url[len("postgres://"):]
+    if url.startswith("postgresql://"):
+        return "postgresql+asyncpg://" + url[len("postgresql://"):]
+    if url.startswith("postgresql+psycopg2://"):
+        return "postgresql+asyncpg://" + url[len("postgresql+psycopg2://"):]
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://"):]
+    return url
+
+
+ASYNC_DATABASE_URL = _to_async_url(config.DATABASE_URL)
+
+if config.PGBOUNCER and ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
+    # Transaction pooling can hand each statement a different server
+    # connection, so prepared statements must be off
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+    )
+elif ASYNC_DATABASE_URL.startswith("postgresql+asyncpg"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_size=config.ASYNC_DB_POOL_SIZE,
+        max_overflow=config.ASYNC_DB_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        pool_recycle=1800,
+        connect_args={
+            # Keep prepared statements for every distinct compiled query these
+            # routes issue (defaults are 100); see PGBOUNCER above
+            "statement_cache_size": 1024,
+            "prepared_statement_cache_size": 1024,
+        },
+    )
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def get_async_db():
+    """Async database session dependency."""
+    async with AsyncSessionLocal() as db:
+        yield db
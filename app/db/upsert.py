@@ -0,0 +1,17 @@
+"""
+Dialect-aware INSERT construct for upserts.
+
+PostgreSQL (production) and SQLite 3.35+ (local dev) share the
+ON CONFLICT ... DO NOTHING / DO UPDATE ... RETURNING syntax, but SQLAlchemy
+exposes it through separate dialect-specific insert() constructs.
+"""
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+
+def upsert_insert(db: Session, table):
+    """Return an insert() for table that supports on_conflict_do_nothing/do_update."""
+    if db.get_bind().dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
@@ -13,7 +13,7 @@ logger = logging.getLogger(__name__)
 # ✅ Import All API Routes (required - fail startup if missing)
 from app.api.routes import auth, resume, jd, ats, cover_letter, tailor, interview, application, usage
 from app.api.routes import resume_versions
-from app.api.routes import billing, billing_webhook, system, health
+from app.api.routes import billing, billing_status, billing_webhook, system, health
 from app.api.routes.documents import router as documents_router
 from app.api.routes.jobs import router as jobs_router
 from app.api.routes.history import router as history_router
@@ -21,9 +21,11 @@ from app.api.routes.ai import router as ai_router
 
 # ✅ Import Core Services
 from app.services.socket_manager import ConnectionManager
-from app.services.ai_engine import generate_live_answer
+from app.services.live_answer_queue import enqueue_live_answer, run_live_answer_worker
+from app.services.db_heartbeat import run_db_heartbeat
 from app.services.speech_engine import transcribe_audio_chunk
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import re
 
@@ -43,7 +45,8 @@ app = FastAPI(
     description="AI-powered job application assistant with usage quotas and billing",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse,  # orjson (C) instead of stdlib json for every route
 )
 
 logger.info("Hireblaze API starting up...")
@@ -95,12 +98,14 @@ async def startup_event():
                 logger.error(f"Database initialization failed: {e}", exc_info=True)
                 raise
         
-        # Initialize auth system (verify bcrypt/passlib is working)
+        # Initialize auth system (verify bcrypt is working)
         logger.info("Initializing auth system...")
         try:
-            from app.core.security import hash_password, verify_password, create_access_token
-            # Test password hashing to ensure bcrypt is configured correctly
-            test_hash = hash_password("test_password_123")
+            import bcrypt
+            from app.core.security import verify_password, create_access_token
+            # Test password hashing to ensure bcrypt is configured correctly;
+            # minimum cost keeps this off the cold-start path (~1ms vs ~250ms)
+            test_hash = bcrypt.hashpw(b"test_password_123", bcrypt.gensalt(rounds=4)).decode("utf-8")
             assert verify_password("test_password_123", test_hash), "Password verification failed"
             # Test JWT token creation to ensure SECRET_KEY is valid
             test_token = create_access_token({"sub": "test@example.com"})
@@ -110,12 +115,31 @@ async def startup_event():
             logger.error(f"Auth system initialization failed: {e}", exc_info=True)
             raise
         
+        import asyncio
+        app.state.live_answer_worker = asyncio.create_task(run_live_answer_worker())
+        app.state.db_heartbeat = asyncio.create_task(run_db_heartbeat())
+        
+        # Start the Stripe webhook batch worker when Redis is configured
+        from app.core.redis_client import get_async_redis
+        if get_async_redis() is not None:
+            from app.services.stripe_event_queue import run_stripe_event_worker
+            app.state.stripe_event_worker = asyncio.create_task(run_stripe_event_worker())
+        
         logger.info("Application startup complete")
         
     except Exception as e:
         logger.error(f"Startup failed: {e}", exc_info=True)
         raise
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers started on startup."""
+    for name in ("live_answer_worker", "stripe_event_worker", "db_heartbeat"):
+        worker = getattr(app.state, name, None)
+        if worker:
+            worker.cancel()
+
+
 # ✅ CORS — ALLOW FRONTEND ORIGINS
 import os
 
@@ -167,6 +191,7 @@ api_v1_router.include_router(interview.router)
 api_v1_router.include_router(application.router)
 api_v1_router.include_router(usage.router)  # Usage tracking and quota info - now /api/v1/usage
 api_v1_router.include_router(billing.router)  # Billing (checkout, portal)
+api_v1_router.include_router(billing_status.router)  # Billing liveness probe (no DB/Stripe)
 api_v1_router.include_router(billing_webhook.router)  # Stripe webhooks
 api_v1_router.include_router(system.router)
 api_v1_router.include_router(health.router)
@@ -179,6 +204,20 @@ api_v1_router.include_router(ai_router)  # AI endpoints (job-match, recruiter-le
 # Mount the API v1 router
 app.include_router(api_v1_router)
 
+
+def assert_unique_routes(routes) -> None:
+    """Fail startup if two path operations share a path and method (e.g. a module included twice)."""
+    seen = set()
+    for route in routes:
+        for method in getattr(route, "methods", None) or ():
+            key = (route.path, method)
+            if key in seen:
+                raise RuntimeError(f"Duplicate route registered: {method} {route.path}")
+            seen.add(key)
+
+
+assert_unique_routes(app.router.routes)
+
 # ✅ Static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -218,16 +257,8 @@ async def websocket_endpoint(websocket: WebSocket):
             else:
                 continue
 
-            # ✅ AI Answer Generation
-            answer = generate_live_answer(
-                question=question,
-                resume_text="",
-                jd_text=""
-            )
-
-            # ✅ Broadcast Answer to All Clients
-            for connection in manager.active_connections:
-                await connection.send_text(answer)
+            # ✅ AI Answer Generation (batched by the live answer worker, answer goes back to this socket)
+            await enqueue_live_answer(websocket, question)
 
     except WebSocketDisconnect:
         manager.active_connections.remove(websocket)
@@ -1,17 +1,30 @@
 """
 Pydantic schemas for authentication endpoints.
 """
-from typing import Optional
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Annotated, Optional
+from pydantic import BaseModel, EmailStr, Field, StringConstraints, field_validator
 
 
 class SignupRequest(BaseModel):
-    """Request schema for user signup."""
-    full_name: str = Field(..., min_length=1, max_length=200, description="User's full name")
+    """
+    Request schema for user signup.
+
+    All field checks (presence, whitespace stripping, lengths, email format)
+    run inside pydantic-core, so the route does no manual string validation.
+    """
+    full_name: Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=200)] = Field(
+        ..., description="User's full name"
+    )
     email: EmailStr = Field(..., description="User's email address")
-    password: str = Field(..., min_length=8, description="User's password (min 8 characters)")
+    password: str = Field(..., min_length=8, max_length=72, description="User's password (8-72 bytes)")
     visa_status: Optional[str] = Field(default=None, description="Visa status (optional)")
     
+    @field_validator("email")
+    @classmethod
+    def normalize_email(cls, v: str) -> str:
+        """Emails are stored lowercase."""
+        return v.lower()
+    
     @field_validator("password")
     @classmethod
     def validate_password_length(cls, v: str) -> str:
@@ -50,9 +50,23 @@ class DocumentResponse(DocumentBase):
         }
 
 
+class DocumentSummary(BaseModel):
+    """Schema for a document in list responses (no content_text; fetch it via GET /documents/{id})."""
+    id: int = Field(..., description="Document ID")
+    user_id: int = Field(..., description="User ID who owns this document")
+    title: str = Field(..., description="Document title")
+    type: str = Field(..., description="Document type")
+    tags: Optional[List[str]] = Field(default=[], description="List of tag strings")
+    created_at: datetime = Field(..., description="Document creation timestamp")
+    updated_at: datetime = Field(..., description="Document last update timestamp")
+    
+    class Config:
+        from_attributes = True
+
+
 class DocumentListResponse(BaseModel):
     """Schema for list of documents response."""
-    documents: List[DocumentResponse] = Field(..., description="List of documents")
+    documents: List[DocumentSummary] = Field(..., description="List of documents")
     total: int = Field(..., description="Total number of documents")
     page: int = Field(1, description="Current page number")
     page_size: int = Field(20, description="Number of items per page")
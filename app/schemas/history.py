@@ -35,6 +35,7 @@ class HistoryListResponse(BaseModel):
     total: int = Field(..., description="Total number of entries")
     page: int = Field(1, description="Current page number")
     page_size: int = Field(20, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
     
     class Config:
         json_schema_extra = {
@@ -42,7 +43,8 @@ class HistoryListResponse(BaseModel):
                 "entries": [],
                 "total": 0,
                 "page": 1,
-                "page_size": 20
+                "page_size": 20,
+                "next_cursor": None
             }
         }
 
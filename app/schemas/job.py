@@ -70,6 +70,7 @@ class JobListResponse(BaseModel):
     total: int = Field(..., description="Total number of jobs")
     page: int = Field(1, description="Current page number")
     page_size: int = Field(20, description="Number of items per page")
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page (None on the last page)")
     
     class Config:
         json_schema_extra = {
@@ -77,7 +78,8 @@ class JobListResponse(BaseModel):
                 "jobs": [],
                 "total": 0,
                 "page": 1,
-                "page_size": 20
+                "page_size": 20,
+                "next_cursor": None
             }
         }
 
@@ -1,3 +1,5 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 from openai import OpenAI
 from app.core.config import OPENAI_API_KEY
 import logging
@@ -89,6 +91,28 @@ Job Description:
     return call_openai(prompt)
 
 
+def generate_live_answer_batch(questions: List[str], resume_text: str = "", jd_text: str = "") -> List[Optional[str]]:
+    """
+    Answer a micro-batch of live questions.
+
+    Chat completions take one conversation per request, so the batch is sent
+    as concurrent requests rather than one call. Answers come back in question
+    order; a question whose call fails maps to None.
+    """
+    def answer(question: str) -> Optional[str]:
+        try:
+            return generate_live_answer(question, resume_text, jd_text)
+        except Exception as e:
+            logger.error(f"Live answer failed: {e}")
+            return None
+
+    if len(questions) == 1:
+        return [answer(questions[0])]
+
+    with ThreadPoolExecutor(max_workers=len(questions)) as pool:
+        return list(pool.map(answer, questions))
+
+
 # ✅ STAR FORMATTER
 def star_formatter(question: str, resume_text: str):
     prompt = f"""
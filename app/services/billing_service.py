@@ -10,6 +10,7 @@ from sqlalchemy.orm import Session
 
 from app.db.models.user import User
 from app.db.models.subscription import Subscription
+from app.db.upsert import upsert_insert
 from app.core.config import (
     STRIPE_SECRET_KEY,
     STRIPE_PRICE_ID_PRO,
@@ -68,6 +69,24 @@ def get_price_id_from_plan(plan: str) -> Optional[str]:
     return price_id
 
 
+def upsert_subscription(db: Session, user_id: int, values: Dict) -> Subscription:
+    """
+    Create or update a user's subscription row in one round-trip.
+    
+    Uses INSERT ... ON CONFLICT (user_id) DO UPDATE ... RETURNING, relying on the
+    unique constraint on subscriptions.user_id. New rows default to the free plan
+    unless values sets plan_type. The caller is responsible for committing.
+    """
+    insert_values = {"user_id": user_id, "plan_type": "free", "status": "inactive", **values}
+    stmt = (
+        upsert_insert(db, Subscription)
+        .values(**insert_values)
+        .on_conflict_do_update(index_elements=["user_id"], set_=values)
+        .returning(Subscription)
+    )
+    return db.scalars(stmt, execution_options={"populate_existing": True}).one()
+
+
 def create_checkout_session(
     user: User,
     plan: str,
@@ -189,43 +208,28 @@ def handle_checkout_session_completed(event_data: Dict, db: Session) -> Subscrip
     user_id_str = metadata.get("user_id")
     plan = metadata.get("plan")
     
-    # Find user
+    # Find user: metadata user_id, then the indexed Stripe customer mapping,
+    # then (first checkout without metadata) the customer email
+    user = None
     if user_id_str:
         user_id = int(user_id_str)
         user = db.query(User).filter(User.id == user_id).first()
-    elif customer_email:
-        user = db.query(User).filter(User.email == customer_email).first()
+    elif customer_id or customer_email:
+        if customer_id:
+            user_id = db.query(Subscription.user_id).filter(
+                Subscription.stripe_customer_id == customer_id
+            ).scalar()
+            if user_id is not None:
+                user = db.query(User).filter(User.id == user_id).first()
+        if not user and customer_email:
+            user = db.query(User).filter(User.email == customer_email.lower()).first()
     else:
         raise ValueError("Cannot identify user from checkout session")
     
     if not user:
         raise ValueError(f"User not found for checkout session")
     
-    # Get subscription
-    subscription = db.query(Subscription).filter(Subscription.user_id == user.id).first()
-    
-    if not subscription:
-        subscription = Subscription(user_id=user.id, plan_type="free", status="inactive")
-        db.add(subscription)
-    
-    # Update subscription details
-    subscription.stripe_customer_id = customer_id
-    subscription.stripe_subscription_id = subscription_id
-    subscription.status = "active"
-    
-    # Determine plan from price ID if not in metadata
-    if not plan and subscription_id:
-        try:
-            stripe_sub = stripe.Subscription.retrieve(subscription_id)
-            price_id = stripe_sub.get("items", {}).get("data", [{}])[0].get("price", {}).get("id")
-            plan = get_plan_from_price_id(price_id)
-        except Exception as e:
-            logger.warning(f"Failed to retrieve subscription from Stripe: {e}")
-    
-    if plan:
-        subscription.plan_type = plan
-    
-    # Get price ID and period end from subscription
+    # Get price ID, period end and (if not in metadata) plan from Stripe - one API call
     price_id = None
     period_end = None
     if subscription_id:
@@ -237,16 +241,22 @@ def handle_checkout_session_completed(event_data: Dict, db: Session) -> Subscrip
                 from datetime import datetime
                 period_end = datetime.fromtimestamp(period_end_timestamp)
             
-            # Update plan from price ID if not set
+            # Determine plan from price ID if not in metadata
             if not plan and price_id:
                 plan = get_plan_from_price_id(price_id)
-                if plan:
-                    subscription.plan_type = plan
         except Exception as e:
             logger.warning(f"Failed to retrieve subscription from Stripe: {e}")
     
-    subscription.stripe_price_id = price_id
-    subscription.status = "active"
+    # Create or update the subscription row in a single statement
+    subscription_values = {
+        "stripe_customer_id": customer_id,
+        "stripe_subscription_id": subscription_id,
+        "stripe_price_id": price_id,
+        "status": "active",
+    }
+    if plan:
+        subscription_values["plan_type"] = plan
+    subscription = upsert_subscription(db, user.id, subscription_values)
     
     # Sync to User model
     # Normalize plan: map "premium" to "pro", keep "pro" and "elite" as-is
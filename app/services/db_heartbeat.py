@@ -0,0 +1,54 @@
+"""
+Background database heartbeat.
+
+Probes the database with SELECT 1 every DB_HEARTBEAT_INTERVAL_SECONDS and
+keeps the result in memory, so health endpoints polled by load balancers
+report DB status without a connection checkout per request.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.db.session_async import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+DB_HEARTBEAT_INTERVAL_SECONDS = 5.0
+# A result older than this means the heartbeat stalled; don't trust it
+DB_HEARTBEAT_STALE_SECONDS = 3 * DB_HEARTBEAT_INTERVAL_SECONDS
+
+_last_db_ok: Optional[bool] = None
+_last_check_at = 0.0
+
+
+async def probe_database() -> bool:
+    """Run SELECT 1 and record the result."""
+    global _last_db_ok, _last_check_at
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
+        ok = True
+    except Exception as e:
+        if _last_db_ok is not False:
+            logger.warning(f"Database heartbeat failed: {e}")
+        ok = False
+    _last_db_ok, _last_check_at = ok, time.monotonic()
+    return ok
+
+
+def last_db_status() -> Optional[bool]:
+    """Latest heartbeat result, or None if there is no recent one."""
+    if _last_db_ok is None or time.monotonic() - _last_check_at > DB_HEARTBEAT_STALE_SECONDS:
+        return None
+    return _last_db_ok
+
+
+async def run_db_heartbeat() -> None:
+    """Probe the database forever at a fixed interval."""
+    logger.info("Database heartbeat started")
+    while True:
+        await probe_database()
+        await asyncio.sleep(DB_HEARTBEAT_INTERVAL_SECONDS)
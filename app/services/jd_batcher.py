@@ -0,0 +1,154 @@
+"""
+Micro-batching worker pool for job description parsing.
+
+JD endpoints submit text and await a future instead of running the parse
+inline. Each batcher collects submissions for up to MAX_WAIT_SECONDS (or
+MAX_BATCH texts), parses each distinct text once, and runs the batch on a
+shared, bounded thread pool so parse work never blocks the event loop or
+competes with FastAPI's request threadpool.
+
+Results are cached in Redis (when configured) under the SHA-256 of the
+whitespace-normalized text, so retries and repeat postings skip parsing.
+"""
+import asyncio
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import orjson
+
+from app.core.redis_client import get_async_redis
+from app.services.ai_engine import extract_skills_from_jd
+from app.services.jd_parser_service import parse_job_description
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 32
+MAX_WAIT_SECONDS = 0.02
+JD_WORKER_THREADS = 8
+JD_CACHE_TTL_SECONDS = 86_400
+
+# Shared by every batcher; bounds concurrent parse/LLM calls process-wide
+_jd_pool = ThreadPoolExecutor(max_workers=JD_WORKER_THREADS, thread_name_prefix="jd-worker")
+
+
+def jd_cache_key(prefix: str, jd_text: str) -> str:
+    """Content-addressed cache key; whitespace-only differences share an entry."""
+    normalized = " ".join(jd_text.split())
+    return f"{prefix}:{hashlib.sha256(normalized.encode('utf-8')).hexdigest()}"
+
+
+async def get_cached_jd_result(key: str) -> Optional[Any]:
+    """Return the cached result for key, or None on a miss (or without Redis)."""
+    redis = get_async_redis()
+    if redis is None:
+        return None
+    try:
+        raw = await redis.get(key)
+    except Exception as e:
+        logger.warning(f"JD cache read failed: {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_jd_result(key: str, result: Any) -> None:
+    """Store result under key for JD_CACHE_TTL_SECONDS (no-op without Redis)."""
+    redis = get_async_redis()
+    if redis is None:
+        return
+    try:
+        await redis.set(key, orjson.dumps(result), ex=JD_CACHE_TTL_SECONDS)
+    except Exception as e:
+        logger.warning(f"JD cache write failed: {e}")
+
+
+class JDBatcher:
+    """Queue JD texts and resolve them in micro-batches with parse_fn (cached under cache_prefix)."""
+
+    def __init__(
+        self,
+        parse_fn: Callable[[str], Any],
+        cache_prefix: Optional[str] = None,
+        max_batch: int = MAX_BATCH,
+        max_wait: float = MAX_WAIT_SECONDS,
+    ):
+        self.parse_fn = parse_fn
+        self.cache_prefix = cache_prefix
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: Optional["asyncio.Queue[Tuple[str, asyncio.Future]]"] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._inflight: Set[asyncio.Task] = set()
+
+    async def submit(self, jd_text: str) -> Any:
+        """Return the cached result for jd_text, or queue it and wait for the parse (or exception)."""
+        if self.cache_prefix:
+            cached = await get_cached_jd_result(jd_cache_key(self.cache_prefix, jd_text))
+            if cached is not None:
+                return cached
+        
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((jd_text, future))
+        return await future
+
+    async def _drain(self) -> List[Tuple[str, asyncio.Future]]:
+        """Wait for one submission, then collect more for up to max_wait seconds."""
+        items = [await self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(items) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _resolve(self, items: List[Tuple[str, asyncio.Future]]) -> None:
+        """Parse each distinct text in the batch once and fan results out."""
+        waiters: Dict[str, List[asyncio.Future]] = {}
+        for jd_text, future in items:
+            waiters.setdefault(jd_text, []).append(future)
+
+        loop = asyncio.get_running_loop()
+        texts = list(waiters)
+        results = await asyncio.gather(
+            *(loop.run_in_executor(_jd_pool, self.parse_fn, jd_text) for jd_text in texts),
+            return_exceptions=True
+        )
+
+        for jd_text, result in zip(texts, results):
+            for future in waiters[jd_text]:
+                if future.done():
+                    continue  # Caller went away
+                if isinstance(result, BaseException):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+        # Callers already have their results; cache writes don't delay them
+        if self.cache_prefix:
+            for jd_text, result in zip(texts, results):
+                if not isinstance(result, BaseException):
+                    await cache_jd_result(jd_cache_key(self.cache_prefix, jd_text), result)
+
+    async def _run(self) -> None:
+        """Drain the queue forever; batches resolve concurrently on the shared pool."""
+        logger.info(f"JD batch worker started: {self.parse_fn.__name__}")
+        while True:
+            items = await self._drain()
+            logger.debug(f"JD batch: {self.parse_fn.__name__}, size={len(items)}")
+            task = asyncio.create_task(self._resolve(items))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+
+jd_parse_batcher = JDBatcher(parse_job_description, cache_prefix="jdparse")
+skill_extract_batcher = JDBatcher(extract_skills_from_jd, cache_prefix="jdskills")
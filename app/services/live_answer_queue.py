@@ -0,0 +1,86 @@
+"""
+Micro-batching queue for live copilot answers.
+
+Websocket handlers only enqueue (socket, question) pairs and go back to
+reading. A worker task drains the queue in small batches, answers each batch
+in one generate_live_answer_batch call off the event loop, and sends every
+answer back to the socket that asked the question.
+"""
+import asyncio
+import logging
+import time
+from typing import List, Set, Tuple
+
+from fastapi import WebSocket
+
+from app.services.ai_engine import generate_live_answer_batch
+
+logger = logging.getLogger(__name__)
+
+LIVE_ANSWER_BATCH_SIZE = 8
+LIVE_ANSWER_BATCH_WINDOW_SECONDS = 0.02
+LIVE_ANSWER_MAX_INFLIGHT_BATCHES = 4
+LIVE_ANSWER_ERROR_MESSAGE = "Sorry, I couldn't generate an answer. Please try again."
+
+_pending: "asyncio.Queue[Tuple[WebSocket, str]]" = asyncio.Queue()
+
+
+async def enqueue_live_answer(websocket: WebSocket, question: str) -> None:
+    """Queue a question; the answer is sent to websocket once ready."""
+    await _pending.put((websocket, question))
+
+
+async def drain_live_answers(
+    batch_size: int = LIVE_ANSWER_BATCH_SIZE,
+    window: float = LIVE_ANSWER_BATCH_WINDOW_SECONDS,
+) -> List[Tuple[WebSocket, str]]:
+    """Wait for one queued question, then collect more for up to window seconds."""
+    items = [await _pending.get()]
+    deadline = time.monotonic() + window
+    while len(items) < batch_size:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            items.append(await asyncio.wait_for(_pending.get(), timeout=remaining))
+        except asyncio.TimeoutError:
+            break
+    return items
+
+
+async def answer_live_batch(items: List[Tuple[WebSocket, str]]) -> None:
+    """Answer one batch and fan the answers out to their sockets."""
+    answers = await asyncio.to_thread(generate_live_answer_batch, [question for _, question in items])
+    for (websocket, _), answer in zip(items, answers):
+        try:
+            await websocket.send_text(answer if answer is not None else LIVE_ANSWER_ERROR_MESSAGE)
+        except Exception as e:
+            # Socket closed while the model was running
+            logger.debug(f"Dropping live answer for closed socket: {e}")
+
+
+async def run_live_answer_worker() -> None:
+    """Drain the live answer queue forever, answering questions in micro-batches."""
+    logger.info("Live answer worker started")
+    # Batches run concurrently so one slow model call doesn't hold up the queue
+    slots = asyncio.Semaphore(LIVE_ANSWER_MAX_INFLIGHT_BATCHES)
+    inflight: Set[asyncio.Task] = set()
+
+    async def run_batch(items: List[Tuple[WebSocket, str]]) -> None:
+        try:
+            await answer_live_batch(items)
+        except Exception as e:
+            logger.error(f"Live answer batch failed: {e}", exc_info=True)
+        finally:
+            slots.release()
+
+    while True:
+        await slots.acquire()
+        try:
+            items = await drain_live_answers()
+        except BaseException:
+            slots.release()
+            raise
+        task = asyncio.create_task(run_batch(items))
+        inflight.add(task)
+        task.add_done_callback(inflight.discard)
@@ -8,11 +8,13 @@ import logging
 from datetime import datetime
 from typing import Dict, Tuple, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 
 from app.db.models.subscription import Subscription
 from app.db.models.usage import UsageEvent
-from app.core.plan_limits import PLAN_LIMITS, get_plan_limit, SUPPORTED_FEATURES
+from app.db.models.user import User
+from app.core.plan_limits import get_all_plan_limits, get_plan_limit, SUPPORTED_FEATURES
+from app.core.usage_cache import invalidate_usage
 
 logger = logging.getLogger(__name__)
 
@@ -117,6 +119,75 @@ def check_and_consume(
     usage_dict = get_month_usage(db, user_id, month_key)
     current_usage = usage_dict.get(feature, 0)
     
+    return _consume(db, user_id, plan_type, feature, amount, current_usage, month_key)
+
+
+def check_and_consume_by_email(
+    db: Session,
+    email: str,
+    feature: str,
+    amount: int = 1
+) -> Optional[Tuple[User, str, int, Optional[int], int, bool]]:
+    """
+    check_and_consume for an authenticated email, atomic per user.
+    
+    The user row is locked (SELECT ... FOR UPDATE, fetched together with the
+    plan) before this month's usage is summed, and the lock is held until the
+    usage row is committed. Concurrent requests for the same user therefore
+    check and consume one at a time and can't all read used = limit - 1 and
+    overshoot. The sum is a separate statement because under READ COMMITTED
+    only a statement started after the lock sees the previous holder's insert.
+    (SQLite, used for local development only, ignores FOR UPDATE.)
+    
+    Returns:
+        None if no user has this email, else
+        (user, plan_type, used, limit, remaining, exceeded) with check_and_consume's
+        used/limit/remaining semantics. exceeded is True when the request was
+        refused and nothing was recorded (used/remaining alone can't tell that
+        apart from a request that used up the last of the quota).
+    """
+    month_key = UsageEvent.get_month_key()
+    plan_subq = (
+        select(Subscription.plan_type)
+        .where(Subscription.user_id == User.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+    row = (
+        db.query(User, plan_subq)
+        .filter(User.email == email)
+        .with_for_update(of=User)
+        .first()
+    )
+    if row is None:
+        return None
+    
+    user, plan_type = row
+    plan_type = plan_type or "free"
+    current_usage = db.query(func.coalesce(func.sum(UsageEvent.amount), 0)).filter(
+        UsageEvent.user_id == user.id,
+        UsageEvent.feature == feature,
+        UsageEvent.month_key == month_key
+    ).scalar()
+    current_usage = int(current_usage)
+    used, limit, remaining = _consume(db, user.id, plan_type, feature, amount, current_usage, month_key)
+    exceeded = limit is not None and current_usage + amount > limit
+    if exceeded:
+        # Nothing to write; release the row lock (commit, unlike rollback, keeps user loaded)
+        db.commit()
+    return user, plan_type, used, limit, remaining, exceeded
+
+
+def _consume(
+    db: Session,
+    user_id: int,
+    plan_type: str,
+    feature: str,
+    amount: int,
+    current_usage: int,
+    month_key: str
+) -> Tuple[int, Optional[int], int]:
+    """Apply the plan limit to current_usage and record the usage if allowed."""
     # Get plan limit
     limit = get_plan_limit(plan_type, feature)
     
@@ -131,6 +202,7 @@ def check_and_consume(
         )
         db.add(usage_event)
         db.commit()
+        invalidate_usage(user_id)
         
         logger.info(
             f"Usage consumed (unlimited): user_id={user_id}, feature={feature}, "
@@ -143,12 +215,9 @@ def check_and_consume(
     if current_usage + amount > limit:
         # Quota exceeded - don't record usage, return info for error
         # Return current usage (before consuming) and remaining = 0 to indicate exceeded
-        # Note: remaining is already 0 when current_usage >= limit
-        remaining = max(0, limit - current_usage)
-        # Return with remaining=0 to signal exceeded (when limit is not None and remaining==0)
         return (current_usage, limit, 0)
     
-    # Record usage atomically
+    # Record usage (nothing is read back from the row, so no refresh)
     usage_event = UsageEvent(
         user_id=user_id,
         feature=feature,
@@ -157,7 +226,7 @@ def check_and_consume(
     )
     db.add(usage_event)
     db.commit()
-    db.refresh(usage_event)
+    invalidate_usage(user_id)
     
     # Calculate final usage and remaining
     final_usage = current_usage + amount
@@ -185,7 +254,7 @@ def get_usage_for_response(db: Session, user_id: int) -> Dict:
     plan_type = get_plan_for_user(db, user_id)
     month_key = UsageEvent.get_month_key()
     usage_dict = get_month_usage(db, user_id, month_key)
-    plan_limits = PLAN_LIMITS.get(plan_type, PLAN_LIMITS["free"])
+    plan_limits = get_all_plan_limits(plan_type)
     
     features = {}
     for feature in SUPPORTED_FEATURES:
@@ -1,5 +1,13 @@
+import logging
+
 import fitz  # pymupdf
 
+from app.db.session import SessionLocal
+from app.db.models.resume import Resume
+
+logger = logging.getLogger(__name__)
+
+
 def parse_resume(file_path: str):
     text = ""
     doc = fitz.open(file_path)
@@ -8,3 +16,23 @@ def parse_resume(file_path: str):
         text += page.get_text()
 
     return text
+
+
+def parse_and_store_resume(resume_id: int, file_path: str) -> None:
+    """
+    Background task: parse an uploaded resume and store the text on its row.
+
+    Sets parse_status to "parsed" on success or "failed" if extraction raises.
+    """
+    try:
+        parsed_text = parse_resume(file_path)
+        values = {"parsed_text": parsed_text, "parse_status": "parsed"}
+    except Exception as e:
+        logger.error(f"Resume parse failed: resume_id={resume_id}, error={e}", exc_info=True)
+        values = {"parse_status": "failed"}
+
+    with SessionLocal() as db:
+        db.query(Resume).filter(Resume.id == resume_id).update(values, synchronize_session=False)
+        db.commit()
+
+    logger.info(f"Resume parse finished: resume_id={resume_id}, status={values['parse_status']}")
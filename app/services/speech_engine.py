@@ -1,3 +1,4 @@
+import anyio
 import openai
 from app.core.config import OPENAI_API_KEY
 
@@ -8,9 +9,12 @@ async def transcribe_audio_chunk(audio_bytes: bytes):
     """
     Accepts short audio chunks and returns transcribed text using Whisper.
     """
-    transcript = openai.audio.transcriptions.create(
-        file=audio_bytes,
-        model="gpt-4o-transcribe"
+    # The OpenAI client is blocking; run it in a worker thread to keep the event loop free
+    transcript = await anyio.to_thread.run_sync(
+        lambda: openai.audio.transcriptions.create(
+            file=audio_bytes,
+            model="gpt-4o-transcribe"
+        )
     )
 
     return transcript.text
@@ -0,0 +1,403 @@
+"""
+Stripe webhook event processing and Redis-backed batching queue.
+
+The webhook route only verifies the signature and enqueues the raw event
+payload. A worker task drains the queue in batches and applies each batch
+with a single database session, so webhook responses never wait on (or hold)
+a DB connection. Without Redis, events are applied directly by the caller.
+
+Delivery is at least once: a drained event is moved (LMOVE) onto a
+processing list and only removed from it after its handler committed.
+Failed events go back on the queue (up to STRIPE_EVENT_MAX_ATTEMPTS), and
+whatever a crashed worker left on the processing list is re-queued when a
+worker takes over. One worker at a time holds a lease on the queue so
+recovery never steals another live worker's batch; the lease is renewed
+while a batch runs, and a worker that loses it stops applying events and
+leaves the queue lists alone.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.core.redis_client import get_async_redis
+from app.services.billing_service import (
+    handle_checkout_session_completed,
+    handle_subscription_created,
+    handle_subscription_updated,
+    handle_subscription_deleted
+)
+from app.services.billing_invoice_handlers import (
+    handle_invoice_payment_succeeded,
+    handle_invoice_payment_failed
+)
+
+logger = logging.getLogger(__name__)
+
+STRIPE_EVENTS_KEY = "stripe:events"
+STRIPE_EVENTS_PROCESSING_KEY = "stripe:events:processing"
+STRIPE_EVENT_ATTEMPTS_KEY = "stripe:events:attempts"
+STRIPE_WORKER_LEASE_KEY = "stripe:events:worker"
+STRIPE_EVENT_BATCH_SIZE = 50
+STRIPE_EVENT_MAX_ATTEMPTS = 5
+STRIPE_WORKER_IDLE_SECONDS = 1.0
+STRIPE_WORKER_LEASE_SECONDS = 30
+STRIPE_WORKER_LEASE_RENEW_SECONDS = 10
+
+# Extend the lease only if this worker still owns it (GET + EXPIRE as one step)
+_RENEW_LEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Stripe retries deliveries for up to 3 days
+STRIPE_EVENT_DEDUP_TTL_SECONDS = 259_200
+STRIPE_EVENT_DEDUP_KEY_PREFIX = "stripe:evt:"
+
+# In-process fallback when Redis is not configured: {event_id: expires_at}
+_LOCAL_SEEN_MAXSIZE = 10_000
+_local_seen_events: "OrderedDict[str, float]" = OrderedDict()
+
+
+# Event type -> handler; each takes (event_data, db) and returns a Subscription or None
+STRIPE_EVENT_HANDLERS = {
+    "checkout.session.completed": handle_checkout_session_completed,
+    "customer.subscription.created": handle_subscription_created,
+    "customer.subscription.updated": handle_subscription_updated,
+    "customer.subscription.deleted": handle_subscription_deleted,
+    "invoice.payment_succeeded": handle_invoice_payment_succeeded,
+    "invoice.payment_failed": handle_invoice_payment_failed,
+}
+
+# Event types logged above INFO once applied
+STRIPE_EVENT_LOG_LEVELS = {
+    "invoice.payment_failed": logging.WARNING,
+}
+
+
+def apply_stripe_event(event: Dict[str, Any], db: Session) -> bool:
+    """
+    Apply one verified Stripe event to the database.
+    
+    Handlers receive event["data"] and read .object themselves; errors are
+    logged and rolled back so one bad event never blocks the rest.
+    
+    Returns True once the event is handled (committed, or an ignored type)
+    and False if the handler failed.
+    """
+    event_type = event.get("type")
+    handler = STRIPE_EVENT_HANDLERS.get(event_type)
+    if handler is None:
+        # Unhandled event type - log but don't fail
+        logger.debug(f"Unhandled webhook event type: {event_type}")
+        return True
+    
+    logger.info(f"Processing webhook event: type={event_type}, id={event.get('id')}")
+    
+    try:
+        subscription = handler(event.get("data", {}), db)
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Error processing webhook event {event_type}: {e}", exc_info=True)
+        return False
+    
+    level = STRIPE_EVENT_LOG_LEVELS.get(event_type, logging.INFO)
+    if subscription is not None:
+        logger.log(
+            level,
+            f"Applied {event_type}: user_id={subscription.user_id}, "
+            f"plan={subscription.plan_type}, status={subscription.status}"
+        )
+    else:
+        logger.log(level, f"Applied {event_type}")
+    return True
+
+
+def process_stripe_events(
+    events: List[Dict[str, Any]],
+    stop: Optional[threading.Event] = None
+) -> List[bool]:
+    """
+    Apply a batch of events in arrival order using one database session.
+    
+    Returns one success flag per applied event. If stop is set, the events
+    after the current one are not applied and the list comes back short.
+    """
+    db = SessionLocal()
+    results = []
+    try:
+        for event in events:
+            if stop is not None and stop.is_set():
+                break
+            results.append(apply_stripe_event(event, db))
+        return results
+    finally:
+        db.close()
+
+
+async def is_stripe_event_processed(event_id: str) -> bool:
+    """
+    True if this event ID was already applied.
+    
+    Events are only marked once their handler committed (see
+    mark_stripe_event_processed), so a delivery whose processing failed is
+    never mistaken for a duplicate when Stripe retries it.
+    """
+    redis = get_async_redis()
+    if redis is not None:
+        try:
+            return bool(await redis.exists(f"{STRIPE_EVENT_DEDUP_KEY_PREFIX}{event_id}"))
+        except Exception as e:
+            logger.warning(f"Stripe event dedup check failed, using in-process set: {e}")
+    
+    expires_at = _local_seen_events.get(event_id)
+    return expires_at is not None and expires_at > time.monotonic()
+
+
+async def mark_stripe_event_processed(event_id: str) -> None:
+    """Record that an event was applied (for STRIPE_EVENT_DEDUP_TTL_SECONDS)."""
+    redis = get_async_redis()
+    if redis is not None:
+        try:
+            await redis.set(f"{STRIPE_EVENT_DEDUP_KEY_PREFIX}{event_id}", 1, ex=STRIPE_EVENT_DEDUP_TTL_SECONDS)
+            return
+        except Exception as e:
+            logger.warning(f"Stripe event dedup write failed, using in-process set: {e}")
+    
+    _local_seen_events[event_id] = time.monotonic() + STRIPE_EVENT_DEDUP_TTL_SECONDS
+    _local_seen_events.move_to_end(event_id)
+    while len(_local_seen_events) > _LOCAL_SEEN_MAXSIZE:
+        _local_seen_events.popitem(last=False)
+
+
+async def apply_stripe_event_now(event: Dict[str, Any]) -> None:
+    """Apply one event outside the queue (no Redis), marking it processed only on success."""
+    event_id = event.get("id") or ""
+    if await is_stripe_event_processed(event_id):
+        return
+    applied, = await asyncio.to_thread(process_stripe_events, [event])
+    if applied:
+        await mark_stripe_event_processed(event_id)
+
+
+async def enqueue_stripe_event(payload: bytes) -> bool:
+    """
+    Push a verified raw event payload onto the Redis queue.
+    
+    Returns False when Redis is not configured or unreachable, in which case
+    the caller must process the event itself.
+    """
+    redis = get_async_redis()
+    if redis is None:
+        return False
+    try:
+        await redis.lpush(STRIPE_EVENTS_KEY, payload)
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to enqueue Stripe event, processing inline: {e}")
+        return False
+
+
+async def drain_stripe_events(batch_size: int = STRIPE_EVENT_BATCH_SIZE) -> List[Tuple[bytes, Dict[str, Any]]]:
+    """
+    Move up to batch_size of the oldest queued events onto the processing list.
+    
+    LPUSH puts new events at the head, so the oldest sit at the tail; each
+    LMOVE atomically takes one from the tail of the queue to the head of the
+    processing list. Returns (raw payload, event) pairs in FIFO order; the
+    raw payload is what ack_stripe_event / requeue_stripe_event remove.
+    """
+    redis = get_async_redis()
+    if redis is None:
+        return []
+    async with redis.pipeline(transaction=False) as pipe:
+        for _ in range(batch_size):
+            pipe.lmove(STRIPE_EVENTS_KEY, STRIPE_EVENTS_PROCESSING_KEY, "RIGHT", "LEFT")
+        moved = await pipe.execute()
+    
+    events = []
+    for raw in moved:
+        if raw is None:
+            break  # Queue empty
+        try:
+            events.append((raw, json.loads(raw)))
+        except ValueError:
+            logger.error("Dropping undecodable Stripe event from queue")
+            await redis.lrem(STRIPE_EVENTS_PROCESSING_KEY, 1, raw)
+    return events
+
+
+async def ack_stripe_event(raw: bytes, event_id: str) -> None:
+    """Remove an applied event from the processing list."""
+    redis = get_async_redis()
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.lrem(STRIPE_EVENTS_PROCESSING_KEY, 1, raw)
+        pipe.hdel(STRIPE_EVENT_ATTEMPTS_KEY, event_id)
+        await pipe.execute()
+
+
+async def requeue_stripe_event(raw: bytes, event_id: str) -> None:
+    """
+    Put a failed event back on the queue, or drop it after STRIPE_EVENT_MAX_ATTEMPTS.
+    
+    Re-queued events go to the head (newest end), so they are retried after
+    the events already waiting instead of spinning on one failure.
+    """
+    redis = get_async_redis()
+    attempts = await redis.hincrby(STRIPE_EVENT_ATTEMPTS_KEY, event_id, 1)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.lrem(STRIPE_EVENTS_PROCESSING_KEY, 1, raw)
+        if attempts < STRIPE_EVENT_MAX_ATTEMPTS:
+            pipe.lpush(STRIPE_EVENTS_KEY, raw)
+        else:
+            pipe.hdel(STRIPE_EVENT_ATTEMPTS_KEY, event_id)
+        await pipe.execute()
+    if attempts >= STRIPE_EVENT_MAX_ATTEMPTS:
+        logger.error(f"Dropping Stripe event {event_id} after {attempts} failed attempts")
+
+
+async def recover_stripe_events() -> int:
+    """
+    Re-queue everything left on the processing list (a worker died mid-batch).
+    
+    Only call while holding the worker lease. Events keep their order: each
+    LMOVE takes the newest leftover and pushes it behind the queue's tail,
+    so the oldest end up next in line. Returns the number re-queued.
+    """
+    redis = get_async_redis()
+    recovered = 0
+    while await redis.lmove(STRIPE_EVENTS_PROCESSING_KEY, STRIPE_EVENTS_KEY, "LEFT", "RIGHT") is not None:
+        recovered += 1
+    if recovered:
+        logger.warning(f"Re-queued {recovered} Stripe events left in processing")
+    return recovered
+
+
+async def hold_worker_lease(token: str) -> Tuple[bool, bool]:
+    """
+    Take or renew the single-worker lease on the queue.
+    
+    Returns (held, newly_acquired). A lease not renewed within
+    STRIPE_WORKER_LEASE_SECONDS (worker died) can be taken by another worker.
+    """
+    redis = get_async_redis()
+    if await redis.set(STRIPE_WORKER_LEASE_KEY, token, nx=True, ex=STRIPE_WORKER_LEASE_SECONDS):
+        return True, True
+    return await renew_worker_lease(token), False
+
+
+async def renew_worker_lease(token: str) -> bool:
+    """Extend the lease if token still owns it; False if it expired or another worker took it."""
+    redis = get_async_redis()
+    renewed = await redis.eval(_RENEW_LEASE_SCRIPT, 1, STRIPE_WORKER_LEASE_KEY, token, STRIPE_WORKER_LEASE_SECONDS)
+    return bool(renewed)
+
+
+async def keep_worker_lease(token: str, lost: threading.Event) -> None:
+    """Renew the lease every STRIPE_WORKER_LEASE_RENEW_SECONDS until cancelled; set lost if a renewal fails."""
+    while True:
+        await asyncio.sleep(STRIPE_WORKER_LEASE_RENEW_SECONDS)
+        try:
+            held = await renew_worker_lease(token)
+        except Exception as e:
+            logger.error(f"Stripe worker lease renewal failed: {e}")
+            held = False
+        if not held:
+            lost.set()
+            return
+
+
+async def process_drained_batch(batch: List[Tuple[bytes, Dict[str, Any]]], token: str) -> bool:
+    """
+    Apply a drained batch, acking applied events and re-queueing failed ones.
+    
+    Events already applied (Stripe redeliveries, or a recovered event whose
+    ack was lost) are acked without being applied again. Each event is marked
+    processed before its ack, so a crash in between can't reapply it.
+    
+    The lease is renewed while the batch is applied. If it is lost, no
+    further events are applied and nothing is acked or re-queued: the new
+    owner has already moved the processing list back onto the queue, and
+    the events applied so far are marked processed so it skips them.
+    
+    Returns False if the lease was lost.
+    """
+    pending = []
+    seen = set()
+    for raw, event in batch:
+        event_id = event.get("id") or ""
+        if event_id in seen or await is_stripe_event_processed(event_id):
+            await ack_stripe_event(raw, event_id)
+            continue
+        seen.add(event_id)
+        pending.append((raw, event))
+    if not pending:
+        return True
+    
+    lost = threading.Event()
+    renewer = asyncio.create_task(keep_worker_lease(token, lost))
+    try:
+        results = await asyncio.to_thread(process_stripe_events, [event for _, event in pending], lost)
+    finally:
+        renewer.cancel()
+    
+    for (raw, event), applied in zip(pending, results):
+        if applied:
+            await mark_stripe_event_processed(event.get("id") or "")
+    
+    if lost.is_set() or not await renew_worker_lease(token):
+        logger.error(
+            f"Stripe worker lost its lease mid-batch after {len(results)}/{len(pending)} events; "
+            f"leaving the rest to the new owner"
+        )
+        return False
+    
+    for (raw, event), applied in zip(pending, results):
+        event_id = event.get("id") or ""
+        if applied:
+            await ack_stripe_event(raw, event_id)
+        else:
+            await requeue_stripe_event(raw, event_id)
+    logger.info(f"Applied {sum(results)}/{len(pending)} queued Stripe events")
+    return True
+
+
+async def run_stripe_event_worker() -> None:
+    """Drain the Stripe event queue forever, applying events in batches."""
+    logger.info("Stripe event worker started")
+    token = uuid.uuid4().hex
+    needs_recovery = True
+    while True:
+        try:
+            held, newly_acquired = await hold_worker_lease(token)
+            if not held:
+                # Another worker owns the queue
+                await asyncio.sleep(STRIPE_WORKER_IDLE_SECONDS)
+                continue
+            if newly_acquired or needs_recovery:
+                await recover_stripe_events()
+                needs_recovery = False
+            
+            batch = await drain_stripe_events()
+            if not batch:
+                await asyncio.sleep(STRIPE_WORKER_IDLE_SECONDS)
+                continue
+            if not await process_drained_batch(batch, token):
+                # If this worker takes the lease back, its leftovers are re-queued first
+                needs_recovery = True
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Re-queue whatever this batch left on the processing list
+            needs_recovery = True
+            logger.error(f"Stripe event worker error: {e}", exc_info=True)
+            await asyncio.sleep(STRIPE_WORKER_IDLE_SECONDS)
@@ -0,0 +1,87 @@
+"""
+User service for bulk account provisioning.
+
+Admin/ops helpers only - not exposed as an API route. Used by scripts and
+load tests that need to create many users at once.
+"""
+import logging
+from typing import Any, Dict, List
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.db.models.user import User
+from app.core.security import hash_passwords
+from app.schemas.auth import SignupRequest
+
+logger = logging.getLogger(__name__)
+
+
+def bulk_signup(db: Session, users: List[Dict[str, Any]]) -> int:
+    """
+    Create many users in one batch.
+
+    Each entry is validated with SignupRequest (the /signup rules: email
+    format, full_name length, password length in bytes); invalid entries are
+    logged by index and skipped so one bad row can't abort the batch.
+    Passwords are hashed in parallel on the shared bcrypt thread pool (bcrypt
+    releases the GIL while hashing), and rows are written with a single
+    bulk_insert_mappings call, skipping the ORM identity map and per-object
+    events.
+
+    Args:
+        db: Database session
+        users: Dicts with full_name, email, password and optional visa_status
+
+    Returns:
+        Number of users created. Invalid entries, and emails that already
+        exist (or repeat within the batch), are skipped.
+    """
+    # Validate, then dedupe within the batch keeping the first occurrence of each email
+    pending: Dict[str, SignupRequest] = {}
+    for index, entry in enumerate(users):
+        try:
+            signup = SignupRequest.model_validate(entry)
+        except ValidationError as e:
+            # Field names only: never log the submitted values (passwords)
+            fields = sorted({".".join(str(part) for part in err["loc"]) for err in e.errors()})
+            logger.warning(f"Bulk signup: skipping invalid entry {index} ({', '.join(fields)})")
+            continue
+        if signup.email not in pending:
+            pending[signup.email] = signup
+
+    if not pending:
+        return 0
+
+    # Drop emails that are already registered (one IN query)
+    existing = {
+        row[0] for row in db.query(User.email).filter(User.email.in_(list(pending))).all()
+    }
+    new_emails = [email for email in pending if email not in existing]
+
+    if not new_emails:
+        logger.info(f"Bulk signup: all {len(pending)} emails already registered")
+        return 0
+
+    hashes = hash_passwords([pending[email].password for email in new_emails])
+
+    rows = [
+        {
+            "full_name": pending[email].full_name,
+            "email": email,
+            "password_hash": password_hash,
+            "visa_status": pending[email].visa_status or "Citizen",
+            "plan": "free",
+        }
+        for email, password_hash in zip(new_emails, hashes)
+    ]
+
+    try:
+        db.bulk_insert_mappings(User, rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Bulk signup failed: {e}", exc_info=True)
+        raise
+
+    logger.info(f"Bulk signup: created {len(rows)} users, skipped {len(users) - len(rows)}")
+    return len(rows)
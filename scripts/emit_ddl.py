@@ -0,0 +1,39 @@
+"""
+Script to print the PostgreSQL DDL for every mapped table and index.
+Run: python -m scripts.emit_ddl [output.sql]
+
+Compiles the schema once, offline, with no database connection. Useful for
+reviewing what the models declare against what Alembic migrations create,
+or for bootstrapping an empty database in one pass.
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from app.db.base import Base
+import app.db.models  # noqa: F401  (registers every model with Base.metadata)
+
+
+def emit_ddl() -> str:
+    """Return CREATE TABLE / CREATE INDEX statements in dependency order."""
+    dialect = postgresql.dialect()
+    statements = []
+    for table in Base.metadata.sorted_tables:
+        statements.append(str(CreateTable(table, if_not_exists=True).compile(dialect=dialect)).strip())
+        for index in sorted(table.indexes, key=lambda index: index.name):
+            statements.append(str(CreateIndex(index, if_not_exists=True).compile(dialect=dialect)).strip())
+    return ";\n\n".join(statements) + ";\n"
+
+
+if __name__ == "__main__":
+    ddl = emit_ddl()
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "w") as f:
+            f.write(ddl)
+    else:
+        sys.stdout.write(ddl)
@@ -0,0 +1,78 @@
+"""
+Tests for the async require_quota / require_plan dependencies on an aiosqlite session.
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from app.db.models.user import User
+from app.db.models.subscription import Subscription
+from app.db.models.usage import UsageEvent
+from app.core.plan_guard import require_plan
+from app.core.quota_guard import require_quota
+
+TABLES = [User.__table__, Subscription.__table__, UsageEvent.__table__]
+
+
+async def _setup(plan_type):
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        for table in TABLES:
+            await conn.run_sync(table.create)
+    session_factory = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as db:
+        user = User(full_name="Test User", email="test@example.com", password_hash="not-used")
+        db.add(user)
+        await db.flush()
+        db.add(Subscription(user_id=user.id, plan_type=plan_type, status="active"))
+        await db.commit()
+    return engine, session_factory, user.id
+
+
+def test_require_quota_consumes_then_rejects_at_limit():
+    async def run():
+        engine, session_factory, user_id = await _setup("free")
+        checker = require_quota("ats_scan")  # free limit: 2
+        async with session_factory() as db:
+            for _ in range(2):
+                user = await checker(email="test@example.com", db=db)
+                assert user.id == user_id
+
+            with pytest.raises(HTTPException) as exc:
+                await checker(email="test@example.com", db=db)
+            assert exc.value.status_code == 429
+            assert exc.value.detail["used"] == 2
+            assert exc.value.detail["limit"] == 2
+
+            # The rejected call recorded nothing
+            total = await db.scalar(select(func.sum(UsageEvent.amount)).where(UsageEvent.user_id == user_id))
+            assert total == 2
+
+            with pytest.raises(HTTPException) as exc:
+                await checker(email="nobody@example.com", db=db)
+            assert exc.value.status_code == 404
+        await engine.dispose()
+
+    asyncio.run(run())
+
+
+def test_require_plan_checks_subscription_plan():
+    async def run():
+        engine, session_factory, user_id = await _setup("pro")
+        async with session_factory() as db:
+            user = await require_plan("pro")(user_id=user_id, db=db)
+            assert user.email == "test@example.com"
+
+            with pytest.raises(HTTPException) as exc:
+                await require_plan("elite")(user_id=user_id, db=db)
+            assert exc.value.status_code == 402
+            assert exc.value.detail["code"] == "PAYWALL"
+
+            with pytest.raises(HTTPException) as exc:
+                await require_plan("pro")(user_id=user_id + 1, db=db)
+            assert exc.value.status_code == 404
+        await engine.dispose()
+
+    asyncio.run(run())
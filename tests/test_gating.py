@@ -0,0 +1,89 @@
+"""
+Tests for the single-statement daily AI limit (enforce_and_increment_ai_usage)
+and refunds for failed calls.
+"""
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import MAX_FREE_AI_CALLS_PER_DAY
+from app.core.gating import enforce_and_increment_ai_usage, get_today_ai_usage, refund_ai_usage
+from app.db.models.ai_usage import AIUsage
+from app.db.models.user import User
+
+
+# Setup in-memory SQLite database for testing
+test_engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+# Only the tables the AI limit touches
+TABLES = [User.__table__, AIUsage.__table__]
+
+
+@pytest.fixture(scope="function")
+def db():
+    """Create a fresh database for each test."""
+    for table in TABLES:
+        table.create(bind=test_engine)
+    db = TestSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        for table in reversed(TABLES):
+            table.drop(bind=test_engine)
+
+
+def _user(db, plan):
+    user = User(full_name="Test User", email=f"{plan}@example.com", password_hash="not-used", plan=plan)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def test_free_user_limited_without_increment_past_limit(db):
+    """Test free users get MAX_FREE_AI_CALLS_PER_DAY calls, then a 402 that records nothing."""
+    user = _user(db, "free")
+    
+    for expected in range(1, MAX_FREE_AI_CALLS_PER_DAY + 1):
+        assert enforce_and_increment_ai_usage(db, user) == expected
+    
+    with pytest.raises(HTTPException) as exc:
+        enforce_and_increment_ai_usage(db, user)
+    assert exc.value.status_code == 402
+    assert exc.value.detail["used"] == MAX_FREE_AI_CALLS_PER_DAY
+    
+    assert get_today_ai_usage(db, user.id) == MAX_FREE_AI_CALLS_PER_DAY
+
+
+def test_pro_user_unlimited(db):
+    """Test pro users are counted past the free limit."""
+    user = _user(db, "pro")
+    
+    for _ in range(MAX_FREE_AI_CALLS_PER_DAY + 2):
+        count = enforce_and_increment_ai_usage(db, user)
+    
+    assert count == MAX_FREE_AI_CALLS_PER_DAY + 2
+    assert get_today_ai_usage(db, user.id) == MAX_FREE_AI_CALLS_PER_DAY + 2
+
+
+def test_refund_returns_credit_for_failed_call(db):
+    """Test a refunded call frees a slot at the limit and never drives the count negative."""
+    user = _user(db, "free")
+    for _ in range(MAX_FREE_AI_CALLS_PER_DAY):
+        enforce_and_increment_ai_usage(db, user)
+    
+    refund_ai_usage(db, user.id)
+    assert get_today_ai_usage(db, user.id) == MAX_FREE_AI_CALLS_PER_DAY - 1
+    assert enforce_and_increment_ai_usage(db, user) == MAX_FREE_AI_CALLS_PER_DAY
+    
+    for _ in range(MAX_FREE_AI_CALLS_PER_DAY + 1):
+        refund_ai_usage(db, user.id)
+    assert get_today_ai_usage(db, user.id) == 0
@@ -0,0 +1,37 @@
+"""
+Tests for keyset pagination cursors.
+"""
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.pagination import encode_cursor, decode_cursor, iter_json_page
+
+
+def test_cursor_round_trip():
+    """A cursor decodes back to the row's (created_at, id)."""
+    created_at = datetime(2026, 1, 15, 9, 30, 12, 345678, tzinfo=timezone.utc)
+    assert decode_cursor(encode_cursor(created_at, 42)) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", encode_cursor(datetime(2026, 1, 1), 1)[:-4] + "!!!!"])
+def test_malformed_cursor_is_rejected(cursor):
+    """Malformed cursors raise 400 rather than reaching the query."""
+    with pytest.raises(HTTPException) as exc_info:
+        decode_cursor(cursor)
+    assert exc_info.value.status_code == 400
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.parametrize("items", [[], [b'{"id":1}'], [b'{"id":1}', b'{"id":2}']])
+def test_streamed_page_is_valid_json(items):
+    """Chunks join into the same object a one-shot encode would produce."""
+    meta = {"total": len(items), "page": 1, "page_size": 20, "next_cursor": None}
+    body = asyncio.run(collect(iter_json_page("jobs", iter(items), meta)))
+    assert json.loads(body) == {"jobs": [json.loads(item) for item in items], **meta}
@@ -0,0 +1,38 @@
+"""
+Tests for the bcrypt verification cache behind verify_password
+(password-specific behavior; the cache itself is covered by test_ttl_cache.py).
+"""
+import bcrypt
+
+from app.core import password_cache
+from app.core.security import verify_password
+
+
+def _hash(password: str) -> str:
+    # Minimum cost keeps the test fast
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=4)).decode("utf-8")
+
+
+def test_failed_check_is_not_cached():
+    password_cache.clear_password_cache()
+    hashed = _hash("password111")
+
+    assert not verify_password("password222", hashed)
+    assert not password_cache.is_verified("password222", hashed)
+
+    # A cached success for the right password doesn't admit a wrong one
+    assert verify_password("password111", hashed)
+    assert password_cache.is_verified("password111", hashed)
+    assert not verify_password("password222", hashed)
+
+
+def test_new_hash_bypasses_cache():
+    password_cache.clear_password_cache()
+    old_hash = _hash("password111")
+    assert verify_password("password111", old_hash)
+
+    # After a password change the stored hash differs, so the old entry never applies
+    new_hash = _hash("password222")
+    assert not password_cache.is_verified("password111", new_hash)
+    assert not verify_password("password111", new_hash)
+    assert verify_password("password222", new_hash)
@@ -9,7 +9,6 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.db.base import Base
 from app.db.models.user import User
 from app.db.models.subscription import Subscription
 from app.db.models.usage import UsageEvent
@@ -17,6 +16,7 @@ from app.services.quota_service import (
     get_plan_for_user,
     get_month_usage,
     check_and_consume,
+    check_and_consume_by_email,
     get_usage_for_response,
 )
 from app.core.security import hash_password
@@ -31,17 +31,22 @@ test_engine = create_engine(
 )
 TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
 
+# Only the tables the quota service touches
+TABLES = [User.__table__, Subscription.__table__, UsageEvent.__table__]
+
 
 @pytest.fixture(scope="function")
 def db():
     """Create a fresh database for each test."""
-    Base.metadata.create_all(bind=test_engine)
+    for table in TABLES:
+        table.create(bind=test_engine)
     db = TestSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=test_engine)
+        for table in reversed(TABLES):
+            table.drop(bind=test_engine)
 
 
 @pytest.fixture
@@ -217,6 +222,31 @@ def test_check_and_consume_elite_unlimited(db, test_user, elite_user_subscriptio
     assert usage["ats_scan"] == 1001
 
 
+def test_check_and_consume_by_email_last_unit_vs_exceeded(db, test_user, free_user_subscription):
+    """Test using up the last unit is allowed and only the next request is refused."""
+    check_and_consume(db, test_user.id, "ats_scan", amount=1)
+    
+    # Takes the last unit (2 for free plan ats_scan)
+    user, plan_type, used, limit, remaining, exceeded = check_and_consume_by_email(
+        db, test_user.email, "ats_scan", amount=1
+    )
+    assert user.id == test_user.id
+    assert plan_type == "free"
+    assert (used, limit, remaining, exceeded) == (2, 2, 0, False)
+    
+    # Same used/remaining, but refused and not recorded
+    _, _, used, limit, remaining, exceeded = check_and_consume_by_email(
+        db, test_user.email, "ats_scan", amount=1
+    )
+    assert (used, limit, remaining, exceeded) == (2, 2, 0, True)
+    assert get_month_usage(db, test_user.id, UsageEvent.get_month_key())["ats_scan"] == 2
+
+
+def test_check_and_consume_by_email_unknown_user(db):
+    """Test an unknown email returns None."""
+    assert check_and_consume_by_email(db, "nobody@example.com", "ats_scan") is None
+
+
 def test_get_usage_for_response_free_plan(db, test_user, free_user_subscription):
     """Test get_usage_for_response returns correct structure for free plan."""
     month_key = UsageEvent.get_month_key()
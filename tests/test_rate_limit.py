@@ -0,0 +1,49 @@
+"""
+Tests for the in-memory (no Redis) rate limiter.
+"""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import rate_limit
+
+
+@pytest.fixture(autouse=True)
+def memory_limiter(monkeypatch):
+    """Force the per-process fallback and start from an empty store."""
+    monkeypatch.setattr(rate_limit, "get_async_redis", lambda: None)
+    rate_limit.rate_limit_store.clear()
+    yield
+    rate_limit.rate_limit_store.clear()
+
+
+def test_sliding_window_allows_max_then_blocks_until_oldest_expires():
+    for i in range(3):
+        assert rate_limit._memory_allow("1.2.3.4", 60, 1000.0 + i, 3)
+    assert not rate_limit._memory_allow("1.2.3.4", 60, 1059.0, 3)
+    
+    # Blocked requests aren't recorded, so only the oldest (t=1000) has to age out
+    assert rate_limit._memory_allow("1.2.3.4", 60, 1060.0, 3)
+    assert not rate_limit._memory_allow("1.2.3.4", 60, 1060.5, 3)
+    
+    # Other IPs have their own window
+    assert rate_limit._memory_allow("5.6.7.8", 60, 1060.5, 3)
+
+
+def test_check_rate_limit_raises_429():
+    request = Request({
+        "type": "http",
+        "headers": [(b"x-forwarded-for", b"9.9.9.9, 10.0.0.1")],
+        "client": ("10.0.0.1", 1234),
+    })
+    
+    async def run():
+        for _ in range(2):
+            await rate_limit.check_rate_limit(request, max_requests=2, window_seconds=60)
+        with pytest.raises(HTTPException) as exc:
+            await rate_limit.check_rate_limit(request, max_requests=2, window_seconds=60)
+        assert exc.value.status_code == 429
+    
+    asyncio.run(run())
+    assert list(rate_limit.rate_limit_store) == ["9.9.9.9"]
@@ -0,0 +1,54 @@
+"""
+Tests for Stripe webhook signature verification.
+"""
+import hashlib
+import hmac
+import json
+import time
+
+import pytest
+
+from app.services.stripe_signature import (
+    build_hmac_template,
+    verify_stripe_signature,
+    WebhookSignatureError,
+)
+
+SECRET = "whsec_test_secret"
+PAYLOAD = json.dumps({"id": "evt_123", "type": "invoice.payment_succeeded", "data": {"object": {}}}).encode()
+
+
+def sign(payload: bytes, timestamp: int, secret: str = SECRET) -> str:
+    """Build a stripe-signature header the way Stripe does."""
+    signature = hmac.new(secret.encode(), f"{timestamp}.".encode() + payload, hashlib.sha256).hexdigest()
+    return f"t={timestamp},v1={signature}"
+
+
+def test_valid_signature_returns_event():
+    header = sign(PAYLOAD, int(time.time()))
+    event = verify_stripe_signature(PAYLOAD, header, build_hmac_template(SECRET))
+    assert event["id"] == "evt_123"
+    assert event["type"] == "invoice.payment_succeeded"
+
+
+def test_wrong_secret_rejected():
+    header = sign(PAYLOAD, int(time.time()), secret="whsec_other")
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(PAYLOAD, header, build_hmac_template(SECRET))
+
+
+def test_stale_timestamp_rejected():
+    header = sign(PAYLOAD, int(time.time()) - 3600)
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(PAYLOAD, header, build_hmac_template(SECRET))
+
+
+def test_malformed_header_rejected():
+    with pytest.raises(WebhookSignatureError):
+        verify_stripe_signature(PAYLOAD, "garbage", build_hmac_template(SECRET))
+
+
+def test_template_reusable_across_calls():
+    template = build_hmac_template(SECRET)
+    for _ in range(3):
+        verify_stripe_signature(PAYLOAD, sign(PAYLOAD, int(time.time())), template)
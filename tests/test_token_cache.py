@@ -0,0 +1,25 @@
+"""
+Tests for the decoded-JWT cache (token-specific behavior only; the
+underlying cache is covered by test_ttl_cache.py).
+"""
+import time
+
+from app.core import token_cache
+
+
+def test_cached_payload_never_outlives_token_exp():
+    token_cache.clear_token_cache()
+    token_cache.cache_payload("token-a", {"sub": "a@example.com", "exp": time.time() - 1})
+    assert token_cache.get_cached_payload("token-a") is None
+
+    token_cache.cache_payload("token-b", {"sub": "b@example.com", "exp": time.time() + 0.01})
+    assert token_cache.get_cached_payload("token-b") is not None
+    time.sleep(0.02)
+    assert token_cache.get_cached_payload("token-b") is None
+
+
+def test_raw_token_is_not_stored():
+    token_cache.clear_token_cache()
+    token_cache.cache_payload("secret-token", {"sub": "a@example.com"})
+    assert "secret-token" not in token_cache._token_cache._entries
+    assert token_cache.get_cached_payload("secret-token") == {"sub": "a@example.com"}
@@ -0,0 +1,49 @@
+"""
+Tests for the shared in-process TTL cache.
+"""
+import time
+
+from app.core.ttl_cache import TTLCache
+
+
+def test_hit_and_pop():
+    cache = TTLCache(ttl=60, maxsize=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+
+    cache.pop("a")
+    assert cache.get("a") is None
+
+
+def test_expired_entry_is_dropped():
+    cache = TTLCache(ttl=-1, maxsize=10)
+    cache.set("a", 1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default():
+    cache = TTLCache(ttl=60, maxsize=10)
+    cache.set("a", 1, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+
+
+def test_least_recently_used_entry_evicted_when_full():
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    # A hit makes "a" most recently used, so "b" is evicted next
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_clear():
+    cache = TTLCache(ttl=60, maxsize=10)
+    cache.set("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
@@ -1,52 +1,63 @@
 """
-Integration tests for GET /me/usage endpoint.
+Integration tests for GET /api/v1/usage endpoint.
 """
+import asyncio
 import pytest
-from datetime import datetime
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
 
 from app.main import app
-from app.db.base import Base
 from app.db.models.user import User
 from app.db.models.subscription import Subscription
-from app.db.models.usage import Usage
-from app.core.security import hash_password, create_access_token
-from app.db.session import SessionLocal
-from app.core.quota_guard import get_db
+from app.db.models.usage import UsageEvent
+from app.core.security import create_access_token
+from app.core.usage_cache import clear_usage_cache
+from app.db.session_async import get_async_db
 
+# Only the tables the usage summary reads
+TABLES = [User.__table__, Subscription.__table__, UsageEvent.__table__]
 
-# Setup in-memory SQLite database for testing
-TEST_DATABASE_URL = "sqlite:///:memory:"
-test_engine = create_engine(
-    TEST_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+@pytest.fixture
+def db_url(tmp_path):
+    """File-backed SQLite DB shared by the sync setup engine and the async app engine."""
+    return f"sqlite:///{tmp_path / 'usage.db'}"
 
 
-def override_get_db():
-    """Override get_db dependency for testing."""
-    db = TestSessionLocal()
+@pytest.fixture
+def db_session(db_url):
+    """Sync session used to seed rows."""
+    engine = create_engine(db_url)
+    for table in TABLES:
+        table.create(bind=engine)
+    db = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
     try:
         yield db
     finally:
         db.close()
+        engine.dispose()
 
 
-# Override the database dependency
-app.dependency_overrides[get_db] = override_get_db
+@pytest.fixture
+def client(db_url, db_session):
+    """Test client with get_async_db served from an aiosqlite session."""
+    async_engine = create_async_engine(db_url.replace("sqlite://", "sqlite+aiosqlite://", 1))
+    TestAsyncSessionLocal = async_sessionmaker(bind=async_engine, class_=AsyncSession, expire_on_commit=False)
 
+    async def override_get_async_db():
+        async with TestAsyncSessionLocal() as db:
+            yield db
 
-@pytest.fixture(scope="function", autouse=True)
-def setup_db():
-    """Create and drop tables for each test."""
-    Base.metadata.create_all(bind=test_engine)
-    yield
-    Base.metadata.drop_all(bind=test_engine)
+    clear_usage_cache()
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        clear_usage_cache()
+        asyncio.run(async_engine.dispose())
 
 
 @pytest.fixture
@@ -55,7 +66,7 @@ def test_user(db_session):
     user = User(
         full_name="Test User",
         email="test@example.com",
-        password_hash=hash_password("testpass123"),
+        password_hash="not-used",
         visa_status="Citizen"
     )
     db_session.add(user)
@@ -67,134 +78,79 @@ def test_user(db_session):
 @pytest.fixture
 def test_user_token(test_user):
     """Create JWT token for test user."""
-    return create_access_token({"sub": test_user.email})
+    return create_access_token({"sub": test_user.email, "uid": test_user.id})
 
 
-@pytest.fixture
-def db_session():
-    """Provide a database session for tests."""
-    db = TestSessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
-@pytest.fixture
-def free_subscription(db_session, test_user):
-    """Create free plan subscription."""
-    sub = Subscription(
-        user_id=test_user.id,
-        plan_type="free",
-        status="active"
-    )
-    db_session.add(sub)
+def _subscribe(db_session, user, plan_type):
+    db_session.add(Subscription(user_id=user.id, plan_type=plan_type, status="active"))
     db_session.commit()
-    return sub
 
 
-@pytest.fixture
-def client():
-    """Create test client."""
-    return TestClient(app)
-
-
-def test_get_usage_free_plan_no_usage(client, test_user, test_user_token, free_subscription):
-    """Test GET /me/usage returns correct structure for free plan with no usage."""
+def test_get_usage_free_plan_no_usage(client, db_session, test_user, test_user_token):
+    """Test GET /api/v1/usage returns correct structure for free plan with no usage."""
+    _subscribe(db_session, test_user, "free")
     headers = {"Authorization": f"Bearer {test_user_token}"}
-    response = client.get("/me/usage", headers=headers)
+    response = client.get("/api/v1/usage", headers=headers)
     
     assert response.status_code == 200
     data = response.json()
     
     assert data["plan"] == "free"
-    assert "month" in data
-    assert "features" in data
-    assert len(data["features"]) == 4
-    
-    # Check each feature has correct structure
-    for feature in data["features"]:
-        assert "feature" in feature
-        assert "limit" in feature
-        assert "used" in feature
-        assert "remaining" in feature
-        assert "unlimited" in feature
+    assert data["month_key"] == UsageEvent.get_month_key()
+    assert set(data["features"]) == {"ats_scan", "resume_tailor", "cover_letter", "jd_parse"}
     
-    # Check free plan limits
-    ats_feature = next(f for f in data["features"] if f["feature"] == "ats_scan")
-    assert ats_feature["limit"] == 10
-    assert ats_feature["used"] == 0
-    assert ats_feature["remaining"] == 10
-    assert ats_feature["unlimited"] is False
-
-
-def test_get_usage_with_existing_usage(client, test_user, test_user_token, free_subscription, db_session):
-    """Test GET /me/usage returns correct usage counts."""
-    # Add some usage
-    usage1 = Usage(
-        user_id=test_user.id,
-        feature="ats_scan",
-        amount=3,
-        created_at=datetime.utcnow()
-    )
-    usage2 = Usage(
-        user_id=test_user.id,
-        feature="resume_tailor",
-        amount=2,
-        created_at=datetime.utcnow()
-    )
-    db_session.add_all([usage1, usage2])
+    ats_feature = data["features"]["ats_scan"]
+    assert ats_feature == {"limit": 2, "used": 0, "remaining": 2, "unlimited": False}
+
+
+def test_get_usage_with_existing_usage(client, db_session, test_user, test_user_token):
+    """Test GET /api/v1/usage returns correct usage counts."""
+    _subscribe(db_session, test_user, "free")
+    month_key = UsageEvent.get_month_key()
+    db_session.add_all([
+        UsageEvent(user_id=test_user.id, feature="ats_scan", amount=1, month_key=month_key),
+        UsageEvent(user_id=test_user.id, feature="resume_tailor", amount=2, month_key=month_key),
+        # Last month's usage doesn't count
+        UsageEvent(user_id=test_user.id, feature="ats_scan", amount=5, month_key="2000-01"),
+    ])
     db_session.commit()
     
     headers = {"Authorization": f"Bearer {test_user_token}"}
-    response = client.get("/me/usage", headers=headers)
+    response = client.get("/api/v1/usage", headers=headers)
     
     assert response.status_code == 200
-    data = response.json()
-    
-    ats_feature = next(f for f in data["features"] if f["feature"] == "ats_scan")
-    assert ats_feature["used"] == 3
-    assert ats_feature["remaining"] == 7  # 10 - 3
-    
-    tailor_feature = next(f for f in data["features"] if f["feature"] == "resume_tailor")
-    assert tailor_feature["used"] == 2
-    assert tailor_feature["remaining"] == 3  # 5 - 2
-
-
-def test_get_usage_elite_plan_unlimited(client, test_user, test_user_token, db_session):
-    """Test GET /me/usage shows unlimited for elite plan."""
-    # Create elite subscription
-    sub = Subscription(
-        user_id=test_user.id,
-        plan_type="elite",
-        status="active"
-    )
-    db_session.add(sub)
-    db_session.commit()
+    features = response.json()["features"]
     
+    assert features["ats_scan"]["used"] == 1
+    assert features["ats_scan"]["remaining"] == 1  # 2 - 1
+    assert features["resume_tailor"]["used"] == 2
+    assert features["resume_tailor"]["remaining"] == 1  # 3 - 2
+
+
+def test_get_usage_elite_plan_unlimited(client, db_session, test_user, test_user_token):
+    """Test GET /api/v1/usage shows unlimited for elite plan."""
+    _subscribe(db_session, test_user, "elite")
     headers = {"Authorization": f"Bearer {test_user_token}"}
-    response = client.get("/me/usage", headers=headers)
+    response = client.get("/api/v1/usage", headers=headers)
     
     assert response.status_code == 200
     data = response.json()
     
     assert data["plan"] == "elite"
-    
-    # Check all features are unlimited
-    for feature in data["features"]:
+    for feature in data["features"].values():
         assert feature["unlimited"] is True
         assert feature["limit"] is None
         assert feature["remaining"] is None
 
 
 def test_get_usage_unauthorized(client):
-    """Test GET /me/usage requires authentication."""
-    response = client.get("/me/usage")
-    assert response.status_code == 403  # FastAPI returns 403 for missing auth
+    """Test GET /api/v1/usage requires authentication."""
+    response = client.get("/api/v1/usage")
+    assert response.status_code == 401
 
 
 def test_get_usage_invalid_token(client):
-    """Test GET /me/usage with invalid token."""
+    """Test GET /api/v1/usage with invalid token."""
     headers = {"Authorization": "Bearer invalid_token"}
-    response = client.get("/me/usage", headers=headers)
+    response = client.get("/api/v1/usage", headers=headers)
     assert response.status_code == 401
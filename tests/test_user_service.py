@@ -0,0 +1,77 @@
+"""
+Unit tests for user service bulk signup.
+"""
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.models.user import User
+from app.services.user_service import bulk_signup
+from app.core.security import hash_password, verify_password
+
+
+# Setup in-memory SQLite database for testing
+TEST_DATABASE_URL = "sqlite:///:memory:"
+test_engine = create_engine(
+    TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+
+
+@pytest.fixture(scope="function")
+def db():
+    """Create a fresh users table for each test (bulk_signup touches nothing else)."""
+    User.__table__.create(bind=test_engine)
+    db = TestSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+        User.__table__.drop(bind=test_engine)
+
+
+def test_bulk_signup_creates_users(db):
+    """New users are inserted with hashed passwords."""
+    created = bulk_signup(db, [
+        {"full_name": "User One", "email": "One@Example.com", "password": "password111"},
+        {"full_name": "User Two", "email": "two@example.com", "password": "password222", "visa_status": "H1B"},
+    ])
+
+    assert created == 2
+    user = db.query(User).filter(User.email == "one@example.com").first()
+    assert user is not None
+    assert user.visa_status == "Citizen"
+    assert user.plan == "free"
+    assert verify_password("password111", user.password_hash)
+
+
+def test_bulk_signup_skips_existing_and_duplicate_emails(db):
+    """Registered emails and repeats within the batch are skipped."""
+    db.add(User(full_name="Existing", email="taken@example.com", password_hash=hash_password("password000")))
+    db.commit()
+
+    created = bulk_signup(db, [
+        {"full_name": "Taken", "email": "taken@example.com", "password": "password111"},
+        {"full_name": "New", "email": "new@example.com", "password": "password222"},
+        {"full_name": "New Again", "email": "NEW@example.com", "password": "password333"},
+    ])
+
+    assert created == 1
+    assert db.query(User).count() == 2
+
+
+def test_bulk_signup_skips_invalid_entries(db):
+    """Entries failing the signup rules are skipped without aborting the batch."""
+    created = bulk_signup(db, [
+        {"full_name": "Short Password", "email": "short@example.com", "password": "short"},
+        {"full_name": "Bad Email", "email": "not-an-email", "password": "password111"},
+        {"full_name": "   ", "email": "blank@example.com", "password": "password111"},
+        {"full_name": "Too Long", "email": "long@example.com", "password": "é" * 37},
+        {"full_name": "Valid", "email": "valid@example.com", "password": "password111"},
+    ])
+
+    assert created == 1
+    assert [email for (email,) in db.query(User.email).all()] == ["valid@example.com"]